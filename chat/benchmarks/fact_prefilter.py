@@ -0,0 +1,91 @@
+"""Skip rate and precision of the fact-extraction pre-filter.
+
+Reads either a metrics file written in shadow mode (`MEM0_METRICS_PATH` with the
+LTM pre-filter set to 'shadow'; the file stays empty with MEM0_TELEMETRY off), or
+a labelled JSONL file of turns with the facts the extraction LLM returned for
+them, one `{"text": ..., "facts": [...]}` per line, and replays the gate on the
+latter.
+
+Precision is the share of skipped turns that really had no facts: every miss
+is a fact the LTM loses. Recall is the share of fact-free turns that were
+skipped, i.e. the LLM calls saved out of those that could have been.
+
+Usage (from `chat/`):
+    python -m benchmarks.fact_prefilter metrics.jsonl
+    python -m benchmarks.fact_prefilter labelled.jsonl --min-chars 2 --morphology
+"""
+
+import argparse
+import json
+import os
+
+os.environ.setdefault("MEM0_TELEMETRY", "false")
+
+from mem0_naver.memory.prefilter import FactPrefilter  # noqa: E402
+
+
+def _read(path: str):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _decisions(path: str, gate: FactPrefilter):
+    """(content_free, num_facts, text) of every turn or shadow decision in the file."""
+    for record in _read(path):
+        if record.get("event") == "fact_prefilter.shadow":
+            yield record["content_free"], record["num_facts"], None
+        elif "text" in record:
+            text = record["text"]
+            yield gate.is_content_free(text), len(record.get("facts") or []), text
+
+
+def run(path: str, min_chars: int, morphology: bool, show: int):
+    gate = FactPrefilter(enabled=True, min_chars=min_chars, use_morphology=morphology)
+    counts = {"skip_correct": 0, "skip_lost": 0, "pass_facts": 0, "pass_empty": 0}
+    lost = []
+    for content_free, num_facts, text in _decisions(path, gate):
+        if content_free:
+            counts["skip_correct" if not num_facts else "skip_lost"] += 1
+            if num_facts and text is not None:
+                lost.append(text)
+        else:
+            counts["pass_facts" if num_facts else "pass_empty"] += 1
+
+    total = sum(counts.values())
+    skipped = counts["skip_correct"] + counts["skip_lost"]
+    empty = counts["skip_correct"] + counts["pass_empty"]
+    if not total:
+        print("No turns or shadow decisions found.")
+        return
+
+    print(f"turns:     {total}")
+    print(f"skip rate: {skipped / total:.1%} ({skipped})")
+    print(
+        f"precision: {counts['skip_correct'] / skipped:.1%}"
+        if skipped
+        else "precision: n/a"
+    )
+    print(
+        f"recall:    {counts['skip_correct'] / empty:.1%}"
+        if empty
+        else "recall:    n/a"
+    )
+    for text in lost[:show]:
+        print(f"  lost facts: {text!r}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "path", help="Shadow-mode metrics JSONL or labelled turns JSONL"
+    )
+    parser.add_argument("--min-chars", type=int, default=2)
+    parser.add_argument("--morphology", action="store_true")
+    parser.add_argument(
+        "--show", type=int, default=10, help="Number of wrongly skipped turns to print"
+    )
+    args = parser.parse_args()
+
+    run(args.path, args.min_chars, args.morphology, args.show)
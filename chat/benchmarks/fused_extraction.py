@@ -0,0 +1,182 @@
+"""Latency and action agreement of single-pass and two-pass LTM extraction.
+
+Replays the same conversations through `AsyncMemory.add` twice, once with the
+two-pass pipeline (fact extraction, then the update-memory prompt) and once
+with `fused_extraction`, each on its own empty store. Conversations are read
+from a JSONL file, one `{"user_id": ..., "turns": ["...", ...]}` per line, and
+added `--turns-per-add` user turns at a time, as the LTM write-behind does.
+
+Agreement compares the final memories of every user: a memory of one mode
+agrees when the other mode stored a memory with a cosine similarity of at
+least `--threshold`. Calls the real HyperCLOVA X models, so
+CLOVASTUDIO_API_KEY must be set (`chat/.env` is loaded).
+
+Usage (from `chat/`):
+    python -m benchmarks.fused_extraction conversations.jsonl --turns-per-add 5
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from dotenv import load_dotenv
+
+os.environ.setdefault("MEM0_TELEMETRY", "false")
+load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+
+from langchain_naver import ChatClovaX, ClovaXEmbeddings  # noqa: E402
+
+from mem0_naver import AsyncMemory  # noqa: E402
+
+logging.getLogger("mem0_naver").setLevel(logging.ERROR)
+
+
+def _read(path: str):
+    with open(path, encoding="utf-8") as f:
+        for idx, line in enumerate(f):
+            if line.strip():
+                record = json.loads(line)
+                record.setdefault("user_id", f"user-{idx}")
+                yield record
+
+
+def _config(path: str, fused: bool) -> dict:
+    return {
+        "llm": {
+            "provider": "langchain",
+            "config": {"model": ChatClovaX(model="HCX-005", temperature=0)},
+        },
+        "embedder": {
+            "provider": "langchain",
+            "config": {"model": ClovaXEmbeddings(model="clir-emb-dolphin")},
+            "embedding_dims": 1024,
+        },
+        "vector_store": {
+            "provider": "faiss",
+            "config": {
+                "collection_name": "bench",
+                "distance_strategy": "inner_product",
+                "path": path,
+                "embedding_model_dims": 1024,
+            },
+        },
+        "history_db_path": os.path.join(path, "history.db"),
+        "fused_extraction": fused,
+    }
+
+
+async def _replay(conversations, fused: bool, turns_per_add: int):
+    """Per-add latencies, LLM calls, action counts and final memories of every user."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        memory = await AsyncMemory.from_config(_config(tmp_dir, fused))
+
+        llm_calls = 0
+        generate_response = memory.llm.agenerate_response
+
+        async def counted(*args, **kwargs):
+            nonlocal llm_calls
+            llm_calls += 1
+            return await generate_response(*args, **kwargs)
+
+        memory.llm.agenerate_response = counted
+
+        latencies, events, final = [], Counter(), {}
+        for conversation in conversations:
+            user_id, turns = conversation["user_id"], conversation["turns"]
+            for start in range(0, len(turns), turns_per_add):
+                messages = [
+                    {"role": "user", "content": turn}
+                    for turn in turns[start : start + turns_per_add]
+                ]
+                start_time = time.perf_counter()
+                result = await memory.add(messages, user_id=user_id)
+                latencies.append(time.perf_counter() - start_time)
+                events.update(item["event"] for item in result["results"])
+
+            stored = await memory.get_all(user_id=user_id)
+            final[user_id] = [item["memory"] for item in stored["results"]]
+
+        memory.vector_store.close()
+        return latencies, llm_calls, events, final, memory.embedding_model
+
+
+async def _agreement(embedding_model, ours, theirs, threshold: float):
+    """Number of memories in `ours` that have a similar memory in `theirs`."""
+    if not ours or not theirs:
+        return 0
+    ours_vectors = np.asarray(await embedding_model.aembed_batch(ours, "search"))
+    theirs_vectors = np.asarray(await embedding_model.aembed_batch(theirs, "search"))
+    ours_vectors /= np.linalg.norm(ours_vectors, axis=1, keepdims=True)
+    theirs_vectors /= np.linalg.norm(theirs_vectors, axis=1, keepdims=True)
+    return int(((ours_vectors @ theirs_vectors.T).max(axis=1) >= threshold).sum())
+
+
+def _report(name: str, latencies, llm_calls: int, events: Counter):
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(
+        f"{name:>9} | adds {len(latencies):4d} | mean {statistics.mean(latencies):6.2f}s"
+        f" | p50 {statistics.median(latencies):6.2f}s | p95 {p95:6.2f}s"
+        f" | LLM calls/add {llm_calls / len(latencies):4.2f}"
+        f" | {dict(sorted(events.items()))}"
+    )
+
+
+async def run(path: str, turns_per_add: int, threshold: float):
+    conversations = list(_read(path))
+    if not conversations:
+        print("No conversations found.")
+        return
+
+    two_pass = await _replay(conversations, False, turns_per_add)
+    fused = await _replay(conversations, True, turns_per_add)
+    _report("two-pass", *two_pass[:3])
+    _report("fused", *fused[:3])
+
+    embedding_model = two_pass[4]
+    totals = Counter()
+    for user_id, two_pass_memories in two_pass[3].items():
+        fused_memories = fused[3][user_id]
+        totals["two_pass"] += len(two_pass_memories)
+        totals["fused"] += len(fused_memories)
+        totals["two_pass_agree"] += await _agreement(
+            embedding_model, two_pass_memories, fused_memories, threshold
+        )
+        totals["fused_agree"] += await _agreement(
+            embedding_model, fused_memories, two_pass_memories, threshold
+        )
+        totals["exact"] += len(set(two_pass_memories) & set(fused_memories))
+
+    print(f"memories:  two-pass {totals['two_pass']} | fused {totals['fused']}")
+    if totals["two_pass"]:
+        print(
+            f"two-pass memories also in fused: {totals['two_pass_agree'] / totals['two_pass']:.1%}"
+        )
+    if totals["fused"]:
+        print(
+            f"fused memories also in two-pass: {totals['fused_agree'] / totals['fused']:.1%}"
+        )
+    print(f"identical memories: {totals['exact']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="Conversations JSONL")
+    parser.add_argument("--turns-per-add", type=int, default=5)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.9,
+        help="Cosine similarity at which two memories agree",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(run(args.path, args.turns_per_add, args.threshold))
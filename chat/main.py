@@ -19,10 +19,14 @@ from modules.utils import (
     MEDICAL_DB_FAISS,
     LEGACY_DB_FAISS,
     LTM_DB_FAISS,
+    LTM_CLUE_THRESHOLD,
+    LTM_CLUE_LIMIT,
     USE_DUMMY_RESPONSE,
 )
 from modules.agents import CounselorAgent, MonitorAgent, EscalationAgent, ContextAgent
 from modules.database import UserSessionDB
+from mem0_naver.embeddings.cache import embedding_cache_stats
+from mem0_naver.memory.telemetry import metrics
 
 set_clovax_api_key()
 
@@ -56,7 +60,14 @@ async def lifespan(app: FastAPI):
 
     # On server shutdown
     logger.info("Killing server...")
+    await context_agent.close()
     user_session_db.close()
+    for path, stats in embedding_cache_stats().items():
+        logger.info(
+            f"Embedding cache {path}: {stats['hit_rate']:.1%} hit rate "
+            f"({stats['memory_hits']} memory, {stats['disk_hits']} disk, {stats['misses']} misses)"
+        )
+    metrics.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -312,6 +323,9 @@ async def end_session(req: EndSessionRequest, background_tasks: BackgroundTasks)
         update_user_counseling_session, user_id, counseling_session
     )
 
+    # Add the turns still waiting for LTM
+    background_tasks.add_task(context_agent.flush_ltm, user_id)
+
     # Clean up session and STM
     session_store.pop(req.session_id, None)
     await context_agent.remove_session(req.session_id)
@@ -334,13 +348,16 @@ async def update_user_counseling_session(user_id: str, counseling_session: str):
 
     if counseling_session == "ACCEPTANCE":
         # AAQ-II acceptance survey
+        # With a threshold, every relevant clue is used instead of a fixed top 10
         acceptance_clues = await context_agent.get_ltm(
             user_id=user_id,
             query="User's inner expressions to check readiness for therapy",
-            k=10,
+            k=10 if LTM_CLUE_THRESHOLD is None else LTM_CLUE_LIMIT,
+            threshold=LTM_CLUE_THRESHOLD,
         )
-        should_update, aaq_score = monitor_agent.is_ready_to_accept(
-            user_info="\n".join(acceptance_clues)
+        # Seven scheduled LLM calls in the background class, kept off the event loop
+        should_update, aaq_score = await asyncio.to_thread(
+            monitor_agent.is_ready_to_accept, user_info="\n".join(acceptance_clues)
         )
         if should_update:
             user_session_db.update(user_id, session_name="REMINISCENCE")
@@ -1,5 +1,5 @@
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -34,6 +34,29 @@ class MemoryItem(BaseModel):
     )
 
 
+class FactPrefilterConfig(BaseModel):
+    enabled: bool = Field(
+        description="Whether to skip fact extraction for turns without content",
+        default=False,
+    )
+    mode: Literal["enforce", "shadow"] = Field(
+        description="'enforce' skips content-free turns; 'shadow' only measures the decisions against the extracted facts",
+        default="enforce",
+    )
+    min_chars: int = Field(
+        description="Turns with fewer characters, ignoring punctuation and spaces, are content-free",
+        default=2,
+    )
+    use_morphology: bool = Field(
+        description="Also treat turns without nouns, verbs or adjectives as content-free, using konlpy (needs a JVM)",
+        default=False,
+    )
+    filler_phrases: List[str] = Field(
+        description="Additional whole-turn phrases that are content-free",
+        default_factory=list,
+    )
+
+
 class MemoryConfig(BaseModel):
     vector_store: VectorStoreConfig = Field(
         description="Configuration for the vector store",
@@ -67,3 +90,15 @@ class MemoryConfig(BaseModel):
         description="Custom prompt for the update memory",
         default=None,
     )
+    fact_prefilter: FactPrefilterConfig = Field(
+        description="Configuration for the local gate in front of fact extraction",
+        default_factory=FactPrefilterConfig,
+    )
+    fused_extraction: bool = Field(
+        description="Extract facts and decide memory actions in a single LLM call (AsyncMemory only)",
+        default=False,
+    )
+    fused_memory_limit: int = Field(
+        description="Number of existing memories shown to the single-pass extraction prompt",
+        default=10,
+    )
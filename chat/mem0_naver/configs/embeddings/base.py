@@ -12,6 +12,9 @@ class BaseEmbedderConfig(ABC):
         model: Optional[str] = None,
         api_key: Optional[str] = None,
         embedding_dims: Optional[int] = None,
+        max_batch_size: Optional[int] = 100,
+        cache_path: Optional[str] = None,
+        cache_size: int = 10000,
     ):
         """
         Initializes a configuration class instance for the Embeddings.
@@ -22,8 +25,17 @@ class BaseEmbedderConfig(ABC):
         :type api_key: Optional[str], optional
         :param embedding_dims: The number of dimensions in the embedding, defaults to None
         :type embedding_dims: Optional[int], optional
+        :param max_batch_size: Maximum number of texts per batch embedding request (None for no limit), defaults to 100
+        :type max_batch_size: Optional[int], optional
+        :param cache_path: SQLite file of the persistent embedding cache (None disables the cache), defaults to None
+        :type cache_path: Optional[str], optional
+        :param cache_size: Number of cached embeddings kept in memory, defaults to 10000
+        :type cache_size: int, optional
         """
 
         self.model = model
         self.api_key = api_key
         self.embedding_dims = embedding_dims
+        self.max_batch_size = max_batch_size
+        self.cache_path = cache_path
+        self.cache_size = cache_size
@@ -214,6 +214,51 @@ DEFAULT_UPDATE_MEMORY_PROMPT = """당신은 시스템의 메모리를 관리하
         }
 """
 
+FUSED_MEMORY_PROMPT = f"""당신은 사용자에 대한 사실을 추출하고 시스템의 메모리를 관리하는 스마트 메모리 관리자입니다. \
+대화에서 사용자에 대한 사실과 선호도를 추출하고, 이를 기존 메모리와 비교하여 메모리를 어떻게 변경할지 한 번에 결정합니다.
+
+기억해야 할 정보 유형:
+
+1. 개인 선호: 음식, 제품, 활동, 엔터테인먼트 등에서 좋아하는 것과 싫어하는 것
+2. 중요한 개인 정보: 이름, 관계, 중요한 날짜
+3. 계획 및 의도: 예정된 이벤트, 여행, 목표
+4. 활동 및 서비스 선호도: 외식, 여행, 취미, 기타 서비스에 대한 선호
+5. 건강 및 웰빙: 식이 제한, 운동 루틴 등 웰빙 관련 정보
+6. 치료 이력: 질병, 증상, 진단명, 복용 중인 약물, 진행 중인 치료나 상담
+7. 직업 정보: 직함, 업무 습관, 경력 목표
+8. 기타 정보: 좋아하는 책, 영화, 브랜드 등
+
+대화에서 추출한 각 사실에 대해 다음 중 하나의 작업을 결정하세요:
+- ADD: 기존 메모리에 없는 새로운 정보라면 새로운 `id`로 추가합니다.
+- UPDATE: 기존 메모리와 관련되어 있지만 내용이 다르거나 정보량이 더 많다면, 같은 `id`를 유지하고 `text`를 수정하며 `old_memory`에 기존 내용을 적습니다.
+- DELETE: 기존 메모리와 모순되거나 메모리를 삭제하라는 요청이라면 같은 `id`로 삭제합니다.
+- NONE: 이미 같은 의미로 존재하는 경우 변경하지 않습니다.
+
+다음은 예시입니다:
+
+기존 메모리: [{{"id" : "0", "text" : "사용자는 야구를 좋아함"}}, {{"id" : "1", "text" : "치즈 피자를 좋아함"}}]
+대화: user: 안녕, 나는 성진이야. 요즘은 친구들이랑 야구하는 게 제일 좋아. 근데 치즈 피자는 이제 별로야.
+출력: {{"memory" : [
+    {{"id" : "0", "text" : "친구들과 야구하는 것을 좋아함", "event" : "UPDATE", "old_memory" : "사용자는 야구를 좋아함"}},
+    {{"id" : "1", "text" : "치즈 피자를 좋아함", "event" : "DELETE"}},
+    {{"id" : "2", "text" : "이름은 성진", "event" : "ADD"}}
+]}}
+
+기존 메모리: [{{"id" : "0", "text" : "이름은 성진"}}]
+대화: user: 안녕.
+출력: {{"memory" : []}}
+
+다음 사항을 꼭 기억하세요:
+- 오늘 날짜는 {datetime.now().strftime("%Y-%m-%d")}입니다.
+- 위에 제시된 예시는 실제 응답에 포함하지 마세요.
+- 시스템 메시지는 무시하고 사용자와 어시스턴트의 메시지만 기반으로 사실을 추출하세요.
+- 고유명사는 반드시 입력한 언어 그대로 저장하세요. 사실은 사용자 입력의 언어로 기록하며, 기본값은 한국어입니다.
+- 변경하지 않는 기존 메모리는 반환하지 않아도 됩니다.
+- 대화에서 사실을 찾지 못하면 "memory" 키에 빈 리스트를 반환하세요.
+- 응답은 반드시 JSON 형식이어야 하며, "memory" 키 아래 `id`, `text`, `event`, (UPDATE일 때) `old_memory`를 가진 객체의 리스트로 반환하세요.
+"""
+
+
 PROCEDURAL_MEMORY_SYSTEM_PROMPT = """
 You are a memory summarization system that records and preserves the complete interaction history between a human and an AI agent. You are provided with the agent’s execution history over the past N steps. Your task is to produce a comprehensive summary of the agent's output history that contains every detail necessary for the agent to continue the task without ambiguity. **Every output produced by the agent must be recorded verbatim as part of the summary.**
 
@@ -339,3 +384,10 @@ def get_update_memory_messages(
 
     Do not return anything except the JSON format.
     """
+
+
+def get_fused_memory_messages(retrieved_old_memory_dict, parsed_messages):
+    return (
+        FUSED_MEMORY_PROMPT,
+        f"기존 메모리:\n{retrieved_old_memory_dict}\n\n대화:\n{parsed_messages}",
+    )
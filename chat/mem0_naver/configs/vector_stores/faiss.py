@@ -19,6 +19,68 @@ class FAISSConfig(BaseModel):
     embedding_model_dims: int = Field(
         1536, description="Dimension of the embedding vector"
     )
+    wal_compaction_threshold: int = Field(
+        1000,
+        description="Minimum number of write-ahead log records before the log is compacted into a snapshot",
+    )
+    tombstone_compaction_ratio: float = Field(
+        0.2,
+        description="Fraction of deleted vectors in the index at which they are physically removed",
+    )
+    exact_filter_threshold: int = Field(
+        10000,
+        description="Maximum number of filter matches scored exactly; larger matches use an ID-selector search",
+    )
+    index_type: str = Field(
+        "flat",
+        description="Index to migrate to once the collection is large enough. Options: 'flat', 'ivf_flat', 'ivf_pq', 'hnsw'",
+    )
+    nlist: Optional[int] = Field(
+        None, description="Number of IVF cells. Defaults to 4 * sqrt(collection size)"
+    )
+    pq_m: int = Field(
+        64,
+        description="Number of PQ sub-quantizers for 'ivf_pq' (must divide the dimension)",
+    )
+    hnsw_m: int = Field(32, description="Number of HNSW neighbours per node")
+    nprobe: int = Field(16, description="Number of IVF cells visited per query")
+    ef_search: int = Field(64, description="HNSW search queue size")
+    ann_migration_threshold: int = Field(
+        50000,
+        description="Number of memories at which a flat collection is rebuilt into `index_type`",
+    )
+    vector_encoding: str = Field(
+        "float32",
+        description="How the index stores vectors. Options: 'float32', 'fp16', 'sq8', 'pq'",
+    )
+    rerank_factor: int = Field(
+        0,
+        description="Re-rank `limit * rerank_factor` compressed-index results against full-precision vectors (0 disables)",
+    )
+    durability: str = Field(
+        "group_commit",
+        description="When write-ahead log records reach the disk. Options: 'every_op', 'group_commit', 'on_shutdown'",
+    )
+    flush_interval: float = Field(
+        1.0,
+        description="Seconds a write may wait before it is flushed in 'group_commit' mode",
+    )
+    flush_max_records: int = Field(
+        100,
+        description="Number of pending writes that force a flush in 'group_commit' mode",
+    )
+    mmap: bool = Field(
+        False,
+        description="Memory-map the index file on load instead of reading it into RAM",
+    )
+    snapshot_generations: int = Field(
+        3,
+        description="Number of snapshot generations kept on disk to fall back to when the newest cannot be loaded",
+    )
+    reload_interval: float = Field(
+        0.0,
+        description="Seconds between checks for snapshot generations written by another process (0 disables)",
+    )
 
     @model_validator(mode="before")
     @classmethod
@@ -34,6 +96,38 @@ class FAISSConfig(BaseModel):
             )
         return values
 
+    @model_validator(mode="before")
+    @classmethod
+    def validate_index_type(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        index_type = values.get("index_type")
+        if index_type and index_type not in ["flat", "ivf_flat", "ivf_pq", "hnsw"]:
+            raise ValueError(
+                "Invalid index_type. Must be one of: 'flat', 'ivf_flat', 'ivf_pq', 'hnsw'"
+            )
+        vector_encoding = values.get("vector_encoding")
+        if vector_encoding and vector_encoding not in ["float32", "fp16", "sq8", "pq"]:
+            raise ValueError(
+                "Invalid vector_encoding. Must be one of: 'float32', 'fp16', 'sq8', 'pq'"
+            )
+        if index_type == "ivf_pq" or vector_encoding == "pq":
+            dims = values.get("embedding_model_dims", 1536)
+            pq_m = values.get("pq_m", 64)
+            if dims % pq_m != 0:
+                raise ValueError(
+                    f"pq_m ({pq_m}) must divide embedding_model_dims ({dims}) for PQ encoding"
+                )
+        return values
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_durability(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        durability = values.get("durability")
+        if durability and durability not in ["every_op", "group_commit", "on_shutdown"]:
+            raise ValueError(
+                "Invalid durability. Must be one of: 'every_op', 'group_commit', 'on_shutdown'"
+            )
+        return values
+
     @model_validator(mode="before")
     @classmethod
     def validate_extra_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
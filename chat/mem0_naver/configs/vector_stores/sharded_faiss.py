@@ -0,0 +1,19 @@
+from typing import Optional
+
+from pydantic import Field
+
+from mem0_naver.configs.vector_stores.faiss import FAISSConfig
+
+
+class ShardedFAISSConfig(FAISSConfig):
+    shard_key: str = Field(
+        "user_id", description="Payload key that picks the shard of a memory"
+    )
+    num_shards: Optional[int] = Field(
+        None,
+        description="Number of hash buckets the shard key values are spread over. None gives every value its own shard",
+    )
+    memory_budget_mb: float = Field(
+        512.0,
+        description="Estimated memory the open shards may use before the least recently used ones are closed",
+    )
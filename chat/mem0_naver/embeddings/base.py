@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from mem0_naver.configs.embeddings.base import BaseEmbedderConfig
 
@@ -29,3 +30,88 @@ class EmbeddingBase(ABC):
             list: The embedding vector.
         """
         pass
+
+    def embed_batch(
+        self,
+        texts: List[str],
+        memory_action: Optional[Literal["add", "search", "update"]] = None,
+    ):
+        """
+        Get the embeddings for several texts, embedding each distinct text once.
+
+        Texts are sent in batches of at most `max_batch_size` distinct texts.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vectors, in the order of `texts`.
+        """
+        embeddings = {}
+        for batch in self._unique_batches(texts):
+            embeddings.update(zip(batch, self._embed_many(batch, memory_action)))
+        return [embeddings[text] for text in texts]
+
+    async def aembed(
+        self, text, memory_action: Optional[Literal["add", "search", "update"]] = None
+    ):
+        """
+        Get the embedding for the given text without blocking the event loop.
+
+        Providers without a native async API run `embed` in a worker thread.
+
+        Args:
+            text (str): The text to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vector.
+        """
+        return await asyncio.to_thread(self.embed, text, memory_action)
+
+    async def aembed_batch(
+        self,
+        texts: List[str],
+        memory_action: Optional[Literal["add", "search", "update"]] = None,
+    ):
+        """
+        Async version of `embed_batch`.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vectors, in the order of `texts`.
+        """
+        embeddings = {}
+        for batch in self._unique_batches(texts):
+            embeddings.update(zip(batch, await self._aembed_many(batch, memory_action)))
+        return [embeddings[text] for text in texts]
+
+    def _unique_batches(self, texts: List[str]) -> List[List[str]]:
+        """Split the distinct texts into batches of at most `max_batch_size`."""
+        unique_texts = list(dict.fromkeys(texts))
+        batch_size = self.config.max_batch_size or len(unique_texts) or 1
+        return [
+            unique_texts[start : start + batch_size]
+            for start in range(0, len(unique_texts), batch_size)
+        ]
+
+    def _embed_many(
+        self,
+        texts: List[str],
+        memory_action: Optional[Literal["add", "search", "update"]] = None,
+    ):
+        """
+        Embed a batch of distinct texts. Providers with a batch API override this to send a single request.
+        """
+        return [self.embed(text, memory_action) for text in texts]
+
+    async def _aembed_many(
+        self,
+        texts: List[str],
+        memory_action: Optional[Literal["add", "search", "update"]] = None,
+    ):
+        """
+        Async version of `_embed_many`.
+        """
+        return await asyncio.to_thread(self._embed_many, texts, memory_action)
@@ -0,0 +1,264 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from mem0_naver.vector_stores.payload_store import chunked
+
+try:
+    from langchain.embeddings.base import Embeddings
+except ImportError:
+    raise ImportError(
+        "langchain is not installed. Please install it using `pip install langchain`"
+    )
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+_caches: Dict[Optional[str], "EmbeddingCache"] = {}
+_caches_lock = threading.Lock()
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so that strings differing only in Unicode form or whitespace share an embedding."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(model: str, text: str) -> str:
+    """Content address of the embedding of a text by a model."""
+    return hashlib.sha256(f"{model}\0{normalize_text(text)}".encode()).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Embeddings keyed by model and text hash, in an in-memory LRU backed by a SQLite table.
+
+    Vectors are stored as float32. Embeddings found on disk are promoted to the LRU, and every
+    new embedding is written to both tiers, so the cache survives restarts.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 10000):
+        """
+        Args:
+            path (str, optional): SQLite file of the on-disk tier. None keeps the cache in memory only.
+            max_entries (int, optional): Number of embeddings kept in memory. Defaults to 10000.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.connection = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.connection = sqlite3.connect(
+                path, check_same_thread=False, isolation_level=None
+            )
+            with self._lock:
+                self.connection.execute("PRAGMA journal_mode=WAL")
+                self.connection.execute("PRAGMA synchronous=NORMAL")
+                self.connection.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL)"
+                )
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up embeddings.
+
+        Args:
+            keys (List[str]): Keys from `cache_key`.
+
+        Returns:
+            Dict[str, np.ndarray]: Cached embedding of each key found in either tier.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+            self.memory_hits += len(found)
+
+            missing = [key for key in keys if key not in found]
+            if self.connection is not None:
+                for batch in chunked(missing):
+                    placeholders = ", ".join("?" * len(batch))
+                    for key, blob in self.connection.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                        batch,
+                    ):
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        self._remember(key, vector)
+                        found[key] = vector
+                        self.disk_hits += 1
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, model: str, embeddings: Dict[str, List[float]]):
+        """
+        Store new embeddings in both tiers.
+
+        Args:
+            model (str): Embedding model name.
+            embeddings (Dict[str, List[float]]): Embedding of each key.
+        """
+        vectors = {
+            key: np.asarray(vector, dtype=np.float32)
+            for key, vector in embeddings.items()
+        }
+        with self._lock:
+            for key, vector in vectors.items():
+                self._remember(key, vector)
+            if self.connection is not None:
+                try:
+                    self.connection.execute("BEGIN")
+                    self.connection.executemany(
+                        "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)",
+                        [
+                            (key, model, vector.tobytes())
+                            for key, vector in vectors.items()
+                        ],
+                    )
+                    self.connection.execute("COMMIT")
+                except Exception as e:
+                    self.connection.execute("ROLLBACK")
+                    logger.warning(f"Failed to write embedding cache: {e}")
+
+    def stats(self) -> Dict:
+        """
+        Get hit-rate metrics.
+
+        Returns:
+            Dict: Hits per tier, misses, overall hit rate and the number of embeddings in memory.
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (
+                    (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+                ),
+                "memory_entries": len(self._memory),
+            }
+
+    def close(self):
+        with self._lock:
+            if self.connection:
+                self.connection.close()
+                self.connection = None
+
+
+def get_embedding_cache(
+    path: Optional[str] = None, max_entries: int = 10000
+) -> EmbeddingCache:
+    """
+    Get the process-wide cache stored at `path`, so every embedder using the file shares one LRU.
+
+    Args:
+        path (str, optional): SQLite file of the on-disk tier. None gives the in-memory-only cache.
+        max_entries (int, optional): Number of embeddings kept in memory when the cache is created. Defaults to 10000.
+
+    Returns:
+        EmbeddingCache: The shared cache.
+    """
+    key = os.path.abspath(path) if path else None
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = EmbeddingCache(path, max_entries)
+        return _caches[key]
+
+
+def embedding_cache_stats() -> Dict[str, Dict]:
+    """Hit-rate metrics of every shared cache, by path."""
+    with _caches_lock:
+        caches = dict(_caches)
+    return {path or ":memory:": cache.stats() for path, cache in caches.items()}
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain embeddings that look every text up in an `EmbeddingCache` before calling the wrapped model."""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache: EmbeddingCache,
+        model_name: Optional[str] = None,
+    ):
+        """
+        Args:
+            embeddings (Embeddings): Model to wrap.
+            cache (EmbeddingCache): Cache to use.
+            model_name (str, optional): Name in the cache keys. Defaults to the model's `model` or `model_name`
+                attribute, or its class name.
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = (
+            model_name
+            or getattr(embeddings, "model", None)
+            or getattr(embeddings, "model_name", None)
+            or type(embeddings).__name__
+        )
+
+    def _lookup(self, texts: List[str]):
+        keys = [cache_key(self.model_name, text) for text in texts]
+        found = self.cache.get_many(keys)
+        # First text of every missing key, so each distinct text is embedded once
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        return keys, found, missing
+
+    def _store(self, keys, found, missing, embeddings):
+        new = dict(zip(missing, embeddings))
+        if new:
+            self.cache.put_many(self.model_name, new)
+        return [new[key] if key in new else found[key].tolist() for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = self._lookup(texts)
+        embeddings = (
+            self.embeddings.embed_documents(list(missing.values())) if missing else []
+        )
+        return self._store(keys, found, missing, embeddings)
+
+    def embed_query(self, text: str) -> List[float]:
+        keys, found, missing = self._lookup([text])
+        embeddings = [self.embeddings.embed_query(text)] if missing else []
+        return self._store(keys, found, missing, embeddings)[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = self._lookup(texts)
+        embeddings = (
+            await self.embeddings.aembed_documents(list(missing.values()))
+            if missing
+            else []
+        )
+        return self._store(keys, found, missing, embeddings)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        keys, found, missing = self._lookup([text])
+        embeddings = [await self.embeddings.aembed_query(text)] if missing else []
+        return self._store(keys, found, missing, embeddings)[0]
@@ -1,7 +1,8 @@
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from mem0_naver.configs.embeddings.base import BaseEmbedderConfig
 from mem0_naver.embeddings.base import EmbeddingBase
+from mem0_naver.embeddings.cache import CachedEmbeddings, get_embedding_cache
 
 try:
     from langchain.embeddings.base import Embeddings
@@ -22,6 +23,11 @@ class LangchainEmbedding(EmbeddingBase):
             raise ValueError("`model` must be an instance of Embeddings")
 
         self.langchain_model = self.config.model
+        if self.config.cache_path:
+            self.langchain_model = CachedEmbeddings(
+                self.langchain_model,
+                get_embedding_cache(self.config.cache_path, self.config.cache_size),
+            )
 
     def embed(
         self, text, memory_action: Optional[Literal["add", "search", "update"]] = None
@@ -37,3 +43,37 @@ class LangchainEmbedding(EmbeddingBase):
         """
 
         return self.langchain_model.embed_query(text)
+
+    async def aembed(
+        self, text, memory_action: Optional[Literal["add", "search", "update"]] = None
+    ):
+        """
+        Get the embedding for the given text using Langchain's native async API.
+
+        Args:
+            text (str): The text to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vector.
+        """
+        return await self.langchain_model.aembed_query(text)
+
+    def _embed_many(
+        self,
+        texts: List[str],
+        memory_action: Optional[Literal["add", "search", "update"]] = None,
+    ):
+        """
+        Embed a batch of distinct texts with a single `embed_documents` call.
+        """
+        return self.langchain_model.embed_documents(texts)
+
+    async def _aembed_many(
+        self,
+        texts: List[str],
+        memory_action: Optional[Literal["add", "search", "update"]] = None,
+    ):
+        """
+        Embed a batch of distinct texts with a single `aembed_documents` call.
+        """
+        return await self.langchain_model.aembed_documents(texts)
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional
 
@@ -32,3 +33,18 @@ class LLMBase(ABC):
             str: The generated response.
         """
         pass
+
+    async def agenerate_response(self, messages, **kwargs):
+        """
+        Generate a response without blocking the event loop.
+
+        Providers without a native async API run `generate_response` in a worker thread.
+
+        Args:
+            messages (list): List of message dicts containing 'role' and 'content'.
+            **kwargs: Arguments of `generate_response`.
+
+        Returns:
+            str: The generated response.
+        """
+        return await asyncio.to_thread(self.generate_response, messages, **kwargs)
@@ -43,23 +43,40 @@ class LangchainLLM(LLMBase):
             str: The generated response.
         """
         try:
-            # Convert the messages to LangChain's tuple format
-            langchain_messages = []
-            for message in messages:
-                role = message["role"]
-                content = message["content"]
+            ai_message = self.langchain_model.invoke(
+                self._to_langchain_messages(messages)
+            )
+
+            return ai_message.content
+
+        except Exception as e:
+            raise Exception(
+                f"Error generating response using langchain model: {str(e)}"
+            )
 
-                if role == "system":
-                    langchain_messages.append(("system", content))
-                elif role == "user":
-                    langchain_messages.append(("human", content))
-                elif role == "assistant":
-                    langchain_messages.append(("ai", content))
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        response_format=None,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+    ):
+        """
+        Generate a response based on the given messages using Langchain's native async API.
 
-            if not langchain_messages:
-                raise ValueError("No valid messages found in the messages list")
+        Args:
+            messages (list): List of message dicts containing 'role' and 'content'.
+            response_format (str or object, optional): Format of the response. Not used in Langchain.
+            tools (list, optional): List of tools that the model can call. Not used in Langchain.
+            tool_choice (str, optional): Tool choice method. Not used in Langchain.
 
-            ai_message = self.langchain_model.invoke(langchain_messages)
+        Returns:
+            str: The generated response.
+        """
+        try:
+            ai_message = await self.langchain_model.ainvoke(
+                self._to_langchain_messages(messages)
+            )
 
             return ai_message.content
 
@@ -67,3 +84,22 @@ class LangchainLLM(LLMBase):
             raise Exception(
                 f"Error generating response using langchain model: {str(e)}"
             )
+
+    @staticmethod
+    def _to_langchain_messages(messages: List[Dict[str, str]]) -> List[tuple]:
+        """Convert the messages to LangChain's tuple format."""
+        langchain_messages = []
+        for message in messages:
+            role = message["role"]
+            content = message["content"]
+
+            if role == "system":
+                langchain_messages.append(("system", content))
+            elif role == "user":
+                langchain_messages.append(("human", content))
+            elif role == "assistant":
+                langchain_messages.append(("ai", content))
+
+        if not langchain_messages:
+            raise ValueError("No valid messages found in the messages list")
+        return langchain_messages
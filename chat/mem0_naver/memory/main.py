@@ -4,7 +4,6 @@ import gc
 import hashlib
 import json
 import logging
-import os
 import uuid
 import warnings
 from copy import deepcopy
@@ -18,12 +17,14 @@ from mem0_naver.configs.base import MemoryConfig, MemoryItem
 from mem0_naver.configs.enums import MemoryType
 from mem0_naver.configs.prompts import (
     PROCEDURAL_MEMORY_SYSTEM_PROMPT,
+    get_fused_memory_messages,
     get_update_memory_messages,
 )
 from mem0_naver.memory.base import MemoryBase
-from mem0_naver.memory.setup import mem0_dir, setup_config
+from mem0_naver.memory.prefilter import FactPrefilter
+from mem0_naver.memory.setup import setup_config
 from mem0_naver.memory.storage import SQLiteManager
-from mem0_naver.memory.telemetry import capture_event
+from mem0_naver.memory.telemetry import capture_event, timed
 from mem0_naver.memory.utils import (
     get_fact_retrieval_messages,
     parse_messages,
@@ -120,6 +121,32 @@ setup_config()
 logger = logging.getLogger(__name__)
 
 
+def _drop_stored_facts(vector_store, facts: list, filters: Dict[str, Any]) -> list:
+    """
+    Remove extracted facts that are already stored word for word, along with repeats among them.
+
+    Memories keep the MD5 hash of their text in the payload, so an exact duplicate is found through
+    the vector store's hash lookup without embedding the fact or asking the LLM about it.
+
+    Args:
+        vector_store: Vector store holding the memories.
+        facts (list): Facts extracted from the conversation.
+        filters (Dict[str, Any]): Filters scoping the lookup to the session, e.g. the user_id.
+
+    Returns:
+        list: Facts without a stored duplicate, in their original order.
+    """
+    facts_by_hash = {}
+    for fact in facts:
+        facts_by_hash.setdefault(hashlib.md5(fact.encode()).hexdigest(), fact)
+    stored = vector_store.find_by_hash(list(facts_by_hash), filters=filters)
+    if stored:
+        logger.info(f"Skipping {len(stored)} facts already stored as memories")
+    return [
+        fact for fact_hash, fact in facts_by_hash.items() if fact_hash not in stored
+    ]
+
+
 class Memory(MemoryBase):
     def __init__(self, config: MemoryConfig = MemoryConfig()):
         self.config = config
@@ -138,6 +165,7 @@ class Memory(MemoryBase):
         self.db = SQLiteManager(self.config.history_db_path)
         self.collection_name = self.config.vector_store.config.collection_name
         self.api_version = self.config.version
+        self.fact_prefilter = FactPrefilter(**self.config.fact_prefilter.model_dump())
 
         self.enable_graph = False
 
@@ -153,14 +181,6 @@ class Memory(MemoryBase):
             self.enable_graph = True
         else:
             self.graph = None
-        self.config.vector_store.config.collection_name = "mem0migrations"
-        if self.config.vector_store.provider in ["faiss"]:
-            provider_path = f"migrations_{self.config.vector_store.provider}"
-            self.config.vector_store.config.path = os.path.join(mem0_dir, provider_path)
-            os.makedirs(self.config.vector_store.config.path, exist_ok=True)
-        self._telemetry_vector_store = VectorStoreFactory.create(
-            self.config.vector_store.provider, self.config.vector_store.config
-        )
         capture_event("mem0_naver.init", self, {"sync_type": "sync"})
 
     @classmethod
@@ -188,6 +208,7 @@ class Memory(MemoryBase):
             logger.error(f"Configuration validation error: {e}")
             raise
 
+    @timed("mem0_naver.add")
     def add(
         self,
         messages,
@@ -299,7 +320,7 @@ class Memory(MemoryBase):
 
     def _add_to_vector_store(self, messages, metadata, filters, infer):
         if not infer:
-            returned_memories = []
+            valid_messages = []
             for message_dict in messages:
                 if (
                     not isinstance(message_dict, dict)
@@ -312,6 +333,15 @@ class Memory(MemoryBase):
                 if message_dict["role"] == "system":
                     continue
 
+                valid_messages.append(message_dict)
+
+            # One embedding request for every message
+            message_embeddings = self.embedding_model.embed_batch(
+                [message_dict["content"] for message_dict in valid_messages], "add"
+            )
+
+            returned_memories = []
+            for message_dict, msg_embeddings in zip(valid_messages, message_embeddings):
                 per_msg_meta = deepcopy(metadata)
                 per_msg_meta["role"] = message_dict["role"]
 
@@ -320,8 +350,9 @@ class Memory(MemoryBase):
                     per_msg_meta["actor_id"] = actor_name
 
                 msg_content = message_dict["content"]
-                msg_embeddings = self.embedding_model.embed(msg_content, "add")
-                mem_id = self._create_memory(msg_content, msg_embeddings, per_msg_meta)
+                mem_id = self._create_memory(
+                    msg_content, {msg_content: msg_embeddings}, per_msg_meta
+                )
 
                 returned_memories.append(
                     {
@@ -334,6 +365,11 @@ class Memory(MemoryBase):
                 )
             return returned_memories
 
+        content_free = self.fact_prefilter.check(messages)
+        if content_free and self.fact_prefilter.enforced:
+            logger.debug("No content in the messages. Skipping fact extraction.")
+            return []
+
         parsed_messages = parse_messages(messages)
 
         if self.config.custom_fact_extraction_prompt:
@@ -356,6 +392,7 @@ class Memory(MemoryBase):
         except Exception as e:
             logger.error(f"Error in new_retrieved_facts: {e}")
             new_retrieved_facts = []
+        self.fact_prefilter.record_extraction(content_free, new_retrieved_facts)
 
         if not new_retrieved_facts:
             logger.debug(
@@ -363,17 +400,29 @@ class Memory(MemoryBase):
             )
             return []
 
+        new_retrieved_facts = _drop_stored_facts(
+            self.vector_store, new_retrieved_facts, filters
+        )
+        if not new_retrieved_facts:
+            logger.debug(
+                "All facts are already stored. Skipping memory update LLM call."
+            )
+            return []
+
         retrieved_old_memory = []
-        new_message_embeddings = {}
-        for new_mem in new_retrieved_facts:
-            messages_embeddings = self.embedding_model.embed(new_mem, "add")
-            new_message_embeddings[new_mem] = messages_embeddings
-            existing_memories = self.vector_store.search(
-                query=new_mem,
-                vectors=messages_embeddings,
-                limit=5,
-                filters=filters,
+        new_message_embeddings = dict(
+            zip(
+                new_retrieved_facts,
+                self.embedding_model.embed_batch(new_retrieved_facts, "add"),
             )
+        )
+
+        search_results_list = self.vector_store.search_batch(
+            vectors=[new_message_embeddings[fact] for fact in new_retrieved_facts],
+            limit=5,
+            filters=filters,
+        )
+        for existing_memories in search_results_list:
             for mem in existing_memories:
                 retrieved_old_memory.append({"id": mem.id, "text": mem.payload["data"]})
 
@@ -689,6 +738,7 @@ class Memory(MemoryBase):
 
         return formatted_memories
 
+    @timed("mem0_naver.search")
     def search(
         self,
         query: str,
@@ -709,7 +759,8 @@ class Memory(MemoryBase):
             run_id (str, optional): ID of the run to search for. Defaults to None.
             limit (int, optional): Limit the number of results. Defaults to 100.
             filters (dict, optional): Filters to apply to the search. Defaults to None..
-            threshold (float, optional): Minimum score for a memory to be included in the results. Defaults to None.
+            threshold (float, optional): Minimum score for a memory to be included in the results. When set,
+                every memory reaching it is returned, up to `limit`, through a range search. Defaults to None.
 
         Returns:
             dict: A dictionary containing the search results, typically under a "results" key,
@@ -781,9 +832,19 @@ class Memory(MemoryBase):
         self, query, filters, limit, threshold: Optional[float] = None
     ):
         embeddings = self.embedding_model.embed(query, "search")
-        memories = self.vector_store.search(
-            query=query, vectors=embeddings, limit=limit, filters=filters
-        )
+        if threshold is None:
+            memories = self.vector_store.search(
+                query=query, vectors=embeddings, limit=limit, filters=filters
+            )
+        else:
+            # Every memory reaching the threshold, up to limit, rather than the top limit
+            memories = self.vector_store.range_search(
+                query=query,
+                vectors=embeddings,
+                threshold=threshold,
+                limit=limit,
+                filters=filters,
+            )
 
         promoted_payload_keys = [
             "user_id",
@@ -823,8 +884,7 @@ class Memory(MemoryBase):
             if additional_metadata:
                 memory_item_dict["metadata"] = additional_metadata
 
-            if threshold is None or mem.score >= threshold:
-                original_memories.append(memory_item_dict)
+            original_memories.append(memory_item_dict)
 
         return original_memories
 
@@ -894,11 +954,18 @@ class Memory(MemoryBase):
             self,
             {"keys": keys, "encoded_ids": encoded_ids, "sync_type": "sync"},
         )
-        memories = self.vector_store.list(filters=filters)[0]
-        for memory in memories:
-            self._delete_memory(memory.id)
+        deleted, cursor = 0, None
+        while True:
+            memories, cursor = self.vector_store.list_page(
+                filters=filters, cursor=cursor
+            )
+            for memory in memories:
+                self._delete_memory(memory.id)
+            deleted += len(memories)
+            if cursor is None:
+                break
 
-        logger.info(f"Deleted {len(memories)} memories")
+        logger.info(f"Deleted {deleted} memories")
 
         if self.enable_graph:
             self.graph.delete_all(filters)
@@ -1127,6 +1194,7 @@ class AsyncMemory(MemoryBase):
         self.db = SQLiteManager(self.config.history_db_path)
         self.collection_name = self.config.vector_store.config.collection_name
         self.api_version = self.config.version
+        self.fact_prefilter = FactPrefilter(**self.config.fact_prefilter.model_dump())
 
         self.enable_graph = False
 
@@ -1165,6 +1233,7 @@ class AsyncMemory(MemoryBase):
             logger.error(f"Configuration validation error: {e}")
             raise
 
+    @timed("mem0_naver.add")
     async def add(
         self,
         messages,
@@ -1265,7 +1334,7 @@ class AsyncMemory(MemoryBase):
         infer: bool,
     ):
         if not infer:
-            returned_memories = []
+            valid_messages = []
             for message_dict in messages:
                 if (
                     not isinstance(message_dict, dict)
@@ -1280,6 +1349,15 @@ class AsyncMemory(MemoryBase):
                 if message_dict["role"] == "system":
                     continue
 
+                valid_messages.append(message_dict)
+
+            # One embedding request for every message
+            message_embeddings = await self.embedding_model.aembed_batch(
+                [message_dict["content"] for message_dict in valid_messages], "add"
+            )
+
+            returned_memories = []
+            for message_dict, msg_embeddings in zip(valid_messages, message_embeddings):
                 per_msg_meta = deepcopy(metadata)
                 per_msg_meta["role"] = message_dict["role"]
 
@@ -1288,11 +1366,8 @@ class AsyncMemory(MemoryBase):
                     per_msg_meta["actor_id"] = actor_name
 
                 msg_content = message_dict["content"]
-                msg_embeddings = await asyncio.to_thread(
-                    self.embedding_model.embed, msg_content, "add"
-                )
                 mem_id = await self._create_memory(
-                    msg_content, msg_embeddings, per_msg_meta
+                    msg_content, {msg_content: msg_embeddings}, per_msg_meta
                 )
 
                 returned_memories.append(
@@ -1306,15 +1381,51 @@ class AsyncMemory(MemoryBase):
                 )
             return returned_memories
 
+        content_free = self.fact_prefilter.check(messages)
+        if content_free and self.fact_prefilter.enforced:
+            logger.debug("No content in the messages. Skipping fact extraction.")
+            return []
+
         parsed_messages = parse_messages(messages)
+        # Custom prompts are written for the two-pass pipeline
+        if (
+            self.config.fused_extraction
+            and not self.config.custom_fact_extraction_prompt
+            and not self.config.custom_update_memory_prompt
+        ):
+            returned_memories = await self._add_fused(
+                messages, parsed_messages, metadata, effective_filters, content_free
+            )
+        else:
+            returned_memories = await self._add_two_pass(
+                parsed_messages, metadata, effective_filters, content_free
+            )
+
+        keys, encoded_ids = process_telemetry_filters(effective_filters)
+        capture_event(
+            "mem0_naver.add",
+            self,
+            {
+                "version": self.api_version,
+                "keys": keys,
+                "encoded_ids": encoded_ids,
+                "sync_type": "async",
+                "fused": self.config.fused_extraction,
+            },
+        )
+        return returned_memories
+
+    async def _add_two_pass(
+        self, parsed_messages, metadata, effective_filters, content_free
+    ):
+        """Extract facts with one LLM call, then decide the memory actions for them with another."""
         if self.config.custom_fact_extraction_prompt:
             system_prompt = self.config.custom_fact_extraction_prompt
             user_prompt = f"Input:\n{parsed_messages}"
         else:
             system_prompt, user_prompt = get_fact_retrieval_messages(parsed_messages)
 
-        response = await asyncio.to_thread(
-            self.llm.generate_response,
+        response = await self.llm.agenerate_response(
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
@@ -1329,6 +1440,7 @@ class AsyncMemory(MemoryBase):
         except Exception as e:
             logger.error(f"Error in new_retrieved_facts: {e}")
             new_retrieved_facts = []
+        self.fact_prefilter.record_extraction(content_free, new_retrieved_facts)
 
         if not new_retrieved_facts:
             logger.debug(
@@ -1336,29 +1448,36 @@ class AsyncMemory(MemoryBase):
             )
             return []
 
-        retrieved_old_memory = []
-        new_message_embeddings = {}
-
-        async def process_fact_for_search(new_mem_content):
-            embeddings = await asyncio.to_thread(
-                self.embedding_model.embed, new_mem_content, "add"
-            )
-            new_message_embeddings[new_mem_content] = embeddings
-            existing_mems = await asyncio.to_thread(
-                self.vector_store.search,
-                query=new_mem_content,
-                vectors=embeddings,
-                limit=5,
-                filters=effective_filters,  # 'filters' is query_filters_for_inference
+        new_retrieved_facts = await asyncio.to_thread(
+            _drop_stored_facts,
+            self.vector_store,
+            new_retrieved_facts,
+            effective_filters,
+        )
+        if not new_retrieved_facts:
+            logger.debug(
+                "All facts are already stored. Skipping memory update LLM call."
             )
-            return [
-                {"id": mem.id, "text": mem.payload["data"]} for mem in existing_mems
-            ]
+            return []
 
-        search_tasks = [process_fact_for_search(fact) for fact in new_retrieved_facts]
-        search_results_list = await asyncio.gather(*search_tasks)
-        for result_group in search_results_list:
-            retrieved_old_memory.extend(result_group)
+        retrieved_old_memory = []
+        # One embedding request for every extracted fact
+        fact_embeddings = await self.embedding_model.aembed_batch(
+            new_retrieved_facts, "add"
+        )
+        new_message_embeddings = dict(zip(new_retrieved_facts, fact_embeddings))
+
+        # One index scan for every extracted fact
+        search_results_list = await asyncio.to_thread(
+            self.vector_store.search_batch,
+            vectors=[new_message_embeddings[fact] for fact in new_retrieved_facts],
+            limit=5,
+            filters=effective_filters,  # 'filters' is query_filters_for_inference
+        )
+        for existing_mems in search_results_list:
+            retrieved_old_memory.extend(
+                {"id": mem.id, "text": mem.payload["data"]} for mem in existing_mems
+            )
 
         unique_data = {}
         for item in retrieved_old_memory:
@@ -1378,8 +1497,7 @@ class AsyncMemory(MemoryBase):
                 self.config.custom_update_memory_prompt,
             )
             try:
-                response = await asyncio.to_thread(
-                    self.llm.generate_response,
+                response = await self.llm.agenerate_response(
                     messages=[{"role": "user", "content": function_calling_prompt}],
                     response_format={"type": "json_object"},
                 )
@@ -1396,6 +1514,132 @@ class AsyncMemory(MemoryBase):
                 logger.error(f"Invalid JSON response: {e}")
                 new_memories_with_actions = {}
 
+        returned_memories = await self._apply_memory_actions(
+            new_memories_with_actions,
+            temp_uuid_mapping,
+            new_message_embeddings,
+            metadata,
+        )
+        return returned_memories
+
+    async def _add_fused(
+        self, messages, parsed_messages, metadata, effective_filters, content_free
+    ):
+        """
+        Extract facts and decide the memory actions for them with a single LLM call.
+
+        The existing memories shown to the LLM are retrieved with the embedding of the raw user
+        turns instead of one search per extracted fact.
+        """
+        query = "\n".join(
+            message["content"]
+            for message in messages
+            if message.get("role") == "user" and isinstance(message.get("content"), str)
+        )
+        query_embedding = await self.embedding_model.aembed(
+            query or parsed_messages, "search"
+        )
+        existing_memories = await asyncio.to_thread(
+            self.vector_store.search,
+            query=query,
+            vectors=query_embedding,
+            limit=self.config.fused_memory_limit,
+            filters=effective_filters,
+        )
+
+        retrieved_old_memory = []
+        temp_uuid_mapping = {}
+        for idx, mem in enumerate(existing_memories):
+            temp_uuid_mapping[str(idx)] = mem.id
+            retrieved_old_memory.append({"id": str(idx), "text": mem.payload["data"]})
+        logger.info(f"Total existing memories: {len(retrieved_old_memory)}")
+
+        system_prompt, user_prompt = get_fused_memory_messages(
+            retrieved_old_memory, parsed_messages
+        )
+        try:
+            response = await self.llm.agenerate_response(
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                response_format={"type": "json_object"},
+            )
+            response = remove_code_blocks(response)
+            response = extract_json(response)
+            new_memories_with_actions = json.loads(response)
+            eirene_logger.debug(
+                f"[mem0-naver] LTM JSON actions: {new_memories_with_actions}"
+            )
+        except Exception as e:
+            logger.error(f"Invalid fused memory actions response: {e}")
+            new_memories_with_actions = {}
+
+        actions = [
+            action
+            for action in new_memories_with_actions.get("memory", [])
+            if isinstance(action, dict) and action.get("text")
+        ]
+        self.fact_prefilter.record_extraction(
+            content_free,
+            [action["text"] for action in actions if action.get("event") != "NONE"],
+        )
+
+        # Additions of memories already stored word for word are dropped, as facts are in two passes
+        added = [action["text"] for action in actions if action.get("event") == "ADD"]
+        if added:
+            new_added = set(
+                await asyncio.to_thread(
+                    _drop_stored_facts, self.vector_store, added, effective_filters
+                )
+            )
+            kept = []
+            for action in actions:
+                if action.get("event") == "ADD":
+                    if action["text"] not in new_added:
+                        continue
+                    new_added.discard(action["text"])
+                kept.append(action)
+            actions = kept
+
+        # One embedding request for every new or updated memory
+        texts = list(
+            dict.fromkeys(
+                action["text"]
+                for action in actions
+                if action.get("event") in ("ADD", "UPDATE")
+            )
+        )
+        embeddings = (
+            await self.embedding_model.aembed_batch(texts, "add") if texts else []
+        )
+
+        return await self._apply_memory_actions(
+            {"memory": actions},
+            temp_uuid_mapping,
+            dict(zip(texts, embeddings)),
+            metadata,
+        )
+
+    async def _apply_memory_actions(
+        self,
+        new_memories_with_actions,
+        temp_uuid_mapping,
+        new_message_embeddings,
+        metadata,
+    ):
+        """
+        Apply the ADD/UPDATE/DELETE actions returned by the update-memory LLM.
+
+        Args:
+            new_memories_with_actions (dict): Parsed LLM response with a "memory" list of actions.
+            temp_uuid_mapping (dict): Temporary IDs shown to the LLM, mapped to memory IDs.
+            new_message_embeddings (dict): Embeddings of texts embedded already, by text.
+            metadata (dict): Metadata of new and updated memories.
+
+        Returns:
+            list: The applied actions.
+        """
         returned_memories = []
         try:
             memory_tasks = []
@@ -1476,18 +1720,6 @@ class AsyncMemory(MemoryBase):
                     logger.error(f"Error awaiting memory task (async): {e}")
         except Exception as e:
             logger.error(f"Error in memory processing loop (async): {e}")
-
-        keys, encoded_ids = process_telemetry_filters(effective_filters)
-        capture_event(
-            "mem0_naver.add",
-            self,
-            {
-                "version": self.api_version,
-                "keys": keys,
-                "encoded_ids": encoded_ids,
-                "sync_type": "async",
-            },
-        )
         return returned_memories
 
     async def _add_to_graph(self, messages, filters):
@@ -1698,6 +1930,7 @@ class AsyncMemory(MemoryBase):
 
         return formatted_memories
 
+    @timed("mem0_naver.search")
     async def search(
         self,
         query: str,
@@ -1718,7 +1951,8 @@ class AsyncMemory(MemoryBase):
             run_id (str, optional): ID of the run to search for. Defaults to None.
             limit (int, optional): Limit the number of results. Defaults to 100.
             filters (dict, optional): Filters to apply to the search. Defaults to None.
-            threshold (float, optional): Minimum score for a memory to be included in the results. Defaults to None.
+            threshold (float, optional): Minimum score for a memory to be included in the results. When set,
+                every memory reaching it is returned, up to `limit`, through a range search. Defaults to None.
 
         Returns:
             dict: A dictionary containing the search results, typically under a "results" key,
@@ -1796,16 +2030,25 @@ class AsyncMemory(MemoryBase):
     async def _search_vector_store(
         self, query, filters, limit, threshold: Optional[float] = None
     ):
-        embeddings = await asyncio.to_thread(
-            self.embedding_model.embed, query, "search"
-        )
-        memories = await asyncio.to_thread(
-            self.vector_store.search,
-            query=query,
-            vectors=embeddings,
-            limit=limit,
-            filters=filters,
-        )
+        embeddings = await self.embedding_model.aembed(query, "search")
+        if threshold is None:
+            memories = await asyncio.to_thread(
+                self.vector_store.search,
+                query=query,
+                vectors=embeddings,
+                limit=limit,
+                filters=filters,
+            )
+        else:
+            # Every memory reaching the threshold, up to limit, rather than the top limit
+            memories = await asyncio.to_thread(
+                self.vector_store.range_search,
+                query=query,
+                vectors=embeddings,
+                threshold=threshold,
+                limit=limit,
+                filters=filters,
+            )
 
         promoted_payload_keys = [
             "user_id",
@@ -1845,8 +2088,7 @@ class AsyncMemory(MemoryBase):
             if additional_metadata:
                 memory_item_dict["metadata"] = additional_metadata
 
-            if threshold is None or mem.score >= threshold:
-                original_memories.append(memory_item_dict)
+            original_memories.append(memory_item_dict)
 
         return original_memories
 
@@ -1865,7 +2107,7 @@ class AsyncMemory(MemoryBase):
             "mem0_naver.update", self, {"memory_id": memory_id, "sync_type": "async"}
         )
 
-        embeddings = await asyncio.to_thread(self.embedding_model.embed, data, "update")
+        embeddings = await self.embedding_model.aembed(data, "update")
         existing_embeddings = {data: embeddings}
 
         await self._update_memory(memory_id, data, existing_embeddings)
@@ -1912,15 +2154,19 @@ class AsyncMemory(MemoryBase):
             self,
             {"keys": keys, "encoded_ids": encoded_ids, "sync_type": "async"},
         )
-        memories = await asyncio.to_thread(self.vector_store.list, filters=filters)
-
-        delete_tasks = []
-        for memory in memories[0]:
-            delete_tasks.append(self._delete_memory(memory.id))
-
-        await asyncio.gather(*delete_tasks)
+        deleted, cursor = 0, None
+        while True:
+            memories, cursor = await asyncio.to_thread(
+                self.vector_store.list_page, filters=filters, cursor=cursor
+            )
+            await asyncio.gather(
+                *(self._delete_memory(memory.id) for memory in memories)
+            )
+            deleted += len(memories)
+            if cursor is None:
+                break
 
-        logger.info(f"Deleted {len(memories[0])} memories")
+        logger.info(f"Deleted {deleted} memories")
 
         if self.enable_graph:
             await asyncio.to_thread(self.graph.delete_all, filters)
@@ -1947,9 +2193,7 @@ class AsyncMemory(MemoryBase):
         if data in existing_embeddings:
             embeddings = existing_embeddings[data]
         else:
-            embeddings = await asyncio.to_thread(
-                self.embedding_model.embed, data, memory_action="add"
-            )
+            embeddings = await self.embedding_model.aembed(data, memory_action="add")
 
         memory_id = str(uuid.uuid4())
         metadata = metadata or {}
@@ -2018,11 +2262,11 @@ class AsyncMemory(MemoryBase):
         try:
             if llm is not None:
                 parsed_messages = convert_to_messages(parsed_messages)
-                response = await asyncio.to_thread(llm.invoke, input=parsed_messages)
+                response = await llm.ainvoke(input=parsed_messages)
                 procedural_memory = response.content
             else:
-                procedural_memory = await asyncio.to_thread(
-                    self.llm.generate_response, messages=parsed_messages
+                procedural_memory = await self.llm.agenerate_response(
+                    messages=parsed_messages
                 )
         except Exception as e:
             logger.error(f"Error generating procedural memory summary: {e}")
@@ -2032,8 +2276,8 @@ class AsyncMemory(MemoryBase):
             raise ValueError("Metadata cannot be done for procedural memory.")
 
         metadata["memory_type"] = MemoryType.PROCEDURAL.value
-        embeddings = await asyncio.to_thread(
-            self.embedding_model.embed, procedural_memory, memory_action="add"
+        embeddings = await self.embedding_model.aembed(
+            procedural_memory, memory_action="add"
         )
         memory_id = await self._create_memory(
             procedural_memory, {procedural_memory: embeddings}, metadata=metadata
@@ -2089,9 +2333,7 @@ class AsyncMemory(MemoryBase):
         if data in existing_embeddings:
             embeddings = existing_embeddings[data]
         else:
-            embeddings = await asyncio.to_thread(
-                self.embedding_model.embed, data, "update"
-            )
+            embeddings = await self.embedding_model.aembed(data, "update")
 
         await asyncio.to_thread(
             self.vector_store.update,
@@ -0,0 +1,262 @@
+import logging
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from mem0_naver.memory.telemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+# Whole turns that never carry a fact: greetings, acknowledgements, thanks and filler.
+# Bare answers are left out, negations ("아니요", "no") and affirmatives ("네", "응", "맞아",
+# "yes") alike: they often answer the assistant's question ("약은 드시고 계세요?") and carry its fact.
+FILLER_PHRASES = {
+    # Korean
+    "안녕",
+    "안녕하세요",
+    "안녕하십니까",
+    "반가워",
+    "반가워요",
+    "반갑습니다",
+    "음",
+    "아",
+    "오",
+    "흠",
+    "그렇구나",
+    "그렇군요",
+    "알겠어",
+    "알겠어요",
+    "알겠습니다",
+    "감사",
+    "감사해요",
+    "감사합니다",
+    "고마워",
+    "고마워요",
+    "고맙습니다",
+    "글쎄",
+    "글쎄요",
+    "잘자",
+    "잘자요",
+    "안녕히계세요",
+    "안녕히주무세요",
+    "또봐요",
+    "수고하세요",
+    # English
+    "hi",
+    "hello",
+    "hey",
+    "bye",
+    "goodbye",
+    "thanks",
+    "thank you",
+    "thx",
+    "hmm",
+    "um",
+    "uh",
+    "oh",
+    "ah",
+    "i see",
+    "got it",
+    "cool",
+    "nice",
+    "lol",
+}
+
+# Bare answers, kept even when shorter than `min_chars`
+ANSWER_PHRASES = {
+    "네",
+    "넵",
+    "네네",
+    "예",
+    "응",
+    "웅",
+    "어",
+    "엉",
+    "아니",
+    "아뇨",
+    "아니요",
+    "그래",
+    "그래요",
+    "맞아",
+    "맞아요",
+    "좋아",
+    "좋아요",
+    "yes",
+    "yeah",
+    "yep",
+    "no",
+    "nope",
+    "ok",
+    "okay",
+    "sure",
+}
+
+# Stems that carry no fact on their own when the morphological analyzer is used
+FILLER_STEMS = {
+    "안녕",
+    "감사",
+    "고맙다",
+    "알다",
+}
+CONTENT_TAGS = {"Noun", "Verb", "Adjective", "Number", "Alpha", "Foreign"}
+
+# Punctuation, emoji, and Hangul jamo runs such as ㅋㅋ, ㅎㅎ, ㅠㅠ (laughter, crying)
+_NON_WORD = re.compile(r"[^\w\s]|_|[ㄱ-ㆎ]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFC", text).lower()
+    text = _NON_WORD.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class FactPrefilter:
+    """
+    Local gate in front of the fact-extraction LLM that skips turns without any content.
+
+    A turn is content-free when, after dropping punctuation, emoji and Hangul jamo (ㅋㅋ, ㅠㅠ), it is
+    shorter than `min_chars`, or made of filler phrases only. With
+    `use_morphology`, other turns are also content-free when konlpy's Okt finds no noun, verb,
+    adjective or number besides filler stems. A batch is skipped only when all its user turns are.
+
+    In "shadow" mode every batch is still extracted, and the decision is compared with the
+    extracted facts to measure the precision of the gate before it is enforced. The gate counts
+    its decisions itself, so `stats` works with MEM0_TELEMETRY off; the counters are also sent
+    to the telemetry sink, and shadow decisions are exported to MEM0_METRICS_PATH when it is set.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        mode: str = "enforce",
+        min_chars: int = 2,
+        use_morphology: bool = False,
+        filler_phrases: Optional[List[str]] = None,
+    ):
+        self.enabled = enabled
+        self.mode = mode
+        self.min_chars = min_chars
+        self.filler_phrases = FILLER_PHRASES | {
+            _normalize(phrase) for phrase in filler_phrases or []
+        }
+        self._tagger = self._load_tagger() if use_morphology else None
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+        metrics.increment(f"fact_prefilter.{name}")
+
+    def stats(self) -> Dict:
+        """
+        Get the skip rate of the gate and, from shadow mode, its precision.
+
+        Returns:
+            Dict: Checked and skipped batches, skip rate, and precision (skipped batches that indeed had no
+                facts) and recall (fact-free batches that were skipped), or None before any shadow decision.
+        """
+        with self._lock:
+            counts = dict(self._counts)
+        checked = counts.get("checked", 0)
+        skipped = counts.get("skipped", 0)
+        correct = counts.get("shadow.skip_correct", 0)
+        lost = counts.get("shadow.skip_lost_facts", 0)
+        missed = counts.get("shadow.pass_without_facts", 0)
+        return {
+            "checked": checked,
+            "skipped": skipped,
+            "skip_rate": skipped / checked if checked else 0.0,
+            "precision": correct / (correct + lost) if correct + lost else None,
+            "recall": correct / (correct + missed) if correct + missed else None,
+        }
+
+    @staticmethod
+    def _load_tagger():
+        try:
+            from konlpy.tag import Okt
+
+            tagger = Okt()
+            tagger.pos("안녕")  # starts the JVM now rather than on the first turn
+            return tagger
+        except Exception as e:
+            logger.warning(f"konlpy is unavailable, using rules only: {e}")
+            return None
+
+    def is_content_free(self, text: str) -> bool:
+        """Whether a single turn cannot contain a fact."""
+        normalized = _normalize(text)
+        compact = normalized.replace(" ", "")
+        if normalized in ANSWER_PHRASES or compact in ANSWER_PHRASES:
+            return False
+        if len(compact) < self.min_chars:
+            return True
+        if normalized in self.filler_phrases or compact in self.filler_phrases:
+            return True
+        if all(word in self.filler_phrases for word in normalized.split()):
+            return True
+        if self._tagger is None:
+            return False
+
+        return not any(
+            tag in CONTENT_TAGS and word not in FILLER_STEMS
+            for word, tag in self._tagger.pos(normalized, norm=True, stem=True)
+        )
+
+    @property
+    def enforced(self) -> bool:
+        """Whether content-free batches are actually skipped."""
+        return self.enabled and self.mode == "enforce"
+
+    def check(self, messages: List[Dict]) -> bool:
+        """
+        Decide whether the messages are content-free. Counts every decision.
+
+        Args:
+            messages (list): Message dicts of one `add` call.
+
+        Returns:
+            bool: True if no user turn can contain a fact. Always False when the gate is disabled.
+        """
+        if not self.enabled:
+            return False
+
+        user_turns = [
+            message["content"]
+            for message in messages
+            if message.get("role") == "user" and isinstance(message.get("content"), str)
+        ]
+        content_free = bool(user_turns) and all(
+            self.is_content_free(turn) for turn in user_turns
+        )
+        self._count("checked")
+        if content_free:
+            self._count("skipped")
+        return content_free
+
+    def record_extraction(self, content_free: bool, facts: List[str]):
+        """
+        In shadow mode, compare the decision of `check` with the facts the LLM extracted.
+
+        Args:
+            content_free (bool): Result of `check` for the messages.
+            facts (list): Facts extracted from them.
+        """
+        if not self.enabled or self.mode != "shadow":
+            return
+
+        if content_free:
+            outcome = "skip_correct" if not facts else "skip_lost_facts"
+        else:
+            outcome = "pass_with_facts" if facts else "pass_without_facts"
+        self._count(f"shadow.{outcome}")
+        metrics.emit(
+            {
+                "event": "fact_prefilter.shadow",
+                "content_free": content_free,
+                "num_facts": len(facts),
+            }
+        )
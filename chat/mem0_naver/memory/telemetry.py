@@ -1,16 +1,20 @@
+import atexit
+import bisect
+import inspect
+import json
 import logging
 import os
-import platform
-import sys
-
-from posthog import Posthog
-
-import mem0_naver
-from mem0_naver.memory.setup import get_or_create_user_id
+import queue
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Optional, Sequence
 
 MEM0_TELEMETRY = os.environ.get("MEM0_TELEMETRY", "True")
-PROJECT_API_KEY = "phc_hgJkUVJFYtmaJqrvf6CYN67TIQ8yhXAkWzUn9AMU4yX"
-HOST = "https://us.i.posthog.com"
+# Local JSONL file the metrics are exported to. Unset keeps them in memory only.
+MEM0_METRICS_PATH = os.environ.get("MEM0_METRICS_PATH") or None
 
 if isinstance(MEM0_TELEMETRY, str):
     MEM0_TELEMETRY = MEM0_TELEMETRY.lower() in ("true", "1", "yes")
@@ -18,79 +22,221 @@ if isinstance(MEM0_TELEMETRY, str):
 if not isinstance(MEM0_TELEMETRY, bool):
     raise ValueError("MEM0_TELEMETRY must be a boolean value.")
 
-logging.getLogger("posthog").setLevel(logging.CRITICAL + 1)
-logging.getLogger("urllib3").setLevel(logging.CRITICAL + 1)
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+logger = logging.getLogger(__name__)
 
 
-class AnonymousTelemetry:
-    def __init__(self, vector_store=None):
-        self.posthog = Posthog(project_api_key=PROJECT_API_KEY, host=HOST)
+class Histogram:
+    """Counts of observed values per bucket, with their total count and sum."""
 
-        self.user_id = get_or_create_user_id(vector_store)
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last bucket is unbounded
+        self.count = 0
+        self.sum = 0.0
 
-        if not MEM0_TELEMETRY:
-            self.posthog.disabled = True
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
 
-    def capture_event(self, event_name, properties=None, user_email=None):
-        if properties is None:
-            properties = {}
-        properties = {
-            "client_source": "python",
-            "client_version": mem0_naver.__version__,
-            "python_version": sys.version,
-            "os": sys.platform,
-            "os_version": platform.version(),
-            "os_release": platform.release(),
-            "processor": platform.processor(),
-            "machine": platform.machine(),
-            **properties,
+    def snapshot(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {
+                **{str(bound): n for bound, n in zip(self.buckets, self.counts)},
+                "+Inf": self.counts[-1],
+            },
         }
-        distinct_id = self.user_id if user_email is None else user_email
-        self.posthog.capture(
-            distinct_id=distinct_id, event=event_name, properties=properties
-        )
+
+
+class MetricsSink:
+    """
+    Process-wide counters and histograms, optionally exported to a local JSONL file.
+
+    Recording a metric only updates a dict under a lock. Exported records go through a bounded
+    queue to a background writer thread, and are dropped rather than blocking when it is full.
+    Nothing is sent over the network.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        export_path: Optional[str] = None,
+        max_queue: int = 10000,
+    ):
+        """
+        Args:
+            enabled (bool, optional): Record metrics. Defaults to True.
+            export_path (str, optional): JSONL file events and snapshots are appended to. Defaults to None.
+            max_queue (int, optional): Number of records waiting for the writer before new ones are dropped.
+                Defaults to 10000.
+        """
+        self.enabled = enabled
+        self.export_path = export_path
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._histograms: Dict[str, Histogram] = {}
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+
+        if enabled and export_path:
+            self._queue = queue.Queue(max_queue)
+            self._writer = threading.Thread(
+                target=self._export, name="mem0-metrics", daemon=True
+            )
+            self._writer.start()
+            atexit.register(self.close)
+
+    @property
+    def exporting(self) -> bool:
+        return self._queue is not None
+
+    def increment(self, name: str, value: int = 1):
+        """Add to a counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(
+        self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        """Record a value in a histogram. `buckets` applies when the histogram is created."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Record the seconds spent in the block in the histogram `name`."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start_time)
+
+    def emit(self, record: Dict):
+        """Queue a record for the JSONL exporter. Does nothing when exporting is off."""
+        if self._queue is None:
+            return
+        record.setdefault("ts", time.time())
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def snapshot(self) -> Dict:
+        """
+        Get the current metrics.
+
+        Returns:
+            Dict: Counters, histograms and the number of dropped export records.
+        """
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "histograms": {
+                    name: histogram.snapshot()
+                    for name, histogram in self._histograms.items()
+                },
+                "dropped": self.dropped,
+            }
+
+    def reset(self):
+        """Clear every counter and histogram."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.dropped = 0
+
+    def _export(self):
+        try:
+            os.makedirs(
+                os.path.dirname(os.path.abspath(self.export_path)), exist_ok=True
+            )
+            with open(self.export_path, "a", encoding="utf-8") as f:
+                while True:
+                    record = self._queue.get()
+                    if record is None:
+                        break
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                    if self._queue.empty():
+                        f.flush()
+        except Exception as e:
+            logger.warning(f"Metrics exporter stopped: {e}")
 
     def close(self):
-        self.posthog.shutdown()
+        """Export a final snapshot and stop the writer thread."""
+        if self._writer is None:
+            return
+        self.emit({"event": "metrics.snapshot", **self.snapshot()})
+        try:
+            self._queue.put(None, timeout=1.0)
+        except queue.Full:
+            pass
+        self._writer.join(timeout=5.0)
+        self._writer = None
+        self._queue = None
+
+
+metrics = MetricsSink(enabled=MEM0_TELEMETRY, export_path=MEM0_METRICS_PATH)
+
 
+def timed(name: str):
+    """Decorator recording the latency of a sync or async function in the histogram `{name}.seconds`."""
 
-client_telemetry = AnonymousTelemetry()
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with metrics.timer(f"{name}.seconds"):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with metrics.timer(f"{name}.seconds"):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
 
 
 def capture_event(event_name, memory_instance, additional_data=None):
-    oss_telemetry = AnonymousTelemetry(
-        vector_store=(
-            memory_instance._telemetry_vector_store
-            if hasattr(memory_instance, "_telemetry_vector_store")
-            else None
-        ),
-    )
-
-    event_data = {
-        "collection": memory_instance.collection_name,
-        "vector_size": memory_instance.embedding_model.config.embedding_dims,
-        "history_store": "sqlite",
-        "graph_store": (
-            f"{memory_instance.graph.__class__.__module__}.{memory_instance.graph.__class__.__name__}"
-            if memory_instance.config.graph_store.config
-            else None
-        ),
-        "vector_store": f"{memory_instance.vector_store.__class__.__module__}.{memory_instance.vector_store.__class__.__name__}",
-        "llm": f"{memory_instance.llm.__class__.__module__}.{memory_instance.llm.__class__.__name__}",
-        "embedding_model": f"{memory_instance.embedding_model.__class__.__module__}.{memory_instance.embedding_model.__class__.__name__}",
-        "function": f"{memory_instance.__class__.__module__}.{memory_instance.__class__.__name__}.{memory_instance.api_version}",
-    }
-    if additional_data:
-        event_data.update(additional_data)
-
-    oss_telemetry.capture_event(event_name, event_data)
+    if not metrics.enabled:
+        return
+    metrics.increment(event_name)
+    if metrics.exporting:
+        metrics.emit(
+            {
+                "event": event_name,
+                "collection": memory_instance.collection_name,
+                **(additional_data or {}),
+            }
+        )
 
 
 def capture_client_event(event_name, instance, additional_data=None):
-    event_data = {
-        "function": f"{instance.__class__.__module__}.{instance.__class__.__name__}",
-    }
-    if additional_data:
-        event_data.update(additional_data)
-
-    client_telemetry.capture_event(event_name, event_data, instance.user_email)
+    if not metrics.enabled:
+        return
+    metrics.increment(event_name)
+    if metrics.exporting:
+        metrics.emit(
+            {
+                "event": event_name,
+                "function": f"{instance.__class__.__module__}.{instance.__class__.__name__}",
+                **(additional_data or {}),
+            }
+        )
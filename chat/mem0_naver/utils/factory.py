@@ -53,6 +53,7 @@ class EmbedderFactory:
 class VectorStoreFactory:
     provider_to_class = {
         "faiss": "mem0_naver.vector_stores.faiss.FAISS",
+        "sharded_faiss": "mem0_naver.vector_stores.sharded_faiss.ShardedFAISS",
         "langchain": "mem0_naver.vector_stores.langchain.Langchain",
     }
 
@@ -17,6 +17,27 @@ class VectorStoreBase(ABC):
         """Search for similar vectors."""
         pass
 
+    def search_batch(self, vectors, limit=5, filters=None):
+        """Search for similar vectors for several queries."""
+        return [
+            self.search(query=None, vectors=vector, limit=limit, filters=filters)
+            for vector in vectors
+        ]
+
+    def range_search(self, query, vectors, threshold, limit=None, filters=None):
+        """
+        Search for every memory within `threshold` of the query, up to `limit` of them.
+
+        The threshold is a minimum similarity, or a maximum distance for stores whose
+        `distance_strategy` is 'euclidean', as in the FAISS store.
+        """
+        results = self.search(
+            query=query, vectors=vectors, limit=limit or 100, filters=filters
+        )
+        if getattr(self, "distance_strategy", "").lower() == "euclidean":
+            return [result for result in results if result.score <= threshold]
+        return [result for result in results if result.score >= threshold]
+
     @abstractmethod
     def delete(self, vector_id):
         """Delete a vector by ID."""
@@ -52,6 +73,20 @@ class VectorStoreBase(ABC):
         """List all memories."""
         pass
 
+    def close(self):
+        """Flush pending writes and release resources."""
+        pass
+
+    def list_page(self, filters=None, limit=100, cursor=None):
+        """List one page of memories, returned with the cursor of the next page."""
+        if cursor is not None:
+            return [], None
+        return self.list(filters=filters, limit=limit)[0], None
+
+    def find_by_hash(self, hashes, filters=None):
+        """Map the content hashes that already have a memory matching the filters to its ID."""
+        return {}
+
     @abstractmethod
     def reset(self):
         """Reset by delete the collection and recreate it."""
@@ -14,6 +14,7 @@ class VectorStoreConfig(BaseModel):
 
     _provider_configs: Dict[str, str] = {
         "faiss": "FAISSConfig",
+        "sharded_faiss": "ShardedFAISSConfig",
         "langchain": "LangchainConfig",
     }
 
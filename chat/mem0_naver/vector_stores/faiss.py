@@ -1,9 +1,13 @@
 import logging
 import os
 import pickle
+import re
+import threading
+import time
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 from pydantic import BaseModel
@@ -21,9 +25,361 @@ except ImportError:
     )
 
 from mem0_naver.vector_stores.base import VectorStoreBase
+from mem0_naver.vector_stores.payload_store import (
+    INDEXED_PAYLOAD_KEYS,
+    PayloadStore,
+    chunked,
+)
 
 logger = logging.getLogger(__name__)
 
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+DURABILITY_MODES = ("every_op", "group_commit", "on_shutdown")
+VECTOR_ENCODINGS = ("float32", "fp16", "sq8", "pq")
+
+_SQ_TYPES = {
+    "fp16": faiss.ScalarQuantizer.QT_fp16,
+    "sq8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+
+def _fsync(path: str):
+    """Flush a file, or the entries of a directory, to disk."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def create_index(
+    index_type: str,
+    dims: int,
+    metric: int,
+    num_vectors: int = 0,
+    nlist: Optional[int] = None,
+    pq_m: int = 64,
+    hnsw_m: int = 32,
+    vector_encoding: str = "float32",
+):
+    """
+    Create an empty FAISS index of the given type.
+
+    Args:
+        index_type (str): One of 'flat', 'ivf_flat', 'ivf_pq', 'hnsw'.
+        dims (int): Dimension of the vectors.
+        metric (int): `faiss.METRIC_INNER_PRODUCT` or `faiss.METRIC_L2`.
+        num_vectors (int, optional): Number of vectors the index is trained on. Used to pick `nlist`.
+        nlist (int, optional): Number of IVF cells. Defaults to 4 * sqrt(num_vectors).
+        pq_m (int, optional): Number of PQ sub-quantizers for 'ivf_pq' and 'pq'. Defaults to 64.
+        hnsw_m (int, optional): Number of HNSW neighbours per node. Defaults to 32.
+        vector_encoding (str, optional): How vectors are stored. One of 'float32', 'fp16', 'sq8', 'pq'.
+            'ivf_pq' always stores PQ codes. Defaults to "float32".
+
+    Returns:
+        faiss.Index: Empty (possibly untrained) FAISS index.
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(
+            f"Invalid index_type {index_type}. Must be one of: {', '.join(INDEX_TYPES)}"
+        )
+    if vector_encoding not in VECTOR_ENCODINGS:
+        raise ValueError(
+            f"Invalid vector_encoding {vector_encoding}. "
+            f"Must be one of: {', '.join(VECTOR_ENCODINGS)}"
+        )
+
+    if index_type == "flat":
+        if vector_encoding in _SQ_TYPES:
+            return faiss.IndexScalarQuantizer(dims, _SQ_TYPES[vector_encoding], metric)
+        if vector_encoding == "pq":
+            return faiss.IndexPQ(dims, pq_m, 8, metric)
+        return faiss.IndexFlat(dims, metric)
+
+    if index_type == "hnsw":
+        if vector_encoding in _SQ_TYPES:
+            return faiss.IndexHNSWSQ(dims, _SQ_TYPES[vector_encoding], hnsw_m, metric)
+        if vector_encoding == "pq":
+            return faiss.IndexHNSWPQ(dims, pq_m, hnsw_m, 8, metric)
+        return faiss.IndexHNSWFlat(dims, hnsw_m, metric)
+
+    if nlist is None:
+        # FAISS wants at least 39 training points per cell
+        nlist = max(1, min(int(4 * np.sqrt(num_vectors)), num_vectors // 39))
+    quantizer = faiss.IndexFlat(dims, metric)
+    if index_type == "ivf_pq" or vector_encoding == "pq":
+        return faiss.IndexIVFPQ(quantizer, dims, nlist, pq_m, 8, metric)
+    if vector_encoding in _SQ_TYPES:
+        return faiss.IndexIVFScalarQuantizer(
+            quantizer, dims, nlist, _SQ_TYPES[vector_encoding], metric
+        )
+    return faiss.IndexIVFFlat(quantizer, dims, nlist, metric)
+
+
+def get_index_type(index) -> str:
+    """
+    Get the type name of a FAISS index, looking through ID maps.
+
+    Args:
+        index (faiss.Index): FAISS index.
+
+    Returns:
+        str: One of 'flat', 'ivf_flat', 'ivf_pq', 'hnsw'.
+    """
+    if isinstance(index, faiss.IndexIDMap):
+        index = faiss.downcast_index(index.index)
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "ivf_pq"
+    if isinstance(index, faiss.IndexIVF):
+        return "ivf_flat"
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    return "flat"
+
+
+def get_vector_encoding(index) -> str:
+    """
+    Get how a FAISS index stores its vectors, looking through ID maps and HNSW storage.
+
+    Args:
+        index (faiss.Index): FAISS index.
+
+    Returns:
+        str: One of 'float32', 'fp16', 'sq8', 'pq'.
+    """
+    if isinstance(index, faiss.IndexIDMap):
+        index = faiss.downcast_index(index.index)
+    if isinstance(index, faiss.IndexHNSW):
+        index = faiss.downcast_index(index.storage)
+    if isinstance(index, (faiss.IndexPQ, faiss.IndexIVFPQ)):
+        return "pq"
+    if isinstance(index, (faiss.IndexScalarQuantizer, faiss.IndexIVFScalarQuantizer)):
+        for encoding, qtype in _SQ_TYPES.items():
+            if index.sq.qtype == qtype:
+                return encoding
+    return "float32"
+
+
+def exact_top_k(query_vectors: np.ndarray, vectors: np.ndarray, k: int, metric: int):
+    """
+    Score query vectors against candidate vectors exactly and keep the best k per query.
+
+    Args:
+        query_vectors (np.ndarray): Queries with shape (num_queries, dims).
+        vectors (np.ndarray): Candidates with shape (num_candidates, dims).
+        k (int): Number of results per query.
+        metric (int): `faiss.METRIC_INNER_PRODUCT` or `faiss.METRIC_L2`.
+
+    Returns:
+        tuple: (scores, positions), both with shape (num_queries, k), best first. Positions index `vectors`.
+    """
+    if metric == faiss.METRIC_INNER_PRODUCT:
+        scores = query_vectors @ vectors.T
+        positions = np.argsort(-scores, axis=1)[:, :k]
+    else:
+        scores = (
+            (query_vectors**2).sum(axis=1, keepdims=True)
+            - 2 * query_vectors @ vectors.T
+            + (vectors**2).sum(axis=1)
+        )
+        positions = np.argsort(scores, axis=1)[:, :k]
+    return np.take_along_axis(scores, positions, axis=1), positions
+
+
+def set_search_params(index, nprobe: int = 16, ef_search: int = 64):
+    """
+    Set the query-time accuracy/speed knobs of an IVF or HNSW index.
+
+    Args:
+        index (faiss.Index): FAISS index, optionally wrapped in an ID map.
+        nprobe (int, optional): Number of IVF cells visited per query. Defaults to 16.
+        ef_search (int, optional): HNSW search queue size. Defaults to 64.
+    """
+    if isinstance(index, faiss.IndexIDMap):
+        index = faiss.downcast_index(index.index)
+    if isinstance(index, faiss.IndexIVF):
+        index.nprobe = nprobe
+    elif isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = ef_search
+
+
+def mmap_flag(index_type: str) -> int:
+    """
+    Get the `faiss.read_index` flag that memory-maps the vectors of an index type.
+
+    IVF indexes map their inverted lists; flat and HNSW indexes map their flat codes.
+
+    Args:
+        index_type (str): One of 'flat', 'ivf_flat', 'ivf_pq', 'hnsw'.
+
+    Returns:
+        int: `faiss.IO_FLAG_MMAP` or `faiss.IO_FLAG_MMAP_IFC`.
+    """
+    if index_type in ("ivf_flat", "ivf_pq"):
+        return faiss.IO_FLAG_MMAP
+    return faiss.IO_FLAG_MMAP_IFC
+
+
+def is_memory_mapped(index) -> bool:
+    """
+    Check whether any vectors of an index are memory-mapped, and therefore read-only.
+
+    Args:
+        index (faiss.Index): FAISS index, optionally wrapped in an ID map.
+
+    Returns:
+        bool: True if the inverted lists or the flat codes of the index live in a mapped file.
+    """
+    if isinstance(index, faiss.IndexIDMap):
+        index = faiss.downcast_index(index.index)
+    if isinstance(index, faiss.IndexIVF):
+        if isinstance(
+            faiss.downcast_InvertedLists(index.invlists), faiss.OnDiskInvertedLists
+        ):
+            return True
+        index = faiss.downcast_index(index.quantizer)
+    if isinstance(index, faiss.IndexHNSW):
+        index = faiss.downcast_index(index.storage)
+    return isinstance(index, faiss.IndexFlatCodes) and not index.codes.is_owned
+
+
+def load_into_memory(index):
+    """
+    Copy the memory-mapped parts of an index into RAM, so the index can be modified.
+
+    Args:
+        index (faiss.Index): Index read with `mmap_flag`.
+
+    Returns:
+        faiss.Index: The index, or a copy of it, holding all of its vectors in RAM.
+    """
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        invlists = faiss.downcast_InvertedLists(ivf.invlists)
+        if isinstance(invlists, faiss.OnDiskInvertedLists):
+            copied = faiss.ArrayInvertedLists(invlists.nlist, invlists.code_size)
+            for list_no in range(invlists.nlist):
+                size = invlists.list_size(list_no)
+                if size:
+                    copied.add_entries(
+                        list_no,
+                        size,
+                        invlists.get_ids(list_no),
+                        invlists.get_codes(list_no),
+                    )
+            ivf.replace_invlists(copied, True)
+            copied.this.disown()
+    if is_memory_mapped(index):
+        index = faiss.deserialize_index(faiss.serialize_index(index))
+    return index
+
+
+def recall_at_k(
+    index,
+    vectors: np.ndarray,
+    ids: Optional[np.ndarray] = None,
+    k: int = 10,
+    num_queries: int = 100,
+) -> float:
+    """
+    Measure the recall@k of an approximate index against exact search over the same vectors.
+
+    Args:
+        index (faiss.Index): Index holding `vectors`.
+        vectors (np.ndarray): Vectors added to the index. A sample of them is used as queries.
+        ids (np.ndarray, optional): Labels of `vectors` in the index. Defaults to their positions.
+        k (int, optional): Number of neighbours compared. Defaults to 10.
+        num_queries (int, optional): Maximum number of sampled queries. Defaults to 100.
+
+    Returns:
+        float: Average fraction of the exact top-k found by the index.
+    """
+    if len(vectors) == 0:
+        return 1.0
+    if ids is None:
+        ids = np.arange(len(vectors), dtype=np.int64)
+
+    k = min(k, len(vectors))
+    rng = np.random.default_rng(0)
+    queries = vectors[
+        rng.choice(len(vectors), min(num_queries, len(vectors)), replace=False)
+    ]
+
+    exact = faiss.IndexFlat(vectors.shape[1], index.metric_type)
+    exact.add(vectors)
+    _, exact_positions = exact.search(queries, k)
+    _, approx_ids = index.search(queries, k)
+
+    hits = [
+        len(set(ids[expected].tolist()) & set(found.tolist()))
+        for expected, found in zip(exact_positions, approx_ids)
+    ]
+    return sum(hits) / (len(hits) * k)
+
+
+class ReadWriteLock:
+    """
+    Lock that admits any number of readers at once, or a single writer.
+
+    Writers are preferred: once a writer is waiting, new readers queue behind it. The writing
+    thread may re-enter the write lock and take the read lock; a reading thread may re-enter
+    the read lock but must not ask for the write lock.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._waiting_writers = 0
+        self._writer = None
+        self._local = threading.local()
+
+    @contextmanager
+    def read(self):
+        depth = getattr(self._local, "read_depth", 0)
+        if depth or self._writer == threading.get_ident():
+            self._local.read_depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.read_depth = depth
+            return
+
+        with self._cond:
+            while self._writer is not None or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        self._local.read_depth = 1
+        try:
+            yield
+        finally:
+            self._local.read_depth = 0
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            yield
+            return
+        if getattr(self._local, "read_depth", 0):
+            raise RuntimeError("Cannot upgrade a read lock to a write lock")
+
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer is not None or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = me
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = None
+                self._cond.notify_all()
+
 
 class OutputData(BaseModel):
     id: Optional[str]  # memory id
@@ -39,6 +395,24 @@ class FAISS(VectorStoreBase):
         distance_strategy: str = "euclidean",
         normalize_L2: bool = False,
         embedding_model_dims: int = 1024,
+        wal_compaction_threshold: int = 1000,
+        tombstone_compaction_ratio: float = 0.2,
+        exact_filter_threshold: int = 10000,
+        index_type: str = "flat",
+        nlist: Optional[int] = None,
+        pq_m: int = 64,
+        hnsw_m: int = 32,
+        nprobe: int = 16,
+        ef_search: int = 64,
+        ann_migration_threshold: int = 50000,
+        vector_encoding: str = "float32",
+        rerank_factor: int = 0,
+        mmap: bool = False,
+        durability: str = "group_commit",
+        flush_interval: float = 1.0,
+        flush_max_records: int = 100,
+        snapshot_generations: int = 3,
+        reload_interval: float = 0.0,
     ):
         """
         Initialize the FAISS vector store.
@@ -50,66 +424,941 @@ class FAISS(VectorStoreBase):
                 Defaults to "euclidean".
             normalize_L2 (bool, optional): Whether to normalize L2 vectors. Only applicable for euclidean distance.
                 Defaults to False.
+            embedding_model_dims (int, optional): Dimension of the embedding vector. Defaults to 1024.
+            wal_compaction_threshold (int, optional): Minimum number of write-ahead log records before the log
+                is compacted into a fresh snapshot. Compaction also waits until the log holds more records
+                than the index holds vectors, so the amortized write cost per mutation stays constant.
+                Defaults to 1000.
+            tombstone_compaction_ratio (float, optional): Fraction of deleted vectors still held by the index
+                at which they are physically removed. Defaults to 0.2.
+            exact_filter_threshold (int, optional): Maximum number of memories matching a search filter that are
+                scored exactly from their stored vectors. Larger matches are searched through the index with an
+                ID selector. Defaults to 10000.
+            index_type (str, optional): Index to use once the collection is large enough. Options: 'flat', 'ivf_flat',
+                'ivf_pq', 'hnsw'. Collections always start flat and are rebuilt in the background once they hold
+                `ann_migration_threshold` memories. Defaults to "flat".
+            nlist (int, optional): Number of IVF cells. Defaults to 4 * sqrt(number of memories).
+            pq_m (int, optional): Number of PQ sub-quantizers for 'ivf_pq'. Must divide the dimension. Defaults to 64.
+            hnsw_m (int, optional): Number of HNSW neighbours per node. Defaults to 32.
+            nprobe (int, optional): Number of IVF cells visited per query. Defaults to 16.
+            ef_search (int, optional): HNSW search queue size. Defaults to 64.
+            ann_migration_threshold (int, optional): Number of memories at which a flat collection is rebuilt into
+                `index_type`. Defaults to 50000.
+            vector_encoding (str, optional): How the index stores vectors. Options: 'float32', 'fp16', 'sq8', 'pq'.
+                'float32' and 'fp16' apply from the start; 'sq8' and 'pq' need training data, so the collection
+                stays float32 until it is rebuilt at `ann_migration_threshold`. Defaults to "float32".
+            rerank_factor (int, optional): When the index stores compressed vectors, fetch `limit * rerank_factor`
+                candidates and re-rank them exactly against full-precision vectors kept in an on-disk `.vec`
+                file. 0 disables re-ranking. Defaults to 0.
+            mmap (bool, optional): Memory-map the index file on load instead of reading it into RAM, so startup
+                time does not depend on the collection size and processes on one host share the page cache.
+                Mapped vectors are read-only, so the whole index is copied into RAM before its first modification.
+                Defaults to False.
+            durability (str, optional): When write-ahead log records reach the disk. Options: 'every_op' (fsync
+                after each mutation), 'group_commit' (fsync once `flush_interval` seconds after the first
+                unflushed record, or after `flush_max_records` records), 'on_shutdown' (only on `flush()` or
+                `close()`). Defaults to "group_commit".
+            flush_interval (float, optional): Seconds a record may wait in 'group_commit' mode. Defaults to 1.0.
+            flush_max_records (int, optional): Records that force a flush in 'group_commit' mode. Defaults to 100.
+            snapshot_generations (int, optional): Number of snapshot generations, and the write-ahead logs that
+                follow them, kept on disk. A generation that fails to load falls back to the one before it.
+                Defaults to 3.
+            reload_interval (float, optional): Seconds between checks for a newer snapshot generation written by
+                another process, made before a search. Only for processes that read the collection without
+                writing to it. 0 disables the check. Defaults to 0.0.
         """
         self.collection_name = collection_name
         self.path = path or f"/tmp/faiss/{collection_name}"
         self.distance_strategy = distance_strategy
         self.normalize_L2 = normalize_L2
         self.embedding_model_dims = embedding_model_dims
+        self.wal_compaction_threshold = wal_compaction_threshold
+        self.tombstone_compaction_ratio = tombstone_compaction_ratio
+        self.exact_filter_threshold = exact_filter_threshold
+        self.index_type = index_type
+        self.nlist = nlist
+        self.pq_m = pq_m
+        self.hnsw_m = hnsw_m
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.ann_migration_threshold = ann_migration_threshold
+        self.vector_encoding = vector_encoding
+        self.rerank_factor = rerank_factor
+        self.mmap = mmap
+        if durability not in DURABILITY_MODES:
+            raise ValueError(
+                f"Invalid durability {durability}. Must be one of: {', '.join(DURABILITY_MODES)}"
+            )
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self.flush_max_records = flush_max_records
+        self.snapshot_generations = max(1, snapshot_generations)
+        self.reload_interval = reload_interval
+        self._last_reload_check = time.monotonic()
+        self.last_rebuild_report = None
+        self._rebuilding = False
+        # Rows whose vectors were replaced in place while a rebuild is building its index
+        self._dirty_rows: Optional[set] = None
+        # One rebuild at a time, so a manual rebuild waits for a background one
+        self._rebuild_lock = threading.Lock()
 
         # Initialize storage structures
         self.index = None
-        self.docstore = {}
-        self.index_to_id = {}
+        self.payloads = None
+        self._reset_state()
+
+        # Searches share the read lock; mutations, snapshots and index swaps take the write lock
+        self._lock = ReadWriteLock()
+
+        # Write-ahead log state
+        self._wal_file = None
+        self._wal_records = 0
+        self._unflushed_records = 0
+        self._flush_timer = None
+        self._compacting = False
+
+        # Full-precision vectors kept for re-ranking
+        self._vector_fd = None
 
         # Create directory if it doesn't exist
         if self.path:
             os.makedirs(os.path.dirname(self.path), exist_ok=True)
 
             # Try to load existing index if available
-            index_path = f"{self.path}/{collection_name}.faiss"
-            docstore_path = f"{self.path}/{collection_name}.pkl"
-            if os.path.exists(index_path) and os.path.exists(docstore_path):
-                self._load(index_path, docstore_path)
+            if self._snapshot_generations():
+                self._open_payloads()
+                self._load()
+                self._maybe_rebuild_index()
             else:
                 self.create_col(collection_name)
 
-    def _load(self, index_path: str, docstore_path: str):
+    def _reset_state(self):
+        """Clear the in-memory row bookkeeping."""
+        self.tombstones = set()  # rows without a payload but still in the index
+        self.next_row = 0
+        self._wal_seq = 0
+        self._generation = 0  # snapshot generation the write-ahead log continues from
+
+    def _get_payload_path(self) -> str:
+        return f"{self.path}/{self.collection_name}.db"
+
+    def _open_payloads(self):
+        if self.payloads is None:
+            os.makedirs(self.path, exist_ok=True)
+            self.payloads = PayloadStore(
+                self._get_payload_path(),
+                synchronous="FULL" if self.durability == "every_op" else "NORMAL",
+            )
+
+    def _snapshot_path(self, extension: str, generation: int) -> str:
+        """Path of a snapshot or write-ahead log file. Generation 0 uses the names from before generations."""
+        if generation == 0:
+            return f"{self.path}/{self.collection_name}.{extension}"
+        return f"{self.path}/{self.collection_name}.{generation}.{extension}"
+
+    def _snapshot_files(self) -> Dict[int, set]:
+        """Map each snapshot generation on disk to the extensions of its files."""
+        generations = {}
+        if self.path and os.path.isdir(self.path):
+            pattern = re.compile(
+                rf"{re.escape(self.collection_name)}(?:\.(\d+))?\.(faiss|pkl|wal)"
+            )
+            for name in os.listdir(self.path):
+                match = pattern.fullmatch(name)
+                if match:
+                    generation = int(match.group(1) or 0)
+                    generations.setdefault(generation, set()).add(match.group(2))
+        return generations
+
+    def _snapshot_generations(self) -> List[int]:
         """
-        Load FAISS index and docstore from disk.
+        List the complete snapshot generations on disk, newest first.
 
-        Args:
-            index_path (str): Path to FAISS index file.
-            docstore_path (str): Path to docstore pickle file.
+        The state file of a snapshot is renamed into place after its index file, so a generation
+        holding both files was written completely.
         """
-        try:
-            self.index = faiss.read_index(index_path)
-            with open(docstore_path, "rb") as f:
-                self.docstore, self.index_to_id = pickle.load(f)
+        return sorted(
+            (
+                generation
+                for generation, extensions in self._snapshot_files().items()
+                if {"faiss", "pkl"} <= extensions
+            ),
+            reverse=True,
+        )
+
+    def _read_snapshot(self, generation: int):
+        """Read the FAISS index and the pickled state of a snapshot generation."""
+        with open(self._snapshot_path("pkl", generation), "rb") as f:
+            state = pickle.load(f)
+        index_path = self._snapshot_path("faiss", generation)
+        if self.mmap:
+            # States written before the index type was recorded are flat, or read fully by the flat flag
+            index_type = (
+                state.get("index_type", "flat") if isinstance(state, dict) else "flat"
+            )
+            index = faiss.read_index(index_path, mmap_flag(index_type))
+        else:
+            index = faiss.read_index(index_path)
+        return index, state
+
+    def _make_writable(self):
+        """Copy a memory-mapped index into RAM before its first modification. Mapped vectors are read-only."""
+        if self.mmap and is_memory_mapped(self.index):
+            self.index = load_into_memory(self.index)
+            set_search_params(self.index, self.nprobe, self.ef_search)
             logger.info(
-                f"Loaded FAISS index from {index_path} with {self.index.ntotal} vectors"
+                f"Copied memory-mapped FAISS index of {self.collection_name} into memory"
             )
-        except Exception as e:
-            logger.warning(f"Failed to load FAISS index: {e}")
 
-            self.docstore = {}
-            self.index_to_id = {}
+    def _load(self):
+        """
+        Load the newest snapshot generation and its row bookkeeping, then replay the write-ahead log.
+
+        A generation that cannot be read falls back to the one before it. The write-ahead logs of every
+        later generation are then replayed on top, and the result is saved as a new generation.
+
+        Payloads live in the SQLite payload store, which is committed on every write, possibly before
+        the log record of the write was fsynced. Writes that reached the payload store but not the log
+        are then rolled forward from the vectors the payload store keeps for them.
+        """
+        generations = self._snapshot_generations()
+        imported = False
+        for generation in generations:
+            try:
+                self.index, state = self._read_snapshot(generation)
+                self._generation = generation
+                if isinstance(state, dict):
+                    self.tombstones = state.get("tombstones", set())
+                    self.next_row = state.get("next_row", self.index.ntotal)
+                    self._wal_seq = state.get("wal_seq", 0)
+                    if "docstore" in state:
+                        # Snapshots written before payloads moved to SQLite
+                        self._import_docstore(state["docstore"], state["index_to_id"])
+                        imported = True
+                else:
+                    # Snapshots written before the write-ahead log was introduced
+                    self._import_docstore(*state)
+                    self._wal_seq = 0
+                    imported = True
+
+                if not isinstance(self.index, faiss.IndexIDMap2):
+                    self._migrate_to_id_map()
+                set_search_params(self.index, self.nprobe, self.ef_search)
+                self._backfill_vector_file()
+                logger.info(
+                    f"Loaded FAISS index of {self.collection_name} at generation {generation} "
+                    f"with {self.index.ntotal} vectors"
+                )
+                break
+            except Exception as e:
+                logger.warning(
+                    f"Failed to load generation {generation} of FAISS index {self.collection_name}: {e}"
+                )
+                self.index = None
+                self._reset_state()
+
+        if self.index is None:
+            logger.error(
+                f"No snapshot of FAISS index {self.collection_name} could be loaded"
+            )
+            return
+
+        self._replay_wal()
+        recovered = self._roll_forward()
+        if imported or recovered or self._generation != generations[0]:
+            # Supersede an imported docstore or unreadable generations, so later loads start from
+            # a snapshot without a docstore and the log continues in a new file
+            self._save()
+            self._reset_wal()
+
+    def _roll_forward(self) -> bool:
+        """
+        Bring the index in line with payload store writes whose log records were lost in a crash.
+
+        Inserted and updated vectors are written from the payload store, and vectors of memories deleted
+        from it become tombstones. Payloads past the index without a stored vector cannot be recovered
+        and are dropped.
+
+        Returns:
+            bool: Whether the index changed.
+        """
+        dropped = self.payloads.delete_from_row(self.next_row)
+        if dropped:
+            logger.warning(
+                f"Dropped {dropped} payloads without vectors from {self.collection_name}"
+            )
+
+        pending = self.payloads.pending(self._wal_seq)
+        if pending:
+            self._make_writable()
+            rows = np.array([row for row, _, _ in pending], dtype=np.int64)
+            vectors = np.stack([vector for _, _, vector in pending])
+            added = rows >= self.next_row
+            if added.any():
+                self.index.add_with_ids(vectors[added], rows[added])
+                for row, vector in zip(rows[added].tolist(), vectors[added]):
+                    self._write_vectors(row, vector)
+                self.next_row = int(rows[added].max()) + 1
+            if (~added).any():
+                self._reapply_vectors(rows[~added], vectors[~added])
+
+        indexed = faiss.vector_to_array(self.index.id_map)
+        tombstones = set(indexed.tolist()) - set(self.payloads.rows().tolist())
+        deleted = len(tombstones - self.tombstones)
+        self.tombstones = tombstones
+        if pending or deleted:
+            logger.warning(
+                f"Recovered {len(pending)} vector writes and {deleted} deletes of "
+                f"{self.collection_name} from the payload store"
+            )
+        return bool(pending or deleted)
+
+    def _import_docstore(self, docstore: Dict, index_to_id: Dict):
+        """Copy the payloads of a pickled docstore into the payload store."""
+        rows = [row for row, vector_id in index_to_id.items() if vector_id in docstore]
+        ids = [index_to_id[row] for row in rows]
+        self.payloads.put_many(rows, ids, [docstore[vector_id] for vector_id in ids])
+        logger.info(
+            f"Moved {len(ids)} payloads of {self.collection_name} to {self._get_payload_path()}"
+        )
+
+    def _next_generation(self) -> int:
+        return max([self._generation, *self._snapshot_files()]) + 1
 
-    def _save(self):
-        """Save FAISS index and docstore to disk."""
+    def _save(self, generation: Optional[int] = None):
+        """
+        Save the FAISS index and its row bookkeeping to disk as a new snapshot generation.
+
+        Each file is written to a temporary path, fsynced and renamed into place, the index before the
+        state, so a crash at any point leaves the previous generations intact. Generations beyond
+        `snapshot_generations` are removed afterwards.
+        """
         if not self.path or not self.index:
             return
 
+        if generation is None:
+            generation = self._next_generation()
+        self._own_inverted_lists()
+        if not self._write_snapshot(generation, self.index, self._snapshot_state()):
+            return
+
+        self._generation = generation
+        # The snapshot holds every write up to its sequence number
+        self.payloads.clear_vectors(self._wal_seq)
+        self._prune_generations()
+
+    def _own_inverted_lists(self):
+        """Copy mapped IVF lists into RAM. A snapshot would only refer to the mapped file."""
+        ivf = faiss.try_extract_index_ivf(self.index)
+        if ivf is not None and isinstance(
+            faiss.downcast_InvertedLists(ivf.invlists), faiss.OnDiskInvertedLists
+        ):
+            self._make_writable()
+
+    def _snapshot_state(self) -> Dict:
+        return {
+            "tombstones": set(self.tombstones),
+            "next_row": self.next_row,
+            "wal_seq": self._wal_seq,
+            "index_type": get_index_type(self.index),
+        }
+
+    def _write_snapshot(self, generation: int, index, state: Dict) -> bool:
+        """
+        Write the files of a snapshot generation.
+
+        Args:
+            generation (int): Generation to write.
+            index (faiss.Index | np.ndarray): Index, or its copy from `faiss.serialize_index`.
+            state (Dict): Row bookkeeping from `_snapshot_state`.
+
+        Returns:
+            bool: Whether the generation was written completely.
+        """
         try:
             os.makedirs(self.path, exist_ok=True)
-            index_path = f"{self.path}/{self.collection_name}.faiss"
-            docstore_path = f"{self.path}/{self.collection_name}.pkl"
+            index_path = self._snapshot_path("faiss", generation)
+            state_path = self._snapshot_path("pkl", generation)
 
-            faiss.write_index(self.index, index_path)
-            with open(docstore_path, "wb") as f:
-                pickle.dump((self.docstore, self.index_to_id), f)
+            # Older generations are never overwritten, so memory-mapped copies of them stay valid
+            if isinstance(index, np.ndarray):
+                with open(f"{index_path}.tmp", "wb") as f:
+                    f.write(index.tobytes())
+            else:
+                faiss.write_index(index, f"{index_path}.tmp")
+            _fsync(f"{index_path}.tmp")
+            os.replace(f"{index_path}.tmp", index_path)
+            with open(f"{state_path}.tmp", "wb") as f:
+                pickle.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(f"{state_path}.tmp", state_path)
+            _fsync(self.path)
         except Exception as e:
             logger.warning(f"Failed to save FAISS index: {e}")
+            return False
+        return True
+
+    def _prune_generations(self):
+        """Remove the snapshot generations, and their write-ahead logs, beyond the kept ones."""
+        generations = sorted(self._snapshot_files(), reverse=True)
+        for generation in generations[self.snapshot_generations :]:
+            for extension in ("faiss", "pkl", "wal"):
+                file_path = self._snapshot_path(extension, generation)
+                try:
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                except OSError as e:
+                    logger.warning(f"Failed to remove {file_path}: {e}")
+
+    def refresh(self) -> bool:
+        """
+        Load a snapshot generation newer than the loaded one, written by another process.
+
+        Meant for processes that read a collection another process writes to. The write-ahead log is not
+        replayed and the shared payload store is left untouched, so writes appear here once a later
+        generation includes them.
+
+        Returns:
+            bool: Whether a newer generation was loaded.
+        """
+        for generation in self._snapshot_generations():
+            if generation <= self._generation:
+                break
+            try:
+                index, state = self._read_snapshot(generation)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to reload generation {generation} of FAISS index {self.collection_name}: {e}"
+                )
+                continue
+
+            set_search_params(index, self.nprobe, self.ef_search)
+            with self._lock.write():
+                self.index = index
+                self.tombstones = state["tombstones"]
+                self.next_row = state["next_row"]
+                self._wal_seq = state["wal_seq"]
+                self._generation = generation
+            logger.info(
+                f"Reloaded FAISS index of {self.collection_name} at generation {generation}"
+            )
+            return True
+        return False
+
+    def _maybe_refresh(self):
+        now = time.monotonic()
+        if (
+            not self.reload_interval
+            or now - self._last_reload_check < self.reload_interval
+        ):
+            return
+        self._last_reload_check = now
+        self.refresh()
+
+    def _migrate_to_id_map(self):
+        """
+        Wrap a positional index from an older snapshot in an ID-mapped index.
+
+        Older snapshots numbered rows by insertion position and never removed deleted vectors,
+        so every position without a payload becomes a tombstone.
+        """
+        ntotal = self.index.ntotal
+        vectors = self.index.reconstruct_n(0, ntotal) if ntotal else None
+
+        self.index = faiss.IndexIDMap2(self._create_base_index())
+        if ntotal:
+            self.index.add_with_ids(vectors, np.arange(ntotal, dtype=np.int64))
+
+        self.tombstones = set(range(ntotal)) - set(self.payloads.rows().tolist())
+        self.next_row = ntotal
+        logger.info(
+            f"Migrated FAISS index of {self.collection_name} to an ID-mapped index "
+            f"({len(self.tombstones)} tombstones)"
+        )
+
+    def _get_vector_path(self) -> str:
+        return f"{self.path}/{self.collection_name}.vec"
+
+    def _uses_vector_file(self) -> bool:
+        """Whether full-precision vectors are kept on disk for re-ranking."""
+        return bool(
+            self.path and self.rerank_factor and self._target_encoding() != "float32"
+        )
+
+    def _should_rerank(self) -> bool:
+        return self._uses_vector_file() and get_vector_encoding(self.index) != "float32"
+
+    def _write_vectors(self, start_row: int, vectors: np.ndarray):
+        """Write full-precision vectors to the `.vec` file at the offset of their rows."""
+        if not self._uses_vector_file():
+            return
+        if self._vector_fd is None:
+            os.makedirs(self.path, exist_ok=True)
+            self._vector_fd = os.open(self._get_vector_path(), os.O_RDWR | os.O_CREAT)
+        os.pwrite(
+            self._vector_fd,
+            np.ascontiguousarray(vectors, dtype=np.float32).tobytes(),
+            start_row * self.embedding_model_dims * 4,
+        )
+
+    def _get_vectors(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Get the vectors of index rows, at full precision when the `.vec` file holds them.
+
+        Args:
+            rows (np.ndarray): Index rows.
+
+        Returns:
+            np.ndarray: Vectors with shape (len(rows), dims).
+        """
+        if self._uses_vector_file() and os.path.exists(self._get_vector_path()):
+            num_rows = os.path.getsize(self._get_vector_path()) // (
+                self.embedding_model_dims * 4
+            )
+            if len(rows) and num_rows > rows.max():
+                vectors = np.memmap(
+                    self._get_vector_path(),
+                    dtype=np.float32,
+                    mode="r",
+                    shape=(num_rows, self.embedding_model_dims),
+                )
+                return np.array(vectors[rows])
+        return self.index.reconstruct_batch(rows)
+
+    def _backfill_vector_file(self):
+        """Write the vectors of live rows missing from the `.vec` file, e.g. after enabling re-ranking."""
+        if not self._uses_vector_file():
+            return
+        vector_path = self._get_vector_path()
+        num_rows = (
+            os.path.getsize(vector_path) // (self.embedding_model_dims * 4)
+            if os.path.exists(vector_path)
+            else 0
+        )
+        rows = self.payloads.rows(num_rows)
+        if not len(rows):
+            return
+
+        if get_vector_encoding(self.index) != "float32":
+            logger.warning(
+                f"Re-ranking vectors of {self.collection_name} are rebuilt from a "
+                f"{get_vector_encoding(self.index)} index and will not be exact"
+            )
+        for row, vector in zip(rows, self.index.reconstruct_batch(rows)):
+            self._write_vectors(int(row), vector.reshape(1, -1))
+
+    def _reset_vector_file(self, remove: bool = False):
+        """Close and truncate (or remove) the `.vec` file."""
+        if self._vector_fd is not None:
+            os.close(self._vector_fd)
+            self._vector_fd = None
+
+        if self.path and os.path.exists(self._get_vector_path()):
+            if remove:
+                os.remove(self._get_vector_path())
+            else:
+                open(self._get_vector_path(), "wb").close()
+
+    def tombstone_ratio(self) -> float:
+        """
+        Get the fraction of vectors in the index that belong to deleted memories.
+
+        Returns:
+            float: Ratio of dead vectors to all vectors in the index.
+        """
+        if self.index is None or self.index.ntotal == 0:
+            return 0.0
+        return len(self.tombstones) / self.index.ntotal
+
+    def _maybe_purge_tombstones(self):
+        if (
+            self.tombstones
+            and self.tombstone_ratio() >= self.tombstone_compaction_ratio
+        ):
+            self.purge_tombstones()
+
+    def purge_tombstones(self):
+        """Physically remove the vectors of deleted memories from the index."""
+        with self._lock.write():
+            if not self.tombstones:
+                return
+
+            self._make_writable()
+            if get_index_type(self.index) == "flat":
+                rows = np.fromiter(self.tombstones, dtype=np.int64)
+                removed = self.index.remove_ids(faiss.IDSelectorBatch(rows))
+            else:
+                # IVF direct maps and HNSW graphs do not support removal, so re-add the
+                # live vectors to an empty copy that keeps the trained parameters
+                rows = self.payloads.rows()
+                index = faiss.clone_index(self.index)
+                index.reset()
+                if len(rows):
+                    index.add_with_ids(self._get_vectors(rows), rows)
+                removed = self.index.ntotal - index.ntotal
+                self.index = index
+            self.tombstones = set()
+            logger.info(
+                f"Removed {removed} deleted vectors from collection {self.collection_name}"
+            )
+
+    def _target_encoding(self) -> str:
+        return "pq" if self.index_type == "ivf_pq" else self.vector_encoding
+
+    def _maybe_rebuild_index(self):
+        with self._lock.write():
+            if (
+                self._rebuilding
+                or self.index is None
+                or self.index.ntotal - len(self.tombstones)
+                < self.ann_migration_threshold
+            ):
+                return
+            if (
+                get_index_type(self.index) == self.index_type
+                and get_vector_encoding(self.index) == self._target_encoding()
+            ):
+                return
+            self._rebuilding = True
+
+        threading.Thread(target=self._rebuild_in_background, daemon=True).start()
+
+    def _rebuild_in_background(self):
+        try:
+            self.rebuild_index()
+        except Exception as e:
+            logger.warning(f"Failed to rebuild FAISS index: {e}")
+        finally:
+            self._rebuilding = False
+
+    def rebuild_index(
+        self, index_type: Optional[str] = None, vector_encoding: Optional[str] = None
+    ) -> Dict:
+        """
+        Rebuild the collection into a fresh index, then swap it in and write a snapshot.
+
+        The new index is trained and filled outside the lock, so searches and writes continue
+        meanwhile; memories added or updated during the build are copied over before the swap.
+
+        Args:
+            index_type (str, optional): Index type to build. Defaults to the configured index_type.
+            vector_encoding (str, optional): Vector encoding to build. Defaults to the configured vector_encoding.
+
+        Returns:
+            Dict: Rebuild report with the index type, encoding, size, build time and recall@10 against
+                exact search.
+        """
+        index_type = index_type or self.index_type
+        vector_encoding = vector_encoding or self.vector_encoding
+
+        with self._rebuild_lock:
+            with self._lock.read():
+                metric = self.index.metric_type
+                rows = self.payloads.rows()
+                vectors = self._get_vectors(rows) if len(rows) else None
+                next_row = self.next_row
+                self._dirty_rows = set()
+
+            try:
+                return self._build_and_swap(
+                    index_type, vector_encoding, metric, rows, vectors, next_row
+                )
+            finally:
+                self._dirty_rows = None
+
+    def _build_and_swap(
+        self,
+        index_type: str,
+        vector_encoding: str,
+        metric: int,
+        rows: np.ndarray,
+        vectors: Optional[np.ndarray],
+        next_row: int,
+    ) -> Dict:
+        """Build the new index from the snapshot taken by `rebuild_index` and swap it in."""
+        start_time = time.perf_counter()
+        index = faiss.IndexIDMap2(
+            create_index(
+                index_type,
+                self.embedding_model_dims,
+                metric,
+                num_vectors=len(rows),
+                nlist=self.nlist,
+                pq_m=self.pq_m,
+                hnsw_m=self.hnsw_m,
+                vector_encoding=vector_encoding,
+            )
+        )
+        if not index.is_trained:
+            index.train(vectors)
+        if len(rows):
+            index.add_with_ids(vectors, rows)
+        if get_index_type(index) in ("ivf_flat", "ivf_pq"):
+            faiss.extract_index_ivf(index).make_direct_map()
+        set_search_params(index, self.nprobe, self.ef_search)
+        build_seconds = time.perf_counter() - start_time
+
+        recall = recall_at_k(index, vectors, rows) if vectors is not None else 1.0
+
+        with self._lock.write():
+            live = self.payloads.rows()
+            added = live[live >= next_row]
+            if len(added):
+                index.add_with_ids(self._get_vectors(added), added)
+            # Rows updated in place during the build still hold their old vectors in the new index
+            replaced = np.array(
+                sorted(row for row in self._dirty_rows if row < next_row),
+                dtype=np.int64,
+            )
+            replaced = replaced[np.isin(replaced, live)]
+            replaced_vectors = self._get_vectors(replaced) if len(replaced) else None
+            self.tombstones = set(rows.tolist()) - set(live.tolist())
+            self.index = index
+            if len(replaced):
+                self._reapply_vectors(replaced, replaced_vectors)
+            self._save()
+            self._reset_wal()
+
+        report = {
+            "index_type": get_index_type(index),
+            "vector_encoding": get_vector_encoding(index),
+            "count": index.ntotal,
+            "build_seconds": round(build_seconds, 3),
+            "recall_at_10": round(recall, 4),
+        }
+        self.last_rebuild_report = report
+        logger.info(f"Rebuilt FAISS index of {self.collection_name}: {report}")
+        return report
+
+    def _reapply_vectors(self, rows: np.ndarray, vectors: np.ndarray):
+        """
+        Write vectors over the rows they replaced, e.g. updates made while a rebuild was running.
+
+        Indexes that cannot replace vectors in place (HNSW) move the memory to a new row instead.
+        """
+        moved = []
+        for row, vector_np in zip(rows.tolist(), vectors):
+            if not self._replace_vector(row, vector_np.reshape(1, -1)):
+                moved.append(row)
+        for row, (vector_id, payload) in self.payloads.get_by_rows(moved).items():
+            self._apply_delete(vector_id, row)
+            self._apply_insert(vectors[rows == row], [vector_id], [payload])
+
+    def _get_wal_path(self) -> str:
+        return self._snapshot_path("wal", self._generation)
+
+    def _replay_wal(self):
+        """
+        Re-apply write-ahead log records that are newer than the loaded snapshot.
+
+        Each generation logs to its own file, so the logs of the loaded generation and of any later,
+        unreadable generations are replayed in order.
+        """
+        generations = sorted(
+            generation
+            for generation, extensions in self._snapshot_files().items()
+            if "wal" in extensions and generation >= self._generation
+        )
+        for generation in generations:
+            self._replay_wal_file(self._snapshot_path("wal", generation))
+
+    def _replay_wal_file(self, wal_path: str):
+        """
+        Re-apply the records of one write-ahead log file.
+
+        Records are framed as consecutive pickles. A torn record at the tail (e.g. after a crash
+        mid-append) ends the replay and is truncated so that later appends stay readable.
+        """
+        replayed = 0
+        # Writes up to this sequence number already reached the payload store
+        applied_seq = self.payloads.applied_seq()
+        with open(wal_path, "rb+") as f:
+            while True:
+                offset = f.tell()
+                try:
+                    record = pickle.load(f)
+                except EOFError:
+                    break
+                except Exception as e:
+                    logger.warning(
+                        f"Truncating corrupted write-ahead log {wal_path} at offset {offset}: {e}"
+                    )
+                    f.truncate(offset)
+                    break
+
+                op, seq = record[0], record[1]
+                self._wal_records += 1
+                if seq <= self._wal_seq:
+                    continue
+
+                if seq <= applied_seq:
+                    self._replay_index(op, *record[2:])
+                elif op == "insert":
+                    self._apply_insert(*record[2:], seq=seq)
+                elif op == "delete":
+                    self._apply_delete(*record[2:], seq=seq)
+                elif op == "update":
+                    self._apply_update(*record[2:], seq=seq)
+                self._wal_seq = seq
+                replayed += 1
+
+        if replayed:
+            logger.info(f"Replayed {replayed} write-ahead log records from {wal_path}")
+
+    def _replay_index(self, op: str, *args):
+        """
+        Re-apply a write-ahead log record to the index only, for a write the payload store already holds.
+
+        The logged rows of deletes and moved updates become tombstones. Tombstones are recomputed
+        from the payload store once the log is replayed, so rows the log does not name are caught too.
+        """
+        if op == "delete":
+            if len(args) > 1 and args[1] is not None:
+                self.tombstones.add(args[1])
+            return
+        if op == "insert":
+            vectors_np = args[0]
+        elif op == "update" and args[1] is not None:
+            vectors_np = args[1]
+            row = args[3] if len(args) > 3 else None
+            if row is not None:
+                if self._replace_vector(row, vectors_np):
+                    return
+                self.tombstones.add(row)
+        else:
+            return
+
+        rows = np.arange(self.next_row, self.next_row + len(vectors_np), dtype=np.int64)
+        self._make_writable()
+        self.index.add_with_ids(vectors_np, rows)
+        self._write_vectors(self.next_row, vectors_np)
+        self.next_row += len(rows)
+
+    def _next_seq(self) -> Optional[int]:
+        """Sequence number the next write-ahead log record will get, or None without a log."""
+        return self._wal_seq + 1 if self.path else None
+
+    def _append_wal(self, op: str, *args):
+        """
+        Append a mutation record to the write-ahead log.
+
+        Args:
+            op (str): Operation name. One of 'insert', 'delete', 'update'.
+            *args: Arguments of the matching `_apply_*` method.
+        """
+        if not self.path:
+            return
+
+        self._wal_seq += 1
+        try:
+            if self._wal_file is None:
+                os.makedirs(self.path, exist_ok=True)
+                self._wal_file = open(self._get_wal_path(), "ab")
+            pickle.dump((op, self._wal_seq, *args), self._wal_file)
+            self._wal_records += 1
+            self._unflushed_records += 1
+        except Exception as e:
+            logger.warning(f"Failed to append to write-ahead log: {e}")
+
+        if self.durability == "every_op" or (
+            self.durability == "group_commit"
+            and self._unflushed_records >= self.flush_max_records
+        ):
+            self.flush()
+        elif self.durability == "group_commit" and self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+        if self._should_compact():
+            self._compacting = True
+            threading.Thread(target=self._compact, daemon=True).start()
+
+    def flush(self):
+        """Write buffered write-ahead log records to disk and fsync them."""
+        with self._lock.write():
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._wal_file is None or not self._unflushed_records:
+                return
+            try:
+                self._wal_file.flush()
+                os.fsync(self._wal_file.fileno())
+                self._unflushed_records = 0
+            except Exception as e:
+                logger.warning(f"Failed to flush write-ahead log: {e}")
+
+    def close(self):
+        """Flush pending writes and release open files. Call on shutdown."""
+        with self._lock.write():
+            self.flush()
+            if self._wal_file is not None:
+                self._wal_file.close()
+                self._wal_file = None
+            if self._vector_fd is not None:
+                os.close(self._vector_fd)
+                self._vector_fd = None
+        logger.info(f"Closed collection {self.collection_name}")
+
+    def _should_compact(self) -> bool:
+        if self._compacting or self.index is None:
+            return False
+        return self._wal_records >= max(
+            self.wal_compaction_threshold, self.index.ntotal
+        )
+
+    def _reset_wal(self):
+        """
+        Close the write-ahead log after a snapshot. Later records go to the file of the new generation.
+
+        The closed log is fsynced, since it is replayed if the new generation ever fails to load.
+        """
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if self._wal_file is not None:
+            try:
+                self._wal_file.flush()
+                os.fsync(self._wal_file.fileno())
+            except Exception as e:
+                logger.warning(f"Failed to flush write-ahead log: {e}")
+            self._wal_file.close()
+            self._wal_file = None
+        self._wal_records = 0
+        self._unflushed_records = 0
+
+    def _compact(self):
+        """
+        Fold the write-ahead log into a fresh snapshot.
+
+        Under the write lock, the log is rotated to the file of the next generation and the index is
+        copied in memory. The copy is then written without the lock, so searches and writes continue
+        meanwhile and their records go to the new log. If the snapshot fails, the generation before
+        it still replays both logs.
+        """
+        try:
+            with self._lock.write():
+                self._reset_wal()
+                generation = self._next_generation()
+                self._generation = generation
+                self._own_inverted_lists()
+                index = faiss.serialize_index(self.index)
+                state = self._snapshot_state()
+
+            if not self._write_snapshot(generation, index, state):
+                return
+            with self._lock.write():
+                # A rebuild may have written a newer generation in between
+                if self._generation == generation:
+                    self.payloads.clear_vectors(state["wal_seq"])
+                    self._prune_generations()
+            logger.info(f"Compacted write-ahead log of {self.collection_name}")
+        except Exception as e:
+            logger.warning(f"Failed to compact write-ahead log: {e}")
+        finally:
+            self._compacting = False
 
     def _parse_output(self, scores, ids, limit=None) -> List[OutputData]:
         """
@@ -126,27 +1375,23 @@ class FAISS(VectorStoreBase):
         if limit is None:
             limit = len(ids)
 
+        # FAISS returns -1 for empty results
+        records = self.payloads.get_by_rows(
+            [index_id for index_id in ids[:limit] if index_id != -1]
+        )
+
         results = []
         for i in range(min(len(ids), limit)):
-            if ids[i] == -1:  # FAISS returns -1 for empty results
+            record = records.get(int(ids[i]))
+            if record is None:
                 continue
 
-            index_id = int(ids[i])
-            vector_id = self.index_to_id.get(index_id)
-            if vector_id is None:
-                continue
-
-            payload = self.docstore.get(vector_id)
-            if payload is None:
-                continue
-
-            payload_copy = payload.copy()
-
+            vector_id, payload = record
             score = float(scores[i])
             entry = OutputData(
                 id=vector_id,
                 score=score,
-                payload=payload_copy,
+                payload=payload,
             )
             results.append(entry)
 
@@ -164,6 +1409,28 @@ class FAISS(VectorStoreBase):
         Returns:
             self: The FAISS instance.
         """
+        with self._lock.write():
+            self.index = faiss.IndexIDMap2(self._create_base_index(distance))
+            self.collection_name = name
+            self._reset_state()
+            self._open_payloads()
+            self.payloads.reset()
+            self._reset_vector_file()
+            self._save()
+            self._reset_wal()
+
+        return self
+
+    def _create_base_index(self, distance: str = None):
+        """
+        Create the underlying FAISS index for the distance strategy.
+
+        Args:
+            distance (str, optional): Distance metric to use. Defaults to the store's distance_strategy.
+
+        Returns:
+            faiss.Index: Empty FAISS index.
+        """
         distance_strategy = distance or self.distance_strategy
 
         # Create index based on distance strategy
@@ -171,15 +1438,17 @@ class FAISS(VectorStoreBase):
             distance_strategy.lower() == "inner_product"
             or distance_strategy.lower() == "cosine"
         ):
-            self.index = faiss.IndexFlatIP(self.embedding_model_dims)
+            metric = faiss.METRIC_INNER_PRODUCT
         else:
-            self.index = faiss.IndexFlatL2(self.embedding_model_dims)
-
-        self.collection_name = name
-
-        self._save()
+            metric = faiss.METRIC_L2
 
-        return self
+        # Encodings that need training data are applied by the size-based rebuild
+        vector_encoding = (
+            self.vector_encoding if self.vector_encoding == "fp16" else "float32"
+        )
+        return create_index(
+            "flat", self.embedding_model_dims, metric, vector_encoding=vector_encoding
+        )
 
     def insert(
         self,
@@ -212,19 +1481,43 @@ class FAISS(VectorStoreBase):
         if self.normalize_L2 and self.distance_strategy.lower() == "euclidean":
             faiss.normalize_L2(vectors_np)
 
-        self.index.add(vectors_np)
+        with self._lock.write():
+            self._apply_insert(vectors_np, ids, payloads, self._next_seq())
+            self._append_wal("insert", vectors_np, ids, payloads)
 
-        starting_idx = len(self.index_to_id)
-        for i, (vector_id, payload) in enumerate(zip(ids, payloads)):
-            self.docstore[vector_id] = payload.copy()
-            self.index_to_id[starting_idx + i] = vector_id
-
-        self._save()
+        self._maybe_rebuild_index()
 
         logger.info(
             f"Inserted {len(vectors)} vectors into collection {self.collection_name}"
         )
 
+    def _apply_insert(
+        self,
+        vectors_np: np.ndarray,
+        ids: List[str],
+        payloads: List[Dict],
+        seq: Optional[int] = None,
+    ):
+        """
+        Add vectors to the in-memory index and their payloads to the payload store.
+
+        When `seq` is given, the payload store also keeps the vectors under that write-ahead log
+        sequence number until the next snapshot.
+        """
+        starting_idx = self.next_row
+        rows = np.arange(starting_idx, starting_idx + len(ids), dtype=np.int64)
+        self._make_writable()
+        self.index.add_with_ids(vectors_np, rows)
+        self._write_vectors(starting_idx, vectors_np)
+        self.next_row += len(ids)
+
+        # Re-inserted IDs leave their previous vectors behind. Rows at or past starting_idx are
+        # the ones being written, which happens when the write-ahead log is replayed.
+        previous_rows = self.payloads.get_rows(list(ids)).values()
+        self.tombstones.update(row for row in previous_rows if row < starting_idx)
+        self.tombstones.difference_update(rows.tolist())
+        self.payloads.put_many(rows.tolist(), ids, payloads, seq, vectors_np)
+
     def search(
         self,
         query: str,
@@ -244,6 +1537,25 @@ class FAISS(VectorStoreBase):
         Returns:
             List[OutputData]: Search results.
         """
+        return self.search_batch(vectors, limit=limit, filters=filters)[0]
+
+    def search_batch(
+        self,
+        vectors: List[list],
+        limit: int = 5,
+        filters: Optional[Dict] = None,
+    ) -> List[List[OutputData]]:
+        """
+        Search for similar vectors for several queries with a single index scan.
+
+        Args:
+            vectors (List[list]): Query vectors, one per query.
+            limit (int, optional): Number of results to return per query. Defaults to 5.
+            filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
+
+        Returns:
+            List[List[OutputData]]: Search results for each query, in input order.
+        """
         if self.index is None:
             raise ValueError("Collection not initialized. Call create_col first.")
 
@@ -255,22 +1567,234 @@ class FAISS(VectorStoreBase):
         if self.normalize_L2 and self.distance_strategy.lower() == "euclidean":
             faiss.normalize_L2(query_vectors)
 
+        self._maybe_refresh()
+        with self._lock.read():
+            return self._search_batch(query_vectors, limit, filters)
+
+    def _search_batch(
+        self, query_vectors: np.ndarray, limit: int, filters: Optional[Dict]
+    ) -> List[List[OutputData]]:
+        candidate_rows = self._filter_candidates(filters) if filters else None
+        if candidate_rows is not None:
+            return self._search_candidates(query_vectors, candidate_rows, limit)
+
         fetch_k = limit * 2 if filters else limit
-        scores, indices = self.index.search(query_vectors, fetch_k)
+        rerank = self._should_rerank()
+        if rerank:
+            fetch_k *= self.rerank_factor
+        fetch_k = min(fetch_k, self.index.ntotal) or limit
+
+        params = None
+        if self.tombstones:
+            # Skip deleted vectors inside the index search instead of over-fetching past them
+            tombstones = faiss.IDSelectorBatch(
+                np.fromiter(self.tombstones, dtype=np.int64)
+            )
+            params = self._search_params(faiss.IDSelectorNot(tombstones))
+        scores, indices = self.index.search(query_vectors, fetch_k, params=params)
 
-        results = self._parse_output(scores[0], indices[0], limit)
+        batch_results = []
+        for query_vector, query_scores, query_indices in zip(
+            query_vectors, scores, indices
+        ):
+            if rerank:
+                query_scores, query_indices = self._rerank(query_vector, query_indices)
+            results = self._parse_output(query_scores, query_indices)
+
+            if filters:
+                filtered_results = []
+                for result in results:
+                    if self._apply_filters(result.payload, filters):
+                        filtered_results.append(result)
+                        if len(filtered_results) >= limit:
+                            break
+                results = filtered_results
+
+            batch_results.append(results[:limit])
+
+        return batch_results
+
+    def range_search(
+        self,
+        query: str,
+        vectors: List[float],
+        threshold: float,
+        limit: Optional[int] = None,
+        filters: Optional[Dict] = None,
+    ) -> List[OutputData]:
+        """
+        Search for every memory within a score threshold of the query, instead of a fixed number of them.
 
-        if filters:
-            filtered_results = []
-            for result in results:
-                if self._apply_filters(result.payload, filters):
-                    filtered_results.append(result)
-                    if len(filtered_results) >= limit:
-                        break
-            results = filtered_results[:limit]
+        The threshold is a minimum similarity for 'inner_product' and 'cosine' collections, and a maximum
+        distance for 'euclidean' ones.
 
+        Args:
+            query (str): Query (not used, kept for API compatibility).
+            vectors (List[float]): Query vector.
+            threshold (float): Score a memory must reach to be returned.
+            limit (Optional[int], optional): Maximum number of results to return. Defaults to None (no limit).
+            filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
+
+        Returns:
+            List[OutputData]: Matching memories, best first.
+        """
+        if self.index is None:
+            raise ValueError("Collection not initialized. Call create_col first.")
+
+        query_vector = np.array(vectors, dtype=np.float32).reshape(1, -1)
+        if self.normalize_L2 and self.distance_strategy.lower() == "euclidean":
+            faiss.normalize_L2(query_vector)
+
+        self._maybe_refresh()
+        with self._lock.read():
+            results = self._range_search(query_vector, threshold, filters)
+        return results if limit is None else results[:limit]
+
+    def _range_search(
+        self, query_vector: np.ndarray, threshold: float, filters: Optional[Dict]
+    ) -> List[OutputData]:
+        similarity = self.index.metric_type == faiss.METRIC_INNER_PRODUCT
+        candidate_rows = self._filter_candidates(filters) if filters else None
+
+        if (
+            candidate_rows is not None
+            and len(candidate_rows) <= self.exact_filter_threshold
+        ):
+            # Score small candidate sets exactly, like top-k search does
+            if not len(candidate_rows):
+                return []
+            scores, positions = exact_top_k(
+                query_vector,
+                self._get_vectors(candidate_rows),
+                len(candidate_rows),
+                self.index.metric_type,
+            )
+            scores, rows = scores[0], candidate_rows[positions[0]]
+        else:
+            sel = (
+                faiss.IDSelectorBatch(candidate_rows)
+                if candidate_rows is not None
+                else None
+            )
+            _, scores, rows = self.index.range_search(
+                query_vector, threshold, params=self._search_params(sel)
+            )
+            if self._should_rerank():
+                # Compressed scores only shortlist; the exact ones decide the threshold
+                scores, rows = self._rerank(query_vector[0], rows)
+            else:
+                order = np.argsort(-scores if similarity else scores)
+                scores, rows = scores[order], rows[order]
+
+        within = scores >= threshold if similarity else scores <= threshold
+        results = self._parse_output(scores[within], rows[within])
+        if filters and candidate_rows is None:
+            results = [
+                result
+                for result in results
+                if self._apply_filters(result.payload, filters)
+            ]
         return results
 
+    def _search_candidates(
+        self, query_vectors: np.ndarray, rows: np.ndarray, limit: int
+    ) -> List[List[OutputData]]:
+        """
+        Search only among the given memories.
+
+        Small candidate sets are scored exactly from their stored vectors, so the cost is proportional
+        to the number of candidates. Larger sets restrict the index search with an ID selector.
+
+        Args:
+            query_vectors (np.ndarray): Query vectors with shape (num_queries, dims).
+            rows (np.ndarray): Index rows of the memories that pass the filters.
+            limit (int): Number of results to return per query.
+
+        Returns:
+            List[List[OutputData]]: Search results for each query.
+        """
+        if not len(rows):
+            return [[] for _ in range(len(query_vectors))]
+
+        k = min(limit, len(rows))
+
+        if len(rows) > self.exact_filter_threshold:
+            params = self._search_params(faiss.IDSelectorBatch(rows))
+            if not self._should_rerank():
+                scores, indices = self.index.search(query_vectors, k, params=params)
+                return [
+                    self._parse_output(query_scores, query_indices)
+                    for query_scores, query_indices in zip(scores, indices)
+                ]
+
+            fetch_k = min(k * self.rerank_factor, len(rows))
+            _, indices = self.index.search(query_vectors, fetch_k, params=params)
+            return [
+                self._parse_output(*self._rerank(query_vector, query_indices))[:limit]
+                for query_vector, query_indices in zip(query_vectors, indices)
+            ]
+
+        scores, positions = exact_top_k(
+            query_vectors, self._get_vectors(rows), k, self.index.metric_type
+        )
+        return [
+            self._parse_output(query_scores, rows[query_positions])
+            for query_scores, query_positions in zip(scores, positions)
+        ]
+
+    def _rerank(self, query_vector: np.ndarray, indices: np.ndarray):
+        """
+        Re-score the rows returned by a compressed index against their full-precision vectors.
+
+        Args:
+            query_vector (np.ndarray): Query vector with shape (dims,).
+            indices (np.ndarray): Rows returned by the index search, -1 for empty slots.
+
+        Returns:
+            tuple: (scores, rows), best first.
+        """
+        rows = indices[indices != -1]
+        if not len(rows):
+            return np.empty(0, dtype=np.float32), rows
+        scores, positions = exact_top_k(
+            query_vector.reshape(1, -1),
+            self._get_vectors(rows),
+            len(rows),
+            self.index.metric_type,
+        )
+        return scores[0], rows[positions[0]]
+
+    def _search_params(self, sel):
+        """Build search parameters of the type the underlying index expects."""
+        index_type = get_index_type(self.index)
+        if index_type in ("ivf_flat", "ivf_pq"):
+            return faiss.SearchParametersIVF(sel=sel, nprobe=self.nprobe)
+        if index_type == "hnsw":
+            return faiss.SearchParametersHNSW(sel=sel, efSearch=self.ef_search)
+        return faiss.SearchParameters(sel=sel)
+
+    def _filter_candidates(self, filters: Dict) -> Optional[np.ndarray]:
+        """
+        Look up the memories matching the filters through the indexed payload columns.
+
+        Args:
+            filters (Dict): Filters to apply.
+
+        Returns:
+            Optional[np.ndarray]: Index rows of the matching memories, or None if no filter key is indexed.
+        """
+        if not self.payloads.is_indexed(filters):
+            return None
+
+        return np.array(
+            [
+                row
+                for row, _, payload in self.payloads.select(filters)
+                if self._apply_filters(payload, filters)
+            ],
+            dtype=np.int64,
+        )
+
     def _apply_filters(self, payload: Dict, filters: Dict) -> bool:
         """
         Apply filters to a payload.
@@ -307,18 +1831,13 @@ class FAISS(VectorStoreBase):
         if self.index is None:
             raise ValueError("Collection not initialized. Call create_col first.")
 
-        index_to_delete = None
-        for idx, vid in self.index_to_id.items():
-            if vid == vector_id:
-                index_to_delete = idx
-                break
-
-        if index_to_delete is not None:
-            self.docstore.pop(vector_id, None)
-            self.index_to_id.pop(index_to_delete, None)
-
-            self._save()
+        with self._lock.write():
+            row = self.payloads.get_row(vector_id)
+            deleted = self._apply_delete(vector_id, seq=self._next_seq())
+            if deleted:
+                self._append_wal("delete", vector_id, row)
 
+        if deleted:
             logger.info(
                 f"Deleted vector {vector_id} from collection {self.collection_name}"
             )
@@ -327,6 +1846,22 @@ class FAISS(VectorStoreBase):
                 f"Vector {vector_id} not found in collection {self.collection_name}"
             )
 
+    def _apply_delete(
+        self, vector_id: str, row: Optional[int] = None, seq: Optional[int] = None
+    ) -> bool:
+        """Delete a payload and mark its vector as a tombstone."""
+        payload_row = self.payloads.delete(vector_id, seq)
+        deleted = payload_row is not None
+        # When replaying, the payload store already holds the final state, so the payload
+        # may be gone or point at a later row; the logged row is the one being replaced
+        index_to_delete = row if row is not None else payload_row
+        if index_to_delete is None:
+            return False
+
+        self.tombstones.add(index_to_delete)
+        self._maybe_purge_tombstones()
+        return deleted
+
     def update(
         self,
         vector_id: str,
@@ -344,22 +1879,102 @@ class FAISS(VectorStoreBase):
         if self.index is None:
             raise ValueError("Collection not initialized. Call create_col first.")
 
-        if vector_id not in self.docstore:
-            raise ValueError(f"Vector {vector_id} not found")
+        vector_np = None
+        if vector is not None:
+            vector_np = np.array([vector], dtype=np.float32)
+            if self.normalize_L2 and self.distance_strategy.lower() == "euclidean":
+                faiss.normalize_L2(vector_np)
+
+        with self._lock.write():
+            row = self.payloads.get_row(vector_id)
+            if row is None:
+                raise ValueError(f"Vector {vector_id} not found")
+            if vector_np is not None and payload is None:
+                # Log the full payload so the record replays without the payload store
+                payload = self.payloads.get(vector_id)
+            self._apply_update(vector_id, vector_np, payload, row, self._next_seq())
+            self._append_wal("update", vector_id, vector_np, payload, row)
 
-        current_payload = self.docstore[vector_id].copy()
+        logger.info(f"Updated vector {vector_id} in collection {self.collection_name}")
 
-        if payload is not None:
-            self.docstore[vector_id] = payload.copy()
-            current_payload = self.docstore[vector_id].copy()
+    def _apply_update(
+        self,
+        vector_id: str,
+        vector_np: Optional[np.ndarray] = None,
+        payload: Optional[Dict] = None,
+        row: Optional[int] = None,
+        seq: Optional[int] = None,
+    ):
+        """
+        Update a vector in the in-memory index and its payload in the payload store.
 
-        if vector is not None:
-            self.delete(vector_id)
-            self.insert([vector], [current_payload], [vector_id])
+        When `seq` is given, the payload store keeps the new vector as in `_apply_insert`.
+        The vector is replaced in place under its row when the index allows it, so the update leaves
+        no tombstone behind. HNSW graphs, and records logged without a row, fall back to
+        tombstoning the old row and inserting the vector under a new one.
+        """
+        if vector_np is None or (
+            row is not None and self._replace_vector(row, vector_np)
+        ):
+            if payload is not None:
+                self.payloads.update(vector_id, payload, seq, vector_np)
+            return
+
+        if payload is None:
+            # Records written before updates carried the full payload
+            payload = self.payloads.get(vector_id)
+            if payload is None:
+                return
+        self._apply_delete(vector_id, row)
+        self._apply_insert(vector_np, [vector_id], [payload], seq)
+
+    def _index_position(self, row: int) -> Optional[int]:
+        """Find where a row is stored in the wrapped index."""
+        id_map = faiss.rev_swig_ptr(self.index.id_map.data(), self.index.id_map.size())
+        # Rows are added in ascending order and removals keep that order
+        position = int(np.searchsorted(id_map, row))
+        if position < len(id_map) and id_map[position] == row:
+            return position
+        matches = np.flatnonzero(id_map == row)
+        return int(matches[0]) if len(matches) else None
+
+    def _replace_vector(self, row: int, vector_np: np.ndarray) -> bool:
+        """
+        Overwrite the vector stored under an index row.
+
+        Args:
+            row (int): Index row of the vector.
+            vector_np (np.ndarray): New vector with shape (1, dims).
+
+        Returns:
+            bool: False if the index cannot replace vectors in place.
+        """
+        self._make_writable()
+        base_index = faiss.downcast_index(self.index.index)
+        if isinstance(base_index, faiss.IndexHNSW):
+            return False
+        if isinstance(base_index, faiss.IndexIVF) and base_index.direct_map.no():
+            return False
+        position = self._index_position(row)
+        if position is None:
+            return False
+
+        if isinstance(base_index, faiss.IndexFlatCodes):
+            codes = faiss.rev_swig_ptr(base_index.codes.data(), base_index.codes.size())
+            code_size = base_index.code_size
+            codes[position * code_size : (position + 1) * code_size] = (
+                base_index.sa_encode(vector_np).ravel()
+            )
+        elif isinstance(base_index, faiss.IndexIVF):
+            # The wrapped IVF index numbers its vectors by position
+            base_index.update_vectors(np.array([position], dtype=np.int64), vector_np)
         else:
-            self._save()
+            return False
 
-        logger.info(f"Updated vector {vector_id} in collection {self.collection_name}")
+        self._write_vectors(row, vector_np)
+        if self._dirty_rows is not None:
+            self._dirty_rows.add(row)
+        return True
 
     def get(self, vector_id: str) -> OutputData:
         """
@@ -374,17 +1989,90 @@ class FAISS(VectorStoreBase):
         if self.index is None:
             raise ValueError("Collection not initialized. Call create_col first.")
 
-        if vector_id not in self.docstore:
+        payload = self.payloads.get(vector_id)
+        if payload is None:
             return None
 
-        payload = self.docstore[vector_id].copy()
-
         return OutputData(
             id=vector_id,
             score=None,
             payload=payload,
         )
 
+    def get_vector(self, vector_id: str) -> Optional[np.ndarray]:
+        """
+        Retrieve the stored vector of a memory, at full precision when re-ranking keeps it.
+
+        Args:
+            vector_id (str): ID of the memory.
+
+        Returns:
+            Optional[np.ndarray]: Vector with shape (dims,), or None if the memory does not exist.
+        """
+        if self.index is None:
+            raise ValueError("Collection not initialized. Call create_col first.")
+
+        with self._lock.read():
+            row = self.payloads.get_row(vector_id)
+            if row is None:
+                return None
+            return self._get_vectors(np.array([row], dtype=np.int64))[0]
+
+    def find_by_hash(
+        self, hashes: List[str], filters: Optional[Dict] = None
+    ) -> Dict[str, str]:
+        """
+        Find memories by the MD5 hash of their text, through the indexed hash column.
+
+        Args:
+            hashes (List[str]): Hashes to look up.
+            filters (Optional[Dict], optional): Filters the memories must match, e.g. the user_id. Defaults to None.
+
+        Returns:
+            Dict[str, str]: Each hash that has a matching memory, mapped to the memory ID.
+        """
+        if self.index is None:
+            raise ValueError("Collection not initialized. Call create_col first.")
+        if not hashes:
+            return {}
+
+        found = {}
+        for batch in chunked(list(hashes)):
+            for _, vector_id, payload in self.payloads.select(
+                {**(filters or {}), "hash": batch}
+            ):
+                if self._apply_filters(payload, filters):
+                    found.setdefault(payload["hash"], vector_id)
+        return found
+
+    def export(self, batch_size: int = 1000):
+        """
+        Iterate over every memory with its vector, e.g. to copy the collection into another store.
+
+        Args:
+            batch_size (int, optional): Number of memories per batch. Defaults to 1000.
+
+        Yields:
+            tuple: (ids, vectors, payloads) of up to `batch_size` memories, in row order.
+        """
+        if self.index is None:
+            raise ValueError("Collection not initialized. Call create_col first.")
+
+        rows, ids, payloads = [], [], []
+        for row, vector_id, payload in self.payloads.select():
+            rows.append(row)
+            ids.append(vector_id)
+            payloads.append(payload)
+            if len(rows) == batch_size:
+                with self._lock.read():
+                    vectors = self._get_vectors(np.array(rows, dtype=np.int64))
+                yield ids, vectors, payloads
+                rows, ids, payloads = [], [], []
+        if rows:
+            with self._lock.read():
+                vectors = self._get_vectors(np.array(rows, dtype=np.int64))
+            yield ids, vectors, payloads
+
     def list_cols(self) -> List[str]:
         """
         List all collections.
@@ -399,7 +2087,10 @@ class FAISS(VectorStoreBase):
             collections = []
             path = Path(self.path).parent
             for file in path.glob("*.faiss"):
-                collections.append(file.stem)
+                # Strip the snapshot generation from names like `mem0.12.faiss`
+                name = re.sub(r"\.\d+$", "", file.stem)
+                if name not in collections:
+                    collections.append(name)
             return collections
         except Exception as e:
             logger.warning(f"Failed to list collections: {e}")
@@ -409,23 +2100,37 @@ class FAISS(VectorStoreBase):
         """
         Delete a collection.
         """
+        with self._lock.write():
+            self._reset_wal()
+            self._reset_vector_file(remove=True)
+            if self.payloads is not None:
+                self.payloads.close()
+                self.payloads = None
+
         if self.path:
             try:
-                index_path = f"{self.path}/{self.collection_name}.faiss"
-                docstore_path = f"{self.path}/{self.collection_name}.pkl"
-
-                if os.path.exists(index_path):
-                    os.remove(index_path)
-                if os.path.exists(docstore_path):
-                    os.remove(docstore_path)
+                payload_path = self._get_payload_path()
+                snapshot_paths = [
+                    self._snapshot_path(extension, generation)
+                    for generation, extensions in self._snapshot_files().items()
+                    for extension in extensions
+                ]
+
+                for file_path in (
+                    *snapshot_paths,
+                    payload_path,
+                    f"{payload_path}-wal",
+                    f"{payload_path}-shm",
+                ):
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
 
                 logger.info(f"Deleted collection {self.collection_name}")
             except Exception as e:
                 logger.warning(f"Failed to delete collection: {e}")
 
         self.index = None
-        self.docstore = {}
-        self.index_to_id = {}
+        self._reset_state()
 
     def col_info(self) -> Dict:
         """
@@ -437,9 +2142,18 @@ class FAISS(VectorStoreBase):
         if self.index is None:
             return {"name": self.collection_name, "count": 0}
 
+        with self._lock.read():
+            return self._col_info()
+
+    def _col_info(self) -> Dict:
         return {
             "name": self.collection_name,
             "count": self.index.ntotal,
+            "live_count": self.payloads.count(),
+            "tombstone_ratio": self.tombstone_ratio(),
+            "index_type": get_index_type(self.index),
+            "vector_encoding": get_vector_encoding(self.index),
+            "last_rebuild": self.last_rebuild_report,
             "dimension": self.index.d,
             "distance": self.distance_strategy,
         }
@@ -457,31 +2171,50 @@ class FAISS(VectorStoreBase):
         Returns:
             List[OutputData]: List of vectors.
         """
+        results, _ = self.list_page(filters=filters, limit=limit)
+        return [results]
+
+    def list_page(
+        self,
+        filters: Optional[Dict] = None,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+    ) -> Tuple[List[OutputData], Optional[int]]:
+        """
+        List one page of the vectors in a collection, in insertion order.
+
+        Filters on indexed payload keys are answered from the payload index, so a page costs
+        O(limit) rather than a scan of the collection.
+
+        Args:
+            filters (Optional[Dict], optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Number of vectors to return. Defaults to 100.
+            cursor (Optional[int], optional): Cursor returned with the previous page. Defaults to None.
+
+        Returns:
+            Tuple[List[OutputData], Optional[int]]: The page and the cursor of the next page, or None
+                when this is the last page.
+        """
         if self.index is None:
-            return []
+            return [], None
 
         results = []
-        count = 0
-
-        for vector_id, payload in self.docstore.items():
+        for row, vector_id, payload in self.payloads.select(filters, cursor):
             if filters and not self._apply_filters(payload, filters):
                 continue
 
-            payload_copy = payload.copy()
-
             results.append(
                 OutputData(
                     id=vector_id,
                     score=None,
-                    payload=payload_copy,
+                    payload=payload,
                 )
             )
 
-            count += 1
-            if count >= limit:
-                break
+            if len(results) >= limit:
+                return results, row
 
-        return [results]
+        return results, None
 
     def reset(self):
         """Reset the index by deleting and recreating it."""
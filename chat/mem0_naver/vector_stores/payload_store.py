@@ -0,0 +1,425 @@
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Payload keys stored in indexed columns, so filters on them read only matching rows
+INDEXED_PAYLOAD_KEYS = ("user_id", "agent_id", "run_id", "role", "actor_id", "hash")
+
+_SCALAR_TYPES = (str, int, float, bool)
+
+# IDs bound per `IN (...)` query. SQLite caps the variables of a statement (999 before 3.32).
+QUERY_CHUNK_SIZE = 500
+
+
+def chunked(values: List, size: int = QUERY_CHUNK_SIZE) -> Iterator[List]:
+    """Split values into lists of at most `size`, e.g. the IDs of one `IN (...)` query."""
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _column_value(value):
+    # Lists and dicts are kept in the JSON payload only and matched in Python
+    return value if isinstance(value, _SCALAR_TYPES) else None
+
+
+def _vector_blob(
+    vectors: Optional[np.ndarray], idx: int, seq: Optional[int]
+) -> Optional[bytes]:
+    # Vectors are only kept for writes with a log sequence number, which `clear_vectors` drops
+    if vectors is None or seq is None:
+        return None
+    return np.ascontiguousarray(vectors[idx], dtype=np.float32).tobytes()
+
+
+def _indexed_clauses(filters: Optional[Dict]) -> Tuple[List[str], List]:
+    clauses, params = [], []
+    for key, value in (filters or {}).items():
+        if key not in INDEXED_PAYLOAD_KEYS:
+            continue
+        values = value if isinstance(value, list) else [value]
+        if not values or not all(isinstance(v, _SCALAR_TYPES) for v in values):
+            continue
+        clauses.append(f"{key} IN ({', '.join('?' * len(values))})")
+        params.extend(values)
+    return clauses, params
+
+
+class PayloadStore:
+    """
+    SQLite table of memory payloads keyed by memory id, holding the index row of each memory.
+
+    The database runs in WAL mode: writes are serialized through one connection while every
+    reading thread gets its own connection, so reads never wait for a write to finish.
+
+    A payload write is committed before the write-ahead log record of the index is fsynced, so
+    each write also records its log sequence number, and writes that change a vector keep the
+    vector until a snapshot of the index includes it. After a crash this lets the index catch up
+    with the payloads instead of the other way round.
+    """
+
+    def __init__(self, db_path: str, synchronous: str = "NORMAL"):
+        self.db_path = db_path
+        self.synchronous = synchronous
+        self.connection = self._connect()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._create_table()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(f"PRAGMA synchronous={self.synchronous}")
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+        return connection
+
+    def _create_table(self) -> None:
+        columns = ", ".join(INDEXED_PAYLOAD_KEYS)
+        with self._lock:
+            self.connection.execute(f"""
+                CREATE TABLE IF NOT EXISTS payloads (
+                    id       TEXT PRIMARY KEY,
+                    row      INTEGER NOT NULL UNIQUE,
+                    {columns},
+                    payload  TEXT NOT NULL,
+                    seq      INTEGER,
+                    vector   BLOB
+                )
+            """)
+            self._migrate_columns()
+            # Row order within each key serves cursor pagination straight from the index
+            for key in INDEXED_PAYLOAD_KEYS:
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_payloads_{key}_row ON payloads ({key}, row)"
+                )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_payloads_pending ON payloads (seq) "
+                "WHERE vector IS NOT NULL"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)"
+            )
+
+    def _migrate_columns(self) -> None:
+        """Add and backfill indexed columns missing from a table created by an older version."""
+        existing = {
+            column[1]
+            for column in self.connection.execute("PRAGMA table_info(payloads)")
+        }
+        for column in ("seq", "vector"):
+            if column not in existing:
+                self.connection.execute(f"ALTER TABLE payloads ADD COLUMN {column}")
+
+        missing = [key for key in INDEXED_PAYLOAD_KEYS if key not in existing]
+        if not missing:
+            return
+
+        logger.info(f"Adding indexed payload columns: {', '.join(missing)}")
+        try:
+            self.connection.execute("BEGIN")
+            for key in missing:
+                self.connection.execute(f"ALTER TABLE payloads ADD COLUMN {key}")
+            records = self.connection.execute(
+                "SELECT id, payload FROM payloads"
+            ).fetchall()
+            assignments = ", ".join(f"{key} = ?" for key in missing)
+            self.connection.executemany(
+                f"UPDATE payloads SET {assignments} WHERE id = ?",
+                [
+                    (
+                        *(
+                            _column_value(json.loads(payload).get(key))
+                            for key in missing
+                        ),
+                        vector_id,
+                    )
+                    for vector_id, payload in records
+                ],
+            )
+            for (name,) in self.connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'payloads' "
+                "AND name LIKE 'idx_payloads_%' AND name NOT LIKE '%_row'"
+            ).fetchall():
+                self.connection.execute(f"DROP INDEX {name}")
+            self.connection.execute("COMMIT")
+        except Exception as e:
+            self.connection.execute("ROLLBACK")
+            logger.error(f"Payload table migration failed: {e}")
+            raise
+
+    @contextmanager
+    def _transaction(self, seq: Optional[int]):
+        """Run writes in one transaction that also records the log sequence number of the write."""
+        with self._lock:
+            try:
+                self.connection.execute("BEGIN")
+                yield self.connection
+                if seq is not None:
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES ('seq', ?)",
+                        (int(seq),),
+                    )
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+
+    def applied_seq(self) -> int:
+        """Write-ahead log sequence number of the last write committed to the payload store."""
+        result = (
+            self._reader()
+            .execute("SELECT value FROM meta WHERE key = 'seq'")
+            .fetchone()
+        )
+        return result[0] if result else 0
+
+    def put_many(
+        self,
+        rows: List[int],
+        ids: List[str],
+        payloads: List[Dict],
+        seq: Optional[int] = None,
+        vectors: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Insert or replace payloads in a single transaction.
+
+        Args:
+            rows (List[int]): Index rows of the memories.
+            ids (List[str]): Memory IDs.
+            payloads (List[Dict]): Payloads.
+            seq (int, optional): Write-ahead log sequence number of the write. Defaults to None.
+            vectors (np.ndarray, optional): Vectors of the memories, kept until `clear_vectors` when
+                `seq` is given. Defaults to None.
+        """
+        records = [
+            (
+                vector_id,
+                int(row),
+                *(_column_value(payload.get(key)) for key in INDEXED_PAYLOAD_KEYS),
+                json.dumps(payload, ensure_ascii=False),
+                seq,
+                _vector_blob(vectors, idx, seq),
+            )
+            for idx, (row, vector_id, payload) in enumerate(zip(rows, ids, payloads))
+        ]
+        columns = ", ".join(
+            ("id", "row", *INDEXED_PAYLOAD_KEYS, "payload", "seq", "vector")
+        )
+        placeholders = ", ".join("?" * (len(INDEXED_PAYLOAD_KEYS) + 5))
+        try:
+            with self._transaction(seq) as connection:
+                connection.executemany(
+                    f"INSERT OR REPLACE INTO payloads ({columns}) VALUES ({placeholders})",
+                    records,
+                )
+        except Exception as e:
+            logger.error(f"Failed to write payloads: {e}")
+            raise
+
+    def update(
+        self,
+        vector_id: str,
+        payload: Dict,
+        seq: Optional[int] = None,
+        vector: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Replace the payload of a memory, keeping its row. A new vector is kept as in `put_many`.
+
+        Only the indexed columns whose value changes are written, since every written column
+        rewrites its index entry. Updates usually keep the user, agent and run of a memory.
+        """
+        values = {key: _column_value(payload.get(key)) for key in INDEXED_PAYLOAD_KEYS}
+        columns = ", ".join(INDEXED_PAYLOAD_KEYS)
+        with self._transaction(seq) as connection:
+            current = connection.execute(
+                f"SELECT {columns} FROM payloads WHERE id = ?", (vector_id,)
+            ).fetchone()
+            if current is None:
+                return
+            changed = [
+                key
+                for key, value in zip(INDEXED_PAYLOAD_KEYS, current)
+                if values[key] != value
+            ]
+            assignments = [f"{key} = ?" for key in changed] + ["payload = ?"]
+            params = [values[key] for key in changed]
+            params.append(json.dumps(payload, ensure_ascii=False))
+            if vector is not None and seq is not None:
+                assignments += ["seq = ?", "vector = ?"]
+                params += [seq, _vector_blob(vector, 0, seq)]
+            connection.execute(
+                f"UPDATE payloads SET {', '.join(assignments)} WHERE id = ?",
+                (*params, vector_id),
+            )
+
+    def delete(self, vector_id: str, seq: Optional[int] = None) -> Optional[int]:
+        """
+        Delete the payload of a memory.
+
+        Returns:
+            Optional[int]: Index row of the deleted memory, or None if it did not exist.
+        """
+        with self._transaction(seq) as connection:
+            row = connection.execute(
+                "DELETE FROM payloads WHERE id = ? RETURNING row", (vector_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def delete_from_row(self, row: int) -> int:
+        """
+        Delete the payloads at or after an index row that have no stored vector to recover them from,
+        returning how many were deleted.
+        """
+        with self._lock:
+            return self.connection.execute(
+                "DELETE FROM payloads WHERE row >= ? AND vector IS NULL", (int(row),)
+            ).rowcount
+
+    def pending(self, after_seq: int) -> List[Tuple[int, str, np.ndarray]]:
+        """
+        List the memories whose vector was written after a write-ahead log sequence number.
+
+        Returns:
+            List[Tuple[int, str, np.ndarray]]: (row, id, vector) of each memory, in row order.
+        """
+        return [
+            (row, vector_id, np.frombuffer(vector, dtype=np.float32))
+            for row, vector_id, vector in self._reader().execute(
+                "SELECT row, id, vector FROM payloads "
+                "WHERE vector IS NOT NULL AND seq > ? ORDER BY row",
+                (int(after_seq),),
+            )
+        ]
+
+    def clear_vectors(self, up_to_seq: int) -> None:
+        """Drop the vectors of writes up to a sequence number, once a snapshot includes them."""
+        with self._lock:
+            self.connection.execute(
+                "UPDATE payloads SET vector = NULL WHERE vector IS NOT NULL AND seq <= ?",
+                (int(up_to_seq),),
+            )
+
+    def get(self, vector_id: str) -> Optional[Dict]:
+        result = (
+            self._reader()
+            .execute("SELECT payload FROM payloads WHERE id = ?", (vector_id,))
+            .fetchone()
+        )
+        return json.loads(result[0]) if result else None
+
+    def get_row(self, vector_id: str) -> Optional[int]:
+        result = (
+            self._reader()
+            .execute("SELECT row FROM payloads WHERE id = ?", (vector_id,))
+            .fetchone()
+        )
+        return result[0] if result else None
+
+    def get_rows(self, ids: List[str]) -> Dict[str, int]:
+        """Map the memory IDs that exist to their index rows."""
+        found = {}
+        for chunk in chunked(list(ids)):
+            placeholders = ", ".join("?" * len(chunk))
+            found.update(
+                self._reader().execute(
+                    f"SELECT id, row FROM payloads WHERE id IN ({placeholders})", chunk
+                )
+            )
+        return found
+
+    def get_by_rows(self, rows) -> Dict[int, Tuple[str, Dict]]:
+        """Map the index rows that hold a live memory to its ID and payload."""
+        found = {}
+        for chunk in chunked([int(row) for row in rows]):
+            placeholders = ", ".join("?" * len(chunk))
+            found.update(
+                (row, (vector_id, json.loads(payload)))
+                for row, vector_id, payload in self._reader().execute(
+                    f"SELECT row, id, payload FROM payloads WHERE row IN ({placeholders})",
+                    chunk,
+                )
+            )
+        return found
+
+    def rows(self, start_row: int = 0) -> np.ndarray:
+        """Index rows of live memories at or after `start_row`, in ascending order."""
+        return np.fromiter(
+            (
+                row
+                for (row,) in self._reader().execute(
+                    "SELECT row FROM payloads WHERE row >= ? ORDER BY row",
+                    (int(start_row),),
+                )
+            ),
+            dtype=np.int64,
+        )
+
+    @staticmethod
+    def is_indexed(filters: Optional[Dict]) -> bool:
+        """Whether `select` can narrow the filters through an indexed column."""
+        return bool(_indexed_clauses(filters)[0])
+
+    def select(
+        self, filters: Optional[Dict] = None, after_row: Optional[int] = None
+    ) -> Iterator[Tuple[int, str, Dict]]:
+        """
+        Stream memories matching the indexed keys of the filters, in row order.
+
+        Filters on other keys, and on list or dict values, are not applied here. Rows are read
+        lazily, so a caller that stops after n memories only reads about n rows.
+
+        Args:
+            filters (Dict, optional): Filters to apply.
+            after_row (int, optional): Only stream memories after this row. Used as a pagination cursor.
+
+        Yields:
+            tuple: (row, id, payload) of each matching memory.
+        """
+        clauses, params = _indexed_clauses(filters)
+        if after_row is not None:
+            clauses.append("row > ?")
+            params.append(int(after_row))
+        query = "SELECT row, id, payload FROM payloads"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        cursor = self._reader().execute(query + " ORDER BY row", params)
+        try:
+            for row, vector_id, payload in cursor:
+                yield row, vector_id, json.loads(payload)
+        finally:
+            # Release the read snapshot even when the caller stops early
+            cursor.close()
+
+    def count(self) -> int:
+        return self._reader().execute("SELECT COUNT(*) FROM payloads").fetchone()[0]
+
+    def reset(self) -> None:
+        """Delete every payload."""
+        with self._lock:
+            self.connection.execute("DELETE FROM payloads")
+            self.connection.execute("DELETE FROM meta")
+
+    def close(self) -> None:
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
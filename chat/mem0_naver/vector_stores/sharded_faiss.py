@@ -0,0 +1,667 @@
+import hashlib
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from mem0_naver.vector_stores.base import VectorStoreBase
+from mem0_naver.vector_stores.faiss import FAISS, OutputData, get_index_type
+from mem0_naver.vector_stores.payload_store import chunked
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD = "default"  # memories whose payload has no shard key
+
+_SHARD_NAME = re.compile(r"key-[0-9a-f]{16}|bucket-\d{4}|" + DEFAULT_SHARD)
+# Payload store connections, file handles and FAISS bookkeeping of an open shard
+_SHARD_OVERHEAD_BYTES = 256 * 1024
+
+
+def estimate_memory(store: FAISS) -> int:
+    """
+    Estimate the bytes a loaded FAISS store keeps in memory.
+
+    Args:
+        store (FAISS): Loaded store.
+
+    Returns:
+        int: Estimated size of its index, ID map and open resources.
+    """
+    if store.index is None:
+        return _SHARD_OVERHEAD_BYTES
+    try:
+        code_size = store.index.sa_code_size()
+    except RuntimeError:
+        # HNSW graphs do not report a code size
+        code_size = store.embedding_model_dims * 4
+    bytes_per_vector = code_size + 16  # ID map entry in both directions
+    if get_index_type(store.index) == "hnsw":
+        bytes_per_vector += store.hnsw_m * 2 * 4
+    return store.index.ntotal * bytes_per_vector + _SHARD_OVERHEAD_BYTES
+
+
+def _close_shard(store: FAISS):
+    store.close()
+    if store.payloads is not None:
+        store.payloads.close()
+        store.payloads = None
+
+
+class _ShardDirectory:
+    """SQLite table mapping each memory ID to the shard holding it."""
+
+    def __init__(self, db_path: str):
+        self.connection = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS shards (id TEXT PRIMARY KEY, shard TEXT NOT NULL)"
+            )
+
+    def put_many(self, ids: List[str], shards: List[str]) -> None:
+        with self._lock:
+            try:
+                self.connection.execute("BEGIN")
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO shards VALUES (?, ?)", zip(ids, shards)
+                )
+                self.connection.execute("COMMIT")
+            except Exception as e:
+                self.connection.execute("ROLLBACK")
+                logger.error(f"Failed to write shard directory: {e}")
+                raise
+
+    def get_many(self, ids: List[str]) -> Dict[str, str]:
+        found = {}
+        with self._lock:
+            for chunk in chunked(list(ids)):
+                placeholders = ", ".join("?" * len(chunk))
+                found.update(
+                    self.connection.execute(
+                        f"SELECT id, shard FROM shards WHERE id IN ({placeholders})",
+                        chunk,
+                    )
+                )
+        return found
+
+    def get(self, vector_id: str) -> Optional[str]:
+        return self.get_many([vector_id]).get(vector_id)
+
+    def delete(self, vector_id: str) -> None:
+        with self._lock:
+            self.connection.execute("DELETE FROM shards WHERE id = ?", (vector_id,))
+
+    def count(self) -> int:
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM shards").fetchone()[0]
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connection.execute("DELETE FROM shards")
+
+    def close(self) -> None:
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+
+class ShardedFAISS(VectorStoreBase):
+    """
+    FAISS collection split into small collections, one per value of a payload key such as the user.
+
+    Shards are opened on first access and closed again, least recently used first, once the open
+    ones exceed a memory budget, so memory follows the active users instead of every user. Searches
+    and listings filtered on the shard key open a single shard; lookups by memory ID go through a
+    directory of the shard each memory lives in.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        path: Optional[str] = None,
+        shard_key: str = "user_id",
+        num_shards: Optional[int] = None,
+        memory_budget_mb: float = 512.0,
+        **faiss_config,
+    ):
+        """
+        Initialize the sharded FAISS vector store.
+
+        Args:
+            collection_name (str): Name of the collection.
+            path (str, optional): Directory holding the shards. Defaults to None.
+            shard_key (str, optional): Payload key that picks the shard of a memory. Defaults to "user_id".
+            num_shards (int, optional): Number of hash buckets the shard key values are spread over. None gives
+                every value its own shard. Defaults to None.
+            memory_budget_mb (float, optional): Estimated memory the open shards may use before the least
+                recently used ones are closed. Defaults to 512.0.
+            **faiss_config: Arguments of the `FAISS` store of each shard.
+        """
+        self.collection_name = collection_name
+        self.path = path or f"/tmp/faiss/{collection_name}"
+        self.shard_key = shard_key
+        self.num_shards = num_shards
+        self.memory_budget_mb = memory_budget_mb
+        self.faiss_config = faiss_config
+        self.embedding_model_dims = faiss_config.get("embedding_model_dims", 1024)
+        self.distance_strategy = faiss_config.get("distance_strategy", "euclidean")
+
+        self._shards: "OrderedDict[str, FAISS]" = (
+            OrderedDict()
+        )  # least recently used first
+        self._in_use: Dict[str, int] = {}
+        # Shards being opened, so other callers wait for that shard only
+        self._loading: Dict[str, threading.Event] = {}
+        self._shards_lock = threading.Lock()
+
+        os.makedirs(self.path, exist_ok=True)
+        self.directory = _ShardDirectory(self._get_directory_path())
+        self._migrate_unsharded()
+
+    def _get_directory_path(self) -> str:
+        return f"{self.path}/{self.collection_name}.shards.db"
+
+    def _shard_name(self, value) -> str:
+        if value is None:
+            return DEFAULT_SHARD
+        digest = hashlib.md5(str(value).encode()).hexdigest()
+        if self.num_shards:
+            return f"bucket-{int(digest, 16) % self.num_shards:04d}"
+        return f"key-{digest[:16]}"
+
+    def _shard_path(self, name: str) -> str:
+        return f"{self.path}/{name}"
+
+    def _list_shards(self) -> List[str]:
+        """Names of the shards on disk."""
+        return sorted(
+            name
+            for name in os.listdir(self.path)
+            if _SHARD_NAME.fullmatch(name) and os.path.isdir(self._shard_path(name))
+        )
+
+    def _route(self, filters: Optional[Dict]) -> List[str]:
+        """Shards that can hold memories matching the filters."""
+        value = (filters or {}).get(self.shard_key)
+        if value is None:
+            return self._list_shards()
+        values = value if isinstance(value, list) else [value]
+        return sorted({self._shard_name(v) for v in values})
+
+    @contextmanager
+    def _shard(self, name: str, create: bool = False):
+        """
+        Use a shard, opening it if needed. A shard in use is never closed by eviction.
+
+        Args:
+            name (str): Shard name.
+            create (bool, optional): Create the shard if it does not exist. Otherwise a missing shard
+                yields None. Defaults to False.
+        """
+        store = self._acquire(name, create)
+        if store is None:
+            yield None
+            return
+        try:
+            yield store
+        finally:
+            with self._shards_lock:
+                self._in_use[name] -= 1
+                if not self._in_use[name]:
+                    del self._in_use[name]
+
+    def _acquire(self, name: str, create: bool) -> Optional[FAISS]:
+        """
+        Mark a shard as in use, opening it if needed.
+
+        A shard is loaded outside the lock on the open shards, so opening a cold shard only makes
+        callers of that same shard wait.
+        """
+        while True:
+            with self._shards_lock:
+                store = self._shards.get(name)
+                if store is not None:
+                    self._shards.move_to_end(name)
+                    self._in_use[name] = self._in_use.get(name, 0) + 1
+                    self._evict()
+                    return store
+                loading = self._loading.get(name)
+                if loading is None:
+                    if not (create or os.path.isdir(self._shard_path(name))):
+                        return None
+                    loading = self._loading[name] = threading.Event()
+                    break
+            # Another caller is opening the shard; check again once it is done
+            loading.wait()
+
+        store = None
+        try:
+            store = FAISS(
+                collection_name=self.collection_name,
+                path=self._shard_path(name),
+                **self.faiss_config,
+            )
+            logger.debug(f"Opened shard {name} of {self.collection_name}")
+        finally:
+            with self._shards_lock:
+                del self._loading[name]
+                if store is not None:
+                    self._shards[name] = store
+                    self._in_use[name] = self._in_use.get(name, 0) + 1
+                    self._evict()
+            loading.set()
+        return store
+
+    def _evict(self):
+        """Close least recently used shards while the open ones exceed the memory budget."""
+        budget = self.memory_budget_mb * 1024 * 1024
+        usage = {name: estimate_memory(store) for name, store in self._shards.items()}
+        total = sum(usage.values())
+        for name in list(self._shards):
+            if total <= budget:
+                break
+            store = self._shards[name]
+            # Background rebuilds and compactions still write the snapshot and payload store
+            if self._in_use.get(name) or store._rebuilding or store._compacting:
+                continue
+            del self._shards[name]
+            _close_shard(store)
+            total -= usage[name]
+            logger.debug(f"Closed shard {name} of {self.collection_name}")
+
+    def loaded_shards(self) -> Dict[str, int]:
+        """
+        Get the open shards and their estimated memory use.
+
+        Returns:
+            Dict[str, int]: Estimated bytes of each open shard, least recently used first.
+        """
+        with self._shards_lock:
+            return {
+                name: estimate_memory(store) for name, store in self._shards.items()
+            }
+
+    def _migrate_unsharded(self):
+        """Split a collection written by the unsharded FAISS store at `path` into shards."""
+        legacy = FAISS.__new__(FAISS)
+        legacy.collection_name = self.collection_name
+        legacy.path = self.path
+        if not legacy._snapshot_generations():
+            return
+
+        logger.info(f"Splitting FAISS collection {self.collection_name} into shards")
+        legacy = FAISS(
+            collection_name=self.collection_name, path=self.path, **self.faiss_config
+        )
+        moved = 0
+        for ids, vectors, payloads in legacy.export():
+            self.insert(vectors, payloads, ids)
+            moved += len(ids)
+        legacy.delete_col()
+        logger.info(
+            f"Moved {moved} memories of {self.collection_name} into {len(self._list_shards())} shards"
+        )
+
+    def create_col(self, name: str, distance: str = None):
+        """
+        Create a new collection. Its shards are created with their first memory.
+
+        Args:
+            name (str): Name of the collection.
+            distance (str, optional): Distance metric to use. Overrides the distance_strategy
+                passed during initialization. Defaults to None.
+
+        Returns:
+            self: The ShardedFAISS instance.
+        """
+        self.collection_name = name
+        if distance:
+            self.distance_strategy = distance
+            self.faiss_config["distance_strategy"] = distance
+        return self
+
+    def insert(
+        self,
+        vectors: List[list],
+        payloads: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None,
+    ):
+        """
+        Insert vectors into the shards their payloads belong to.
+
+        Args:
+            vectors (List[list]): List of vectors to insert.
+            payloads (Optional[List[Dict]], optional): List of payloads corresponding to vectors. Defaults to None.
+            ids (Optional[List[str]], optional): List of IDs corresponding to vectors. Defaults to None.
+        """
+        if ids is None:
+            ids = [str(uuid.uuid4()) for _ in range(len(vectors))]
+        if payloads is None:
+            payloads = [{} for _ in range(len(vectors))]
+        if len(vectors) != len(ids) or len(vectors) != len(payloads):
+            raise ValueError("Vectors, payloads, and IDs must have the same length")
+
+        shards = [self._shard_name(payload.get(self.shard_key)) for payload in payloads]
+        shard_by_id = dict(zip(ids, shards))
+
+        # Re-inserted IDs whose shard key changed leave their old shard
+        for vector_id, previous in self.directory.get_many(list(ids)).items():
+            if previous != shard_by_id[vector_id]:
+                with self._shard(previous) as store:
+                    if store is not None:
+                        store.delete(vector_id)
+
+        # The directory is written first, so a crash leaves at most an entry without a memory
+        self.directory.put_many(list(ids), shards)
+        positions_by_shard: Dict[str, List[int]] = {}
+        for position, name in enumerate(shards):
+            positions_by_shard.setdefault(name, []).append(position)
+        for name, positions in positions_by_shard.items():
+            with self._shard(name, create=True) as store:
+                store.insert(
+                    [vectors[i] for i in positions],
+                    [payloads[i] for i in positions],
+                    [ids[i] for i in positions],
+                )
+
+    def _merge(self, result_lists: List[List[OutputData]], limit: Optional[int]):
+        """Merge results from several shards, best first."""
+        results = [result for results in result_lists for result in results]
+        results.sort(
+            key=lambda result: result.score,
+            reverse=self.distance_strategy.lower() != "euclidean",
+        )
+        return results if limit is None else results[:limit]
+
+    def search(
+        self,
+        query: str,
+        vectors: List[list],
+        limit: int = 5,
+        filters: Optional[Dict] = None,
+    ) -> List[OutputData]:
+        """
+        Search for similar vectors.
+
+        Args:
+            query (str): Query (not used, kept for API compatibility).
+            vectors (List[list]): List of vectors to search.
+            limit (int, optional): Number of results to return. Defaults to 5.
+            filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
+
+        Returns:
+            List[OutputData]: Search results.
+        """
+        return self.search_batch([vectors], limit=limit, filters=filters)[0]
+
+    def search_batch(
+        self,
+        vectors: List[list],
+        limit: int = 5,
+        filters: Optional[Dict] = None,
+    ) -> List[List[OutputData]]:
+        """
+        Search for similar vectors for several queries, in every shard the filters allow.
+
+        Args:
+            vectors (List[list]): Query vectors, one per query.
+            limit (int, optional): Number of results to return per query. Defaults to 5.
+            filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
+
+        Returns:
+            List[List[OutputData]]: Search results for each query, in input order.
+        """
+        per_shard = []
+        for name in self._route(filters):
+            with self._shard(name) as store:
+                if store is not None:
+                    per_shard.append(store.search_batch(vectors, limit, filters))
+        return [
+            self._merge([results[i] for results in per_shard], limit)
+            for i in range(len(vectors))
+        ]
+
+    def range_search(
+        self,
+        query: str,
+        vectors: List[float],
+        threshold: float,
+        limit: Optional[int] = None,
+        filters: Optional[Dict] = None,
+    ) -> List[OutputData]:
+        """
+        Search for every memory within a score threshold of the query. See `FAISS.range_search`.
+
+        Args:
+            query (str): Query (not used, kept for API compatibility).
+            vectors (List[float]): Query vector.
+            threshold (float): Score a memory must reach to be returned.
+            limit (Optional[int], optional): Maximum number of results to return. Defaults to None (no limit).
+            filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
+
+        Returns:
+            List[OutputData]: Matching memories, best first.
+        """
+        per_shard = []
+        for name in self._route(filters):
+            with self._shard(name) as store:
+                if store is not None:
+                    per_shard.append(
+                        store.range_search(query, vectors, threshold, limit, filters)
+                    )
+        return self._merge(per_shard, limit)
+
+    def find_by_hash(
+        self, hashes: List[str], filters: Optional[Dict] = None
+    ) -> Dict[str, str]:
+        """
+        Find memories by the MD5 hash of their text. See `FAISS.find_by_hash`.
+
+        Args:
+            hashes (List[str]): Hashes to look up.
+            filters (Optional[Dict], optional): Filters the memories must match, e.g. the user_id. Defaults to None.
+
+        Returns:
+            Dict[str, str]: Each hash that has a matching memory, mapped to the memory ID.
+        """
+        found = {}
+        for name in self._route(filters):
+            with self._shard(name) as store:
+                if store is not None:
+                    for content_hash, vector_id in store.find_by_hash(
+                        hashes, filters
+                    ).items():
+                        found.setdefault(content_hash, vector_id)
+        return found
+
+    def delete(self, vector_id: str):
+        """
+        Delete a vector by ID.
+
+        Args:
+            vector_id (str): ID of the vector to delete.
+        """
+        name = self.directory.get(vector_id)
+        if name is None:
+            logger.warning(
+                f"Vector {vector_id} not found in collection {self.collection_name}"
+            )
+            return
+        with self._shard(name) as store:
+            if store is not None:
+                store.delete(vector_id)
+        self.directory.delete(vector_id)
+
+    def update(
+        self,
+        vector_id: str,
+        vector: Optional[List[float]] = None,
+        payload: Optional[Dict] = None,
+    ):
+        """
+        Update a vector and its payload. A payload with a different shard key moves the memory to
+        the shard of the new value.
+
+        Args:
+            vector_id (str): ID of the vector to update.
+            vector (Optional[List[float]], optional): Updated vector. Defaults to None.
+            payload (Optional[Dict], optional): Updated payload. Defaults to None.
+        """
+        name = self.directory.get(vector_id)
+        if name is None:
+            raise ValueError(f"Vector {vector_id} not found")
+        target = (
+            name if payload is None else self._shard_name(payload.get(self.shard_key))
+        )
+        with self._shard(name) as store:
+            if store is None:
+                raise ValueError(f"Vector {vector_id} not found")
+            if target == name:
+                store.update(vector_id, vector, payload)
+                return
+            if vector is None:
+                vector = store.get_vector(vector_id)
+                if vector is None:
+                    raise ValueError(f"Vector {vector_id} not found")
+
+        # Re-inserting under the new shard key removes the memory from its old shard
+        self.insert([vector], [payload], [vector_id])
+
+    def get(self, vector_id: str) -> OutputData:
+        """
+        Retrieve a vector by ID.
+
+        Args:
+            vector_id (str): ID of the vector to retrieve.
+
+        Returns:
+            OutputData: Retrieved vector.
+        """
+        name = self.directory.get(vector_id)
+        if name is None:
+            return None
+        with self._shard(name) as store:
+            return store.get(vector_id) if store is not None else None
+
+    def list_cols(self) -> List[str]:
+        """
+        List all collections.
+
+        Returns:
+            List[str]: List of collection names.
+        """
+        return [self.collection_name]
+
+    def delete_col(self):
+        """
+        Delete a collection and all of its shards.
+        """
+        with self._shards_lock:
+            for store in self._shards.values():
+                _close_shard(store)
+            self._shards.clear()
+
+        try:
+            for name in self._list_shards():
+                shutil.rmtree(self._shard_path(name))
+            self.directory.reset()
+            logger.info(f"Deleted collection {self.collection_name}")
+        except Exception as e:
+            logger.warning(f"Failed to delete collection: {e}")
+
+    def col_info(self) -> Dict:
+        """
+        Get information about a collection.
+
+        Returns:
+            Dict: Collection information.
+        """
+        loaded = self.loaded_shards()
+        return {
+            "name": self.collection_name,
+            "count": self.directory.count(),
+            "shards": len(self._list_shards()),
+            "loaded_shards": len(loaded),
+            "loaded_bytes": sum(loaded.values()),
+            "memory_budget_mb": self.memory_budget_mb,
+            "dimension": self.embedding_model_dims,
+            "distance": self.distance_strategy,
+        }
+
+    def list(
+        self, filters: Optional[Dict] = None, limit: int = 100
+    ) -> List[List[OutputData]]:
+        """
+        List all vectors in a collection.
+
+        Args:
+            filters (Optional[Dict], optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Number of vectors to return. Defaults to 100.
+
+        Returns:
+            List[List[OutputData]]: List of vectors.
+        """
+        return [self.list_page(filters=filters, limit=limit)[0]]
+
+    def list_page(
+        self,
+        filters: Optional[Dict] = None,
+        limit: int = 100,
+        cursor: Optional[tuple] = None,
+    ):
+        """
+        List one page of memories, shard by shard.
+
+        Args:
+            filters (Optional[Dict], optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Number of memories per page. Defaults to 100.
+            cursor (tuple, optional): Cursor returned with the previous page. Defaults to None.
+
+        Returns:
+            tuple: (memories, cursor of the next page or None after the last page).
+        """
+        shards = self._route(filters)
+        start_shard, shard_cursor = cursor if cursor is not None else (None, None)
+
+        results = []
+        for name in shards:
+            if start_shard is not None and name < start_shard:
+                continue
+            if name != start_shard:
+                shard_cursor = None
+            with self._shard(name) as store:
+                if store is None:
+                    continue
+                page, shard_cursor = store.list_page(
+                    filters, limit - len(results), shard_cursor
+                )
+            results.extend(page)
+            if shard_cursor is not None:
+                return results, (name, shard_cursor)
+            if len(results) >= limit:
+                later = [shard for shard in shards if shard > name]
+                return results, (later[0], None) if later else None
+        return results, None
+
+    def reset(self):
+        """Reset the index by deleting and recreating it."""
+        logger.warning(f"Resetting index {self.collection_name}...")
+        self.delete_col()
+        self.create_col(self.collection_name)
+
+    def close(self):
+        """Flush pending writes of the open shards and release them. Call on shutdown."""
+        with self._shards_lock:
+            for store in self._shards.values():
+                _close_shard(store)
+            self._shards.clear()
+        self.directory.close()
@@ -7,6 +7,7 @@ from langchain_naver import ChatClovaX
 from .scoring import AAQScoring
 from .database import VectorDB
 from .router import Router
+from .scheduler import schedule
 from .memory import ShortTermMemory, LongTermMemory
 from .prompt import (
     SESSION_INSTRUCTION_PROMPTS,
@@ -24,8 +25,9 @@ from .utils import logger, extract_int, trim_str
 
 class CounselorAgent:
     def __init__(self, medical_db_path: str, legacy_db_path: str):
-        self.counselor_agent = ChatClovaX(
-            model="HCX-005", temperature=0.2, max_tokens=512
+        self.counselor_agent = schedule(
+            ChatClovaX(model="HCX-005", temperature=0.2, max_tokens=512),
+            "interactive",
         )
         self._agents: dict[str, SpecialistAgent] = {
             "MEDICAL": MedicalAgent(medical_db_path),
@@ -68,7 +70,7 @@ class CounselorAgent:
                 history=history,
                 user_input=query,
             )
-            for chunk in self.counselor_agent.stream(prompt):
+            async for chunk in self.counselor_agent.astream(prompt):
                 content = chunk.content
                 yield content
 
@@ -85,12 +87,14 @@ class SpecialistAgent(ABC):
 
 class MedicalAgent(SpecialistAgent):
     def __init__(self, medical_db_path: str):
-        self.llm = ChatClovaX(model="HCX-005", temperature=0, max_tokens=256)
+        self.llm = schedule(
+            ChatClovaX(model="HCX-005", temperature=0, max_tokens=256), "interactive"
+        )
         self.retriever = VectorDB(medical_db_path)
         self._default_return = ""
 
     async def ainvoke(self, query: str, history: str, user_info: str) -> str:
-        docs = self.retriever.search(query=query, k=4, use_keyword=False)
+        docs = await self.retriever.asearch(query=query, k=4)
 
         try:
             prompt = medical_agent_template.format_messages(
@@ -110,12 +114,14 @@ class MedicalAgent(SpecialistAgent):
 
 class LegacyAgent(SpecialistAgent):
     def __init__(self, legacy_db_path: str):
-        self.llm = ChatClovaX(model="HCX-005", temperature=0, max_tokens=256)
+        self.llm = schedule(
+            ChatClovaX(model="HCX-005", temperature=0, max_tokens=256), "interactive"
+        )
         self.retriever = VectorDB(legacy_db_path)
         self._default_return = ""
 
     async def ainvoke(self, query: str, history: str, user_info: str) -> str:
-        docs = self.retriever.search(query=query, k=1, use_keyword=False)
+        docs = await self.retriever.asearch(query=query, k=1)
 
         try:
             prompt = legacy_agent_template.format_messages(
@@ -135,7 +141,9 @@ class LegacyAgent(SpecialistAgent):
 
 class CulturalAgent(SpecialistAgent):
     def __init__(self):
-        self.llm = ChatClovaX(model="HCX-005", temperature=0, max_tokens=256)
+        self.llm = schedule(
+            ChatClovaX(model="HCX-005", temperature=0, max_tokens=256), "interactive"
+        )
         self._default_return = ""
 
     async def ainvoke(self, query: str, history: str, user_info: str) -> str:
@@ -154,7 +162,9 @@ class CulturalAgent(SpecialistAgent):
 
 class EscalationAgent(SpecialistAgent):
     def __init__(self):
-        self.llm = ChatClovaX(model="HCX-005", temperature=0, max_tokens=4)
+        self.llm = schedule(
+            ChatClovaX(model="HCX-005", temperature=0, max_tokens=4), "safety"
+        )
         self.message = "지금 매우 힘든 상황이시군요. 즉시 전문가와 상담해 주세요."
         self._default_return = 0
 
@@ -179,7 +189,9 @@ class EscalationAgent(SpecialistAgent):
 
 class ACPAgent(SpecialistAgent):
     def __init__(self):
-        self.llm = ChatClovaX(model="HCX-005", temperature=0, max_tokens=256)
+        self.llm = schedule(
+            ChatClovaX(model="HCX-005", temperature=0, max_tokens=256), "interactive"
+        )
         self._default_return = ""
 
     async def ainvoke(self, query: str, history: str, user_info: str) -> str:
@@ -198,7 +210,9 @@ class ACPAgent(SpecialistAgent):
 
 class MonitorAgent(SpecialistAgent):
     def __init__(self):
-        self.llm = ChatClovaX(model="HCX-005", temperature=0, max_tokens=4)
+        self.llm = schedule(
+            ChatClovaX(model="HCX-005", temperature=0, max_tokens=4), "interactive"
+        )
         self.session_transition = {
             "SETTING": "PERCEPTION",
             "PERCEPTION": "EMOTION",
@@ -255,6 +269,9 @@ class ContextAgent:
         await self.stm[session_id].shutdown()
         self.stm.pop(session_id, None)
 
+    async def close(self):
+        await self.ltm.close()
+
     async def add_message(
         self, session_id: str, user_id: str, user_msg: str, ai_msg: str
     ):
@@ -266,7 +283,10 @@ class ContextAgent:
 
         await self.stm[session_id].add_user_message(user_msg)
         await self.stm[session_id].add_ai_message(ai_msg)
-        await self.ltm.add(content=user_msg, user_id=user_id)
+        self.ltm.enqueue(user_msg, user_id)
+
+    async def flush_ltm(self, user_id: str):
+        await self.ltm.flush(user_id)
 
     def get_stm(self, session_id: str) -> list:
         session_stm = self.stm.get(session_id, None)
@@ -274,9 +294,13 @@ class ContextAgent:
             return []
         return session_stm.get_history()
 
-    async def get_ltm(self, user_id: str, query: str = None, k: int = 3) -> list[str]:
+    async def get_ltm(
+        self, user_id: str, query: str = None, k: int = 3, threshold: float = None
+    ) -> list[str]:
         if query is None:
             all_ltm = await self.ltm.get(user_id)
             return all_ltm
-        related_ltm = await self.ltm.search(query, user_id, limit=k)
+        related_ltm = await self.ltm.search(
+            query, user_id, limit=k, threshold=threshold
+        )
         return related_ltm
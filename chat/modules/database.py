@@ -1,20 +1,156 @@
 import os
+import pickle
+import asyncio
 import sqlite3
+import threading
+from collections.abc import Mapping
 
+import faiss
 import numpy as np
+from langchain_community.docstore.base import Docstore
 from langchain_community.vectorstores import FAISS
 from langchain.docstore.document import Document
 from langchain_naver import ClovaXEmbeddings
 
-from .utils import logger
+from mem0_naver.embeddings.cache import CachedEmbeddings, get_embedding_cache
+from mem0_naver.vector_stores.faiss import (
+    create_index,
+    exact_top_k,
+    mmap_flag,
+    recall_at_k,
+    set_search_params,
+)
+from .utils import (
+    logger,
+    EMBEDDING_CACHE_PATH,
+    RAG_INDEX_TYPE,
+    RAG_VECTOR_ENCODING,
+    RAG_RERANK_FACTOR,
+    RAG_MMAP,
+)
+from .scheduler import schedule
 
 
-class VectorDB:
+class PagedDocstore(Docstore, Mapping):
+    """Read-only view of a LangChain FAISS `index.pkl` that reads documents from SQLite on demand.
+
+    Serves both as the docstore and as `index_to_docstore_id`, so nothing is unpickled at startup
+    and processes on one host share the file through the page cache.
+    """
+
     def __init__(self, faiss_dir: str):
-        self.embedding_model = ClovaXEmbeddings(
-            model="bge-m3",
+        self.db_path = os.path.join(faiss_dir, "index.docs.db")
+        pkl_path = os.path.join(faiss_dir, "index.pkl")
+        source = self._source_signature(pkl_path)
+
+        if self._read_signature() != source:
+            self._convert(pkl_path, source)
+
+        self.__conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False
+        )
+
+    @staticmethod
+    def _source_signature(pkl_path: str) -> str:
+        stat = os.stat(pkl_path)
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _read_signature(self) -> str | None:
+        if not os.path.exists(self.db_path):
+            return None
+        try:
+            with sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True) as conn:
+                row = conn.execute(
+                    "SELECT value FROM meta WHERE key = 'source'"
+                ).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error:
+            return None
+
+    def _convert(self, pkl_path: str, source: str):
+        with open(pkl_path, "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+
+        tmp_path = f"{self.db_path}.{os.getpid()}.tmp"
+        conn = sqlite3.connect(tmp_path)
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute(
+            """
+                CREATE TABLE documents (
+                    row INTEGER PRIMARY KEY,
+                    doc_id TEXT NOT NULL UNIQUE,
+                    document BLOB NOT NULL
+                )
+            """
+        )
+        conn.executemany(
+            "INSERT INTO documents (row, doc_id, document) VALUES (?, ?, ?)",
+            (
+                (int(row), doc_id, pickle.dumps(docstore.search(doc_id)))
+                for row, doc_id in index_to_docstore_id.items()
+            ),
         )
-        if os.path.exists(os.path.join(faiss_dir, "index.faiss")):
+        conn.execute("INSERT INTO meta (key, value) VALUES ('source', ?)", (source,))
+        conn.commit()
+        conn.close()
+        os.replace(tmp_path, self.db_path)
+        logger.info(
+            f"[PagedDocstore] Converted {len(index_to_docstore_id)} documents to {self.db_path}"
+        )
+
+    def search(self, search: str) -> str | Document:
+        row = self.__conn.execute(
+            "SELECT document FROM documents WHERE doc_id = ?", (search,)
+        ).fetchone()
+        if row is None:
+            return f"ID {search} not found."
+        return pickle.loads(row[0])
+
+    def __getitem__(self, row: int) -> str:
+        result = self.__conn.execute(
+            "SELECT doc_id FROM documents WHERE row = ?", (int(row),)
+        ).fetchone()
+        if result is None:
+            raise KeyError(row)
+        return result[0]
+
+    def __iter__(self):
+        for (row,) in self.__conn.execute("SELECT row FROM documents ORDER BY row"):
+            yield row
+
+    def __len__(self) -> int:
+        return self.__conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        self.__conn.close()
+
+
+class VectorDB:
+    def __init__(
+        self,
+        faiss_dir: str,
+        index_type: str = RAG_INDEX_TYPE,
+        vector_encoding: str = RAG_VECTOR_ENCODING,
+        rerank_factor: int = RAG_RERANK_FACTOR,
+        mmap: bool = RAG_MMAP,
+    ):
+        self.embedding_model = schedule(ClovaXEmbeddings(model="bge-m3"), "interactive")
+        if EMBEDDING_CACHE_PATH:
+            self.embedding_model = CachedEmbeddings(
+                self.embedding_model, get_embedding_cache(EMBEDDING_CACHE_PATH)
+            )
+        self.mmap = mmap
+        if os.path.exists(os.path.join(faiss_dir, "index.faiss")) and mmap:
+            docstore = PagedDocstore(faiss_dir)
+            self.index = FAISS(
+                self.embedding_model,
+                faiss.read_index(
+                    os.path.join(faiss_dir, "index.faiss"), mmap_flag("flat")
+                ),
+                docstore,
+                docstore,
+            )
+        elif os.path.exists(os.path.join(faiss_dir, "index.faiss")):
             self.index = FAISS.load_local(
                 faiss_dir,
                 embeddings=self.embedding_model,
@@ -25,6 +161,112 @@ class VectorDB:
             logger.warning(f"{faiss_dir} not Found.")
 
         self.faiss_dir = faiss_dir
+        self.rerank_factor = rerank_factor
+        self._vectors = None  # full-precision vectors for re-ranking
+        self._ann_builder = None
+
+        if self.index is not None and (
+            index_type != "flat" or vector_encoding != "float32"
+        ):
+            self._use_ann_index(index_type, vector_encoding)
+
+    def _use_ann_index(self, index_type: str, vector_encoding: str = "float32"):
+        # Vectors keep their positions, so `index_to_docstore_id` stays valid.
+        flat_index = self.index.index
+        suffix = index_type
+        if vector_encoding != "float32":
+            suffix = f"{index_type}.{vector_encoding}"
+        ann_path = os.path.join(self.faiss_dir, f"index.{suffix}.faiss")
+        rerank = bool(self.rerank_factor) and vector_encoding != "float32"
+
+        if os.path.exists(ann_path) and (
+            not rerank or self._load_full_vectors(flat_index.ntotal)
+        ):
+            if self.mmap:
+                ann_index = faiss.read_index(ann_path, mmap_flag(index_type))
+            else:
+                ann_index = faiss.read_index(ann_path)
+            if ann_index.ntotal == flat_index.ntotal:
+                set_search_params(ann_index)
+                self.index.index = ann_index
+                return
+
+        # Building reads every vector, so searches use the flat index until it is done.
+        self._ann_builder = threading.Thread(
+            target=self._build_ann_index,
+            args=(flat_index, index_type, vector_encoding, ann_path, rerank),
+            daemon=True,
+        )
+        self._ann_builder.start()
+
+    def _build_ann_index(
+        self,
+        flat_index,
+        index_type: str,
+        vector_encoding: str,
+        ann_path: str,
+        rerank: bool,
+    ):
+        try:
+            vectors = flat_index.reconstruct_n(0, flat_index.ntotal)
+            if rerank:
+                self._save_full_vectors(vectors)
+            ann_index = create_index(
+                index_type,
+                flat_index.d,
+                flat_index.metric_type,
+                num_vectors=flat_index.ntotal,
+                vector_encoding=vector_encoding,
+            )
+            if not ann_index.is_trained:
+                ann_index.train(vectors)
+            ann_index.add(vectors)
+            set_search_params(ann_index)
+            recall = recall_at_k(ann_index, vectors)
+            faiss.write_index(ann_index, ann_path)
+        except Exception as e:
+            logger.error(f"[VectorDB] Failed to build {ann_path}: {e}")
+            return
+
+        self.index.index = ann_index
+        logger.info(
+            f"[VectorDB] Built {os.path.basename(ann_path)} for {self.faiss_dir} (recall@10: {recall:.4f})"
+        )
+
+    def _load_full_vectors(self, num_vectors: int) -> bool:
+        # Memory-mapped, so only the pages of re-ranked candidates are read.
+        vectors_path = os.path.join(self.faiss_dir, "index.vectors.npy")
+        if os.path.exists(vectors_path):
+            vectors = np.load(vectors_path, mmap_mode="r")
+            if len(vectors) == num_vectors:
+                self._vectors = vectors
+                return True
+        return False
+
+    def _save_full_vectors(self, vectors: np.ndarray):
+        vectors_path = os.path.join(self.faiss_dir, "index.vectors.npy")
+        np.save(vectors_path, vectors)
+        self._vectors = np.load(vectors_path, mmap_mode="r")
+
+    def _rerank_search(self, query_vec: np.ndarray, k: int) -> list[Document]:
+        query_vec = query_vec.reshape(1, -1)
+        _, indices = self.index.index.search(query_vec, k * self.rerank_factor)
+        # Sorted rows read the memory-mapped file sequentially
+        rows = np.sort(indices[0][indices[0] != -1])
+        if not len(rows):
+            return []
+
+        _, positions = exact_top_k(
+            query_vec,
+            np.asarray(self._vectors[rows]),
+            k,
+            self.index.index.metric_type,
+        )
+        rows = rows[positions[0]]
+        return [
+            self.index.docstore.search(self.index.index_to_docstore_id[int(row)])
+            for row in rows
+        ]
 
     def search(self, query: str, k: int = 3) -> list[Document]:
         if self.index is None:
@@ -34,12 +276,31 @@ class VectorDB:
             query_vec = np.array(
                 self.embedding_model.embed_query(query), dtype=np.float32
             )
-            query_vec /= np.linalg.norm(query_vec)
-            return self.index.similarity_search_by_vector(query_vec, k=k)
+            return self._search_by_vector(query_vec, k)
+        except Exception as e:
+            logger.error(f"[VectorDB] {e}")
+            return []
+
+    async def asearch(self, query: str, k: int = 3) -> list[Document]:
+        """`search` for the event loop: awaits the embedding and runs FAISS in a worker thread."""
+        if self.index is None:
+            return []
+
+        try:
+            query_vec = np.array(
+                await self.embedding_model.aembed_query(query), dtype=np.float32
+            )
+            return await asyncio.to_thread(self._search_by_vector, query_vec, k)
         except Exception as e:
             logger.error(f"[VectorDB] {e}")
             return []
 
+    def _search_by_vector(self, query_vec: np.ndarray, k: int) -> list[Document]:
+        query_vec /= np.linalg.norm(query_vec)
+        if self._vectors is not None:
+            return self._rerank_search(query_vec, k)
+        return self.index.similarity_search_by_vector(query_vec, k=k)
+
 
 class UserSessionDB:
     def __init__(self, db_path):
@@ -5,15 +5,41 @@ from langchain.schema import AIMessage, BaseMessage
 from langchain.memory import ConversationBufferMemory
 
 from mem0_naver import AsyncMemory
-from .utils import logger, format_chat_history
+from mem0_naver.memory.telemetry import metrics
+from .utils import (
+    logger,
+    format_chat_history,
+    EMBEDDING_CACHE_PATH,
+    LTM_FLUSH_INTERVAL,
+    LTM_FLUSH_TURNS,
+    LTM_MAX_CONCURRENT_FLUSHES,
+    LTM_FACT_PREFILTER,
+    LTM_FUSED_EXTRACTION,
+)
 from .prompt import short_term_summarize_template
+from .scheduler import schedule, llm_priority
 
 
 class LongTermMemory:
-    def __init__(self, vector_store_path: str) -> None:
+    def __init__(
+        self,
+        vector_store_path: str,
+        flush_interval: float = LTM_FLUSH_INTERVAL,
+        flush_turns: int = LTM_FLUSH_TURNS,
+        max_concurrent_flushes: int = LTM_MAX_CONCURRENT_FLUSHES,
+    ) -> None:
         self.memory: AsyncMemory = None
         self.vector_store_path = vector_store_path
 
+        # Write-behind ingestion: turns wait per user and are added in one batch
+        self.flush_interval = flush_interval
+        self.flush_turns = flush_turns
+        self._pending: dict[str, list[str]] = {}
+        self._timers: dict[str, asyncio.Task] = {}
+        self._user_locks: dict[str, asyncio.Lock] = {}
+        self._flush_tasks: set[asyncio.Task] = set()
+        self._flush_slots = asyncio.Semaphore(max_concurrent_flushes)
+
     @classmethod
     async def create(
         cls, vector_store_path: str = "./db/faiss_ltm"
@@ -22,23 +48,43 @@ class LongTermMemory:
         config = {
             "llm": {
                 "provider": "langchain",
-                "config": {"model": ChatClovaX(model="HCX-005", temperature=0)},
+                "config": {
+                    "model": schedule(
+                        ChatClovaX(model="HCX-005", temperature=0), "background"
+                    )
+                },
             },
             "embedder": {
                 "provider": "langchain",
-                "config": {"model": ClovaXEmbeddings(model="clir-emb-dolphin")},
+                "config": {
+                    # Searches answer the user; ingestion runs as background in `flush`
+                    "model": schedule(
+                        ClovaXEmbeddings(model="clir-emb-dolphin"), "interactive"
+                    ),
+                    "cache_path": EMBEDDING_CACHE_PATH,
+                },
                 "embedding_dims": 1024,
             },
             "vector_store": {
-                "provider": "faiss",
+                "provider": "sharded_faiss",
                 "config": {
                     "collection_name": "ltm",
                     "distance_strategy": "inner_product",
                     "path": instance.vector_store_path,
                     "embedding_model_dims": 1024,
+                    "mmap": True,
+                    "shard_key": "user_id",
+                    "memory_budget_mb": 256.0,
                 },
             },
             "version": "v1.1",
+            # 'enforce' skips content-free turns, 'shadow' only measures the gate, 'off' disables it
+            "fact_prefilter": {
+                "enabled": LTM_FACT_PREFILTER != "off",
+                "mode": "shadow" if LTM_FACT_PREFILTER == "shadow" else "enforce",
+            },
+            # One LLM call per batch for fact extraction and memory actions
+            "fused_extraction": LTM_FUSED_EXTRACTION,
         }
         instance.memory = await AsyncMemory.from_config(config)
         logger.debug(f"Initialized LTM at {vector_store_path}.")
@@ -57,7 +103,65 @@ class LongTermMemory:
                 f"[{self.__class__.__name__}] Not able to `add` in LTM: {e} ({user_id})"
             )
 
-    async def search(self, query: str, user_id: str, limit: int = 3) -> list[str]:
+    def enqueue(self, content: str, user_id: str):
+        """Queue a turn to be added with the other pending turns of the user."""
+        pending = self._pending.setdefault(user_id, [])
+        pending.append(content)
+
+        if len(pending) >= self.flush_turns:
+            timer = self._timers.pop(user_id, None)
+            if timer is not None:
+                timer.cancel()
+            self._spawn(self.flush(user_id))
+        elif user_id not in self._timers:
+            self._timers[user_id] = self._spawn(self._flush_later(user_id))
+
+    def _spawn(self, coroutine) -> asyncio.Task:
+        task = asyncio.create_task(coroutine)
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+        return task
+
+    async def _flush_later(self, user_id: str):
+        await asyncio.sleep(self.flush_interval)
+        # Leave `_timers` before flushing, so only sleeping timers are ever cancelled
+        self._timers.pop(user_id, None)
+        await self.flush(user_id)
+
+    async def flush(self, user_id: str):
+        """Add every pending turn of a user as one batch."""
+        timer = self._timers.pop(user_id, None)
+        if timer is not None:
+            timer.cancel()
+
+        # One flush per user at a time keeps batches in the order of their turns
+        lock = self._user_locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            turns = self._pending.pop(user_id, [])
+            if not turns:
+                return
+            async with self._flush_slots:
+                metrics.observe(
+                    "ltm.flush.turns", len(turns), buckets=(1, 2, 4, 8, 16, 32)
+                )
+                logger.debug(f"Flushing {len(turns)} turns to LTM ({user_id})")
+                # Ingestion embeddings wait behind the searches answering users
+                with llm_priority("background"):
+                    await self.add(
+                        [{"role": "user", "content": turn} for turn in turns], user_id
+                    )
+
+    async def flush_all(self):
+        """Add the pending turns of every user and wait for running flushes."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        await asyncio.gather(*(self.flush(user_id) for user_id in list(self._pending)))
+        await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    async def search(
+        self, query: str, user_id: str, limit: int = 3, threshold: float = None
+    ) -> list[str]:
         if not self.memory:
             logger.error(
                 "Memory not initialized. Call `LongTermMemory.create()` first."
@@ -66,7 +170,7 @@ class LongTermMemory:
 
         try:
             retrieved = await self.memory.search(
-                query=query, limit=limit, user_id=user_id
+                query=query, limit=limit, user_id=user_id, threshold=threshold
             )
         except Exception as e:
             logger.error(f"[{self.__class__.__name__}] {e}")
@@ -98,10 +202,20 @@ class LongTermMemory:
             parsed = [data["memory"] for data in parsed]
         return parsed
 
+    async def close(self):
+        if not self.memory:
+            return
+        await self.flush_all()
+        # Persist write-ahead log records still waiting for a group commit
+        await asyncio.to_thread(self.memory.vector_store.close)
+
 
 class ShortTermMemory:
     def __init__(self):
-        self.llm = ChatClovaX(model="HCX-DASH-002", temperature=0, max_tokens=256)
+        self.llm = schedule(
+            ChatClovaX(model="HCX-DASH-002", temperature=0, max_tokens=256),
+            "background",
+        )
         self.memory = ConversationBufferMemory()
         self.summary = None
         self.memory_buffer_limit = 20
@@ -9,12 +9,15 @@ from langchain_naver import ChatClovaX
 from langchain.schema.messages import BaseMessage
 
 from .utils import logger, extract_int
+from .scheduler import schedule
 from .prompt import ROUTING_PROMPTS, routing_template
 
 
 class Router:
     def __init__(self):
-        self.routing_llm = ChatClovaX(model="HCX-DASH-002", temperature=0, max_tokens=4)
+        self.routing_llm = schedule(
+            ChatClovaX(model="HCX-DASH-002", temperature=0, max_tokens=4), "interactive"
+        )
         self._states = [
             "MEDICAL",
             "LEGACY",
@@ -0,0 +1,454 @@
+import time
+import random
+import asyncio
+import heapq
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_core.messages import BaseMessage
+
+from mem0_naver.memory.telemetry import metrics
+from .utils import logger, CLOVA_RATE_LIMITS, CLOVA_MAX_RETRIES
+
+# Lower rank is served first
+PRIORITIES = {"interactive": 0, "safety": 1, "background": 2}
+
+_priority_override: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "llm_priority", default=None
+)
+
+
+@contextmanager
+def llm_priority(priority: str):
+    """Run every scheduled call made in the block, and in tasks it starts, with `priority`."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority: {priority}")
+    token = _priority_override.set(priority)
+    try:
+        yield
+    finally:
+        _priority_override.reset(token)
+
+
+@dataclass
+class RateLimit:
+    requests_per_second: float
+    burst: int
+    max_concurrency: int
+
+    @property
+    def max_background(self) -> int:
+        # Background work never holds every slot, so interactive calls always find one
+        return max(1, self.max_concurrency // 2)
+
+
+DEFAULT_RATE_LIMITS = {
+    "HCX-005": RateLimit(requests_per_second=4.0, burst=8, max_concurrency=8),
+    "HCX-DASH-002": RateLimit(requests_per_second=8.0, burst=16, max_concurrency=12),
+    "bge-m3": RateLimit(requests_per_second=16.0, burst=32, max_concurrency=16),
+    "clir-emb-dolphin": RateLimit(
+        requests_per_second=16.0, burst=32, max_concurrency=16
+    ),
+}
+FALLBACK_RATE_LIMIT = RateLimit(requests_per_second=4.0, burst=8, max_concurrency=8)
+
+
+def parse_rate_limits(spec: str) -> dict[str, RateLimit]:
+    """Parse `model=requests_per_second:burst:max_concurrency` entries separated by commas."""
+    limits = {}
+    for entry in filter(None, (entry.strip() for entry in spec.split(","))):
+        try:
+            model, values = entry.split("=")
+            rate, burst, concurrency = values.split(":")
+            limits[model.strip()] = RateLimit(float(rate), int(burst), int(concurrency))
+        except ValueError:
+            logger.warning(f"Ignoring invalid rate limit: '{entry}'")
+    return limits
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    return getattr(error, "status_code", None) == 429
+
+
+class _ModelBucket:
+    """Token bucket and in-flight count of one model, with its waiting calls in priority order."""
+
+    def __init__(self, limit: RateLimit):
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.in_flight = {priority: 0 for priority in PRIORITIES}
+        self.waiting: list[tuple[int, int]] = []
+
+    def try_acquire(self, ticket: tuple[int, int], priority: str) -> float:
+        """Take a token and a slot if `ticket` is first in line. Returns 0 then, else the seconds to wait."""
+        now = time.monotonic()
+        self.tokens = min(
+            self.limit.burst,
+            self.tokens + (now - self.updated) * self.limit.requests_per_second,
+        )
+        self.updated = now
+
+        if self.waiting[0] != ticket:
+            return 0.01
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        in_flight = sum(self.in_flight.values())
+        if in_flight >= self.limit.max_concurrency or (
+            priority == "background"
+            and self.in_flight["background"] >= self.limit.max_background
+        ):
+            return 0.01
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.limit.requests_per_second
+
+        self.tokens -= 1
+        self.in_flight[priority] += 1
+        heapq.heappop(self.waiting)
+        return 0.0
+
+
+class LLMScheduler:
+    """
+    Process-wide gate in front of the CLOVA Studio models.
+
+    Every call takes a token from the bucket of its model and one of its concurrent slots. Waiting
+    calls are served by priority class, interactive before safety before background, and in arrival
+    order within a class. A 429 pauses the whole model with exponential backoff before retrying.
+    The state is guarded by a thread lock, so calls from worker threads and the event loop share it.
+    """
+
+    def __init__(
+        self,
+        rate_limits: Optional[dict[str, RateLimit]] = None,
+        max_retries: int = CLOVA_MAX_RETRIES,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+    ):
+        self.rate_limits = {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._buckets: dict[str, _ModelBucket] = {}
+        self._lock = threading.Lock()
+        self._tickets = itertools.count()
+
+    def _bucket(self, model: str) -> _ModelBucket:
+        bucket = self._buckets.get(model)
+        if bucket is None:
+            bucket = self._buckets[model] = _ModelBucket(
+                self.rate_limits.get(model, FALLBACK_RATE_LIMIT)
+            )
+        return bucket
+
+    def _enqueue(self, model: str, priority: str) -> tuple[int, int]:
+        ticket = (PRIORITIES[priority], next(self._tickets))
+        with self._lock:
+            bucket = self._bucket(model)
+            heapq.heappush(bucket.waiting, ticket)
+            depth = len(bucket.waiting)
+        metrics.increment(f"llm_scheduler.{model}.{priority}.requests")
+        metrics.observe(
+            f"llm_scheduler.{model}.queue_depth",
+            depth,
+            buckets=(1, 2, 4, 8, 16, 32, 64),
+        )
+        return ticket
+
+    def _try_acquire(self, model: str, priority: str, ticket) -> float:
+        with self._lock:
+            return self._bucket(model).try_acquire(ticket, priority)
+
+    def _leave(self, model: str, ticket):
+        """Drop a ticket that gave up waiting, e.g. a cancelled task."""
+        with self._lock:
+            bucket = self._bucket(model)
+            if ticket in bucket.waiting:
+                bucket.waiting.remove(ticket)
+                heapq.heapify(bucket.waiting)
+
+    def _release(self, model: str, priority: str):
+        with self._lock:
+            self._bucket(model).in_flight[priority] -= 1
+
+    def _backoff(self, model: str, attempt: int) -> float:
+        """Pause the model after a 429 and return the delay before retrying."""
+        delay = min(self.max_delay, self.base_delay * 2**attempt)
+        delay *= random.uniform(0.5, 1.0)
+        with self._lock:
+            bucket = self._bucket(model)
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + delay)
+            bucket.tokens = 0.0
+        metrics.increment(f"llm_scheduler.{model}.rate_limited")
+        logger.warning(
+            f"[{self.__class__.__name__}] {model} is rate limited. Retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})"
+        )
+        return delay
+
+    def _resolve(self, priority: str) -> str:
+        return _priority_override.get() or priority
+
+    async def acquire(self, model: str, priority: str):
+        ticket = self._enqueue(model, priority)
+        start_time = time.perf_counter()
+        try:
+            while delay := self._try_acquire(model, priority, ticket):
+                await asyncio.sleep(min(delay, 0.05))
+        except BaseException:
+            self._leave(model, ticket)
+            raise
+        metrics.observe(
+            f"llm_scheduler.{model}.{priority}.wait.seconds",
+            time.perf_counter() - start_time,
+        )
+
+    def acquire_sync(self, model: str, priority: str):
+        """Blocking `acquire` for worker threads. Never call it on the event loop."""
+        ticket = self._enqueue(model, priority)
+        start_time = time.perf_counter()
+        try:
+            while delay := self._try_acquire(model, priority, ticket):
+                time.sleep(min(delay, 0.05))
+        except BaseException:
+            self._leave(model, ticket)
+            raise
+        metrics.observe(
+            f"llm_scheduler.{model}.{priority}.wait.seconds",
+            time.perf_counter() - start_time,
+        )
+
+    async def run(self, model: str, priority: str, func, *args, **kwargs):
+        """Await `func(*args, **kwargs)` once scheduled, retrying on 429."""
+        priority = self._resolve(priority)
+        for attempt in itertools.count():
+            await self.acquire(model, priority)
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                if not _is_rate_limited(e) or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(model, attempt)
+            finally:
+                self._release(model, priority)
+            await asyncio.sleep(delay)
+
+    def run_sync(self, model: str, priority: str, func, *args, **kwargs):
+        """Call `func(*args, **kwargs)` once scheduled, retrying on 429."""
+        priority = self._resolve(priority)
+        for attempt in itertools.count():
+            self.acquire_sync(model, priority)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if not _is_rate_limited(e) or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(model, attempt)
+            finally:
+                self._release(model, priority)
+            time.sleep(delay)
+
+    async def run_stream(self, model: str, priority: str, func, *args, **kwargs):
+        """Iterate `func(*args, **kwargs)` holding one slot, retrying on 429 before the first chunk."""
+        priority = self._resolve(priority)
+        for attempt in itertools.count():
+            await self.acquire(model, priority)
+            started = False
+            try:
+                async for chunk in func(*args, **kwargs):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started or not _is_rate_limited(e) or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(model, attempt)
+            finally:
+                self._release(model, priority)
+            await asyncio.sleep(delay)
+
+    def run_stream_sync(self, model: str, priority: str, func, *args, **kwargs):
+        """Blocking `run_stream` for worker threads."""
+        priority = self._resolve(priority)
+        for attempt in itertools.count():
+            self.acquire_sync(model, priority)
+            started = False
+            try:
+                for chunk in func(*args, **kwargs):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started or not _is_rate_limited(e) or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(model, attempt)
+            finally:
+                self._release(model, priority)
+            time.sleep(delay)
+
+    def stats(self) -> dict[str, dict]:
+        """Waiting and in-flight calls and available tokens of every model."""
+        with self._lock:
+            return {
+                model: {
+                    "waiting": {
+                        priority: sum(1 for rank, _ in bucket.waiting if rank == r)
+                        for priority, r in PRIORITIES.items()
+                    },
+                    "in_flight": dict(bucket.in_flight),
+                    "tokens": bucket.tokens,
+                }
+                for model, bucket in self._buckets.items()
+            }
+
+
+scheduler = LLMScheduler(parse_rate_limits(CLOVA_RATE_LIMITS))
+
+
+class ScheduledChatModel(BaseChatModel):
+    """Chat model sending every request of the wrapped model through the scheduler."""
+
+    llm: BaseChatModel
+    priority: str = "interactive"
+
+    @property
+    def _llm_type(self) -> str:
+        return f"scheduled-{self.llm._llm_type}"
+
+    @property
+    def _model(self) -> str:
+        return getattr(self.llm, "model_name", None) or type(self.llm).__name__
+
+    # The run manager goes to the wrapped model, so its callbacks and tracing report on the scheduled run
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return scheduler.run_sync(
+            self._model,
+            self.priority,
+            self.llm._generate,
+            messages,
+            stop,
+            run_manager,
+            **kwargs,
+        )
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return await scheduler.run(
+            self._model,
+            self.priority,
+            self.llm._agenerate,
+            messages,
+            stop,
+            run_manager,
+            **kwargs,
+        )
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        yield from scheduler.run_stream_sync(
+            self._model,
+            self.priority,
+            self.llm._stream,
+            messages,
+            stop,
+            run_manager,
+            **kwargs,
+        )
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        async for chunk in scheduler.run_stream(
+            self._model,
+            self.priority,
+            self.llm._astream,
+            messages,
+            stop,
+            run_manager,
+            **kwargs,
+        ):
+            yield chunk
+
+
+class ScheduledEmbeddings(Embeddings):
+    """Embeddings sending every request of the wrapped model through the scheduler."""
+
+    def __init__(self, embeddings: Embeddings, priority: str = "interactive"):
+        self.embeddings = embeddings
+        self.priority = priority
+        # Keeps the cache keys of `CachedEmbeddings` wrapping this model
+        self.model = getattr(embeddings, "model", None) or type(embeddings).__name__
+
+    def embed_query(self, text: str) -> list[float]:
+        return scheduler.run_sync(
+            self.model, self.priority, self.embeddings.embed_query, text
+        )
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        # One slot per batch, so a batch neither floods the queue nor holds the slots of other calls
+        return scheduler.run_sync(
+            self.model, self.priority, self.embeddings.embed_documents, texts
+        )
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return await scheduler.run(
+            self.model, self.priority, self.embeddings.aembed_query, text
+        )
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await scheduler.run(
+            self.model, self.priority, self.embeddings.aembed_documents, texts
+        )
+
+
+def schedule(model, priority: str = "interactive"):
+    """
+    Route every request of a chat or embedding model through the scheduler.
+
+    Args:
+        model (BaseChatModel | Embeddings): Model to wrap, e.g. `ChatClovaX` or `ClovaXEmbeddings`.
+        priority (str, optional): 'interactive', 'safety' or 'background'. `llm_priority` overrides
+            it for a block of calls. Defaults to 'interactive'.
+
+    Returns:
+        ScheduledChatModel | ScheduledEmbeddings: The wrapped model.
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority: {priority}")
+    if isinstance(model, BaseChatModel):
+        return ScheduledChatModel(llm=model, priority=priority)
+    if isinstance(model, Embeddings):
+        return ScheduledEmbeddings(model, priority)
+    raise TypeError(f"Cannot schedule {type(model).__name__}")
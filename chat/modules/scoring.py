@@ -2,11 +2,12 @@ from langchain_naver import ChatClovaX
 
 from .prompt import aaq_scoring_template
 from .utils import logger, extract_int
+from .scheduler import schedule
 
 
 class AAQScoring:
     def __init__(self):
-        self.model = ChatClovaX(temperature=0, max_tokens=8)
+        self.model = schedule(ChatClovaX(temperature=0, max_tokens=8), "background")
         self._score_threshold = 18
         self._questions = [
             "고통스러운 경험과 기억으로 인해 나는 내가 가치 있게 여기는 삶을 살기가 어렵다.",
@@ -16,6 +16,29 @@ USER_SESSION_SQLITE = os.getenv("USER_SESSION_SQLITE")
 MEDICAL_DB_FAISS = os.getenv("MEDICAL_DB_FAISS")
 LEGACY_DB_FAISS = os.getenv("LEGACY_DB_FAISS")
 LTM_DB_FAISS = os.getenv("LTM_DB_FAISS")
+LTM_CLUE_THRESHOLD = (
+    float(os.getenv("LTM_CLUE_THRESHOLD"))
+    if os.getenv("LTM_CLUE_THRESHOLD", "").strip()
+    else None
+)
+LTM_CLUE_LIMIT = int(os.getenv("LTM_CLUE_LIMIT", "100"))
+LTM_FLUSH_INTERVAL = float(os.getenv("LTM_FLUSH_INTERVAL", "30"))
+LTM_FLUSH_TURNS = int(os.getenv("LTM_FLUSH_TURNS", "5"))
+LTM_MAX_CONCURRENT_FLUSHES = int(os.getenv("LTM_MAX_CONCURRENT_FLUSHES", "4"))
+LTM_FACT_PREFILTER = os.getenv("LTM_FACT_PREFILTER", "shadow").strip().lower()
+LTM_FUSED_EXTRACTION = os.getenv("LTM_FUSED_EXTRACTION", "false").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+# Per-model limits as `model=requests_per_second:burst:max_concurrency`, comma separated
+CLOVA_RATE_LIMITS = os.getenv("CLOVA_RATE_LIMITS", "")
+CLOVA_MAX_RETRIES = int(os.getenv("CLOVA_MAX_RETRIES", "4"))
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "").strip() or None
+RAG_INDEX_TYPE = os.getenv("RAG_INDEX_TYPE", "flat").strip().lower()
+RAG_VECTOR_ENCODING = os.getenv("RAG_VECTOR_ENCODING", "float32").strip().lower()
+RAG_RERANK_FACTOR = int(os.getenv("RAG_RERANK_FACTOR", "0"))
+RAG_MMAP = True if os.getenv("RAG_MMAP", "true").strip().lower() == "true" else False
 USE_DUMMY_RESPONSE = (
     True if os.getenv("USE_DUMMY_RESPONSE", "true").strip().lower() == "true" else False
 )
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from mem0_naver import AsyncMemory
+
+
+@pytest.fixture
+def make_memory(tmp_path):
+    """Build an AsyncMemory on a FAISS store in `tmp_path`, answering with `responses` in turn."""
+
+    def make(responses=(), embeddings=None, llm=None, **config):
+        llm = llm or FakeListChatModel(responses=list(responses))
+        memory = asyncio.run(
+            AsyncMemory.from_config(
+                {
+                    "llm": {"provider": "langchain", "config": {"model": llm}},
+                    "embedder": {
+                        "provider": "langchain",
+                        "config": {
+                            "model": embeddings or DeterministicFakeEmbedding(size=16)
+                        },
+                    },
+                    "vector_store": {
+                        "provider": "faiss",
+                        "config": {
+                            "collection_name": "memories",
+                            "path": str(tmp_path / "faiss"),
+                            "embedding_model_dims": 16,
+                        },
+                    },
+                    "history_db_path": str(tmp_path / "history.db"),
+                    "version": "v1.1",
+                    **config,
+                }
+            )
+        )
+        return memory, llm
+
+    return make
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from mem0_naver.configs.embeddings.base import BaseEmbedderConfig
+from mem0_naver.configs.llms.base import BaseLlmConfig
+from mem0_naver.embeddings.base import EmbeddingBase
+from mem0_naver.embeddings.langchain import LangchainEmbedding
+from mem0_naver.llms.base import LLMBase
+from mem0_naver.llms.langchain import LangchainLLM
+
+
+class AsyncOnlyEmbeddings(Embeddings):
+    """Embeddings failing on the blocking API, so a test fails if AsyncMemory falls back to it."""
+
+    def __init__(self):
+        self.model = DeterministicFakeEmbedding(size=16)
+
+    def embed_documents(self, texts):
+        raise AssertionError("embed_documents called")
+
+    def embed_query(self, text):
+        raise AssertionError("embed_query called")
+
+    async def aembed_documents(self, texts):
+        return self.model.embed_documents(texts)
+
+    async def aembed_query(self, text):
+        return self.model.embed_query(text)
+
+
+class AsyncOnlyChatModel(BaseChatModel):
+    """Chat model answering `responses` in turn, failing on the blocking API."""
+
+    responses: list[str]
+    i: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "async-only"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise AssertionError("_generate called")
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        response = self.responses[self.i]
+        self.i += 1
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(response))])
+
+
+class ThreadRecordingEmbedding(EmbeddingBase):
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def embed(self, text, memory_action=None):
+        self.threads.append(threading.get_ident())
+        return [1.0]
+
+
+class ThreadRecordingLLM(LLMBase):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def generate_response(self, messages, **kwargs):
+        self.calls.append((threading.get_ident(), kwargs))
+        return "done"
+
+
+def test_langchain_embedding_awaits_the_native_async_api():
+    embedder = LangchainEmbedding(BaseEmbedderConfig(model=AsyncOnlyEmbeddings()))
+    expected = DeterministicFakeEmbedding(size=16).embed_query("tea")
+
+    assert asyncio.run(embedder.aembed("tea", "search")) == expected
+    assert asyncio.run(embedder.aembed_batch(["tea", "tea"])) == [expected, expected]
+
+
+def test_langchain_llm_awaits_the_native_async_api():
+    llm = LangchainLLM(BaseLlmConfig(model=AsyncOnlyChatModel(responses=["hello"])))
+    messages = [
+        {"role": "system", "content": "Be brief"},
+        {"role": "user", "content": "hi"},
+    ]
+
+    assert asyncio.run(llm.agenerate_response(messages)) == "hello"
+    # The responses are used up, and the model error is wrapped like on the blocking path
+    with pytest.raises(Exception, match="Error generating response"):
+        asyncio.run(llm.agenerate_response(messages))
+
+
+def test_providers_without_an_async_api_run_in_a_worker_thread():
+    embedder = ThreadRecordingEmbedding()
+    llm = ThreadRecordingLLM()
+
+    async def main():
+        await embedder.aembed("tea")
+        await embedder.aembed_batch(["tea", "cat"])
+        return await llm.agenerate_response(
+            [{"role": "user", "content": "hi"}],
+            response_format={"type": "json_object"},
+        )
+
+    assert asyncio.run(main()) == "done"
+    assert len(embedder.threads) == 3
+    assert threading.get_ident() not in embedder.threads
+    ((thread, kwargs),) = llm.calls
+    assert thread != threading.get_ident()
+    assert kwargs == {"response_format": {"type": "json_object"}}
+
+
+def test_async_memory_never_calls_the_blocking_api(make_memory):
+    llm = AsyncOnlyChatModel(
+        responses=[
+            json.dumps({"facts": ["Likes green tea"]}),
+            json.dumps(
+                {"memory": [{"id": "0", "text": "Likes green tea", "event": "ADD"}]}
+            ),
+        ]
+    )
+    memory, _ = make_memory(llm=llm, embeddings=AsyncOnlyEmbeddings())
+
+    async def main():
+        added = await memory.add(
+            [{"role": "user", "content": "저는 녹차를 좋아해요"}], user_id="u"
+        )
+        memory_id = added["results"][0]["id"]
+        await memory.update(memory_id, "Likes black tea")
+        return await memory.search("tea", user_id="u")
+
+    results = asyncio.run(main())["results"]
+    assert [result["memory"] for result in results] == ["Likes black tea"]
@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import pytest
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from langchain_core.embeddings import Embeddings
+
+from mem0_naver.configs.embeddings.base import BaseEmbedderConfig
+from mem0_naver.embeddings.base import EmbeddingBase
+from mem0_naver.embeddings.langchain import LangchainEmbedding
+
+
+class RecordingEmbeddings(Embeddings):
+    """Deterministic embeddings recording the texts of every request."""
+
+    def __init__(self):
+        self.model = DeterministicFakeEmbedding(size=16)
+        self.requests: list[list[str]] = []
+
+    def embed_documents(self, texts):
+        self.requests.append(list(texts))
+        return self.model.embed_documents(texts)
+
+    def embed_query(self, text):
+        self.requests.append([text])
+        return self.model.embed_query(text)
+
+    async def aembed_documents(self, texts):
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text):
+        return self.embed_query(text)
+
+
+class QueryOnlyEmbedding(EmbeddingBase):
+    """Provider without a batch API."""
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.texts = []
+
+    def embed(self, text, memory_action=None):
+        self.texts.append(text)
+        return [float(len(text))]
+
+
+TEXTS = ["tea", "busan", "tea", "cat", "busan"]
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_each_distinct_text_is_embedded_once(use_async):
+    model = RecordingEmbeddings()
+    embedder = LangchainEmbedding(BaseEmbedderConfig(model=model, max_batch_size=2))
+
+    if use_async:
+        vectors = asyncio.run(embedder.aembed_batch(TEXTS, "add"))
+    else:
+        vectors = embedder.embed_batch(TEXTS, "add")
+
+    assert model.requests == [["tea", "busan"], ["cat"]]
+    assert vectors == [model.model.embed_query(text) for text in TEXTS]
+
+
+def test_batches_are_unbounded_without_a_max_batch_size():
+    model = RecordingEmbeddings()
+    embedder = LangchainEmbedding(BaseEmbedderConfig(model=model, max_batch_size=None))
+
+    embedder.embed_batch(TEXTS)
+    assert model.requests == [["tea", "busan", "cat"]]
+    assert embedder.embed_batch([]) == []
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_providers_without_a_batch_api_embed_each_distinct_text(use_async):
+    embedder = QueryOnlyEmbedding()
+
+    if use_async:
+        vectors = asyncio.run(embedder.aembed_batch(TEXTS))
+    else:
+        vectors = embedder.embed_batch(TEXTS)
+
+    assert embedder.texts == ["tea", "busan", "cat"]
+    assert vectors == [[3.0], [5.0], [3.0], [3.0], [5.0]]
+
+
+def test_extracted_facts_are_embedded_in_one_request(make_memory):
+    model = RecordingEmbeddings()
+    facts = ["Likes green tea", "Lives in Busan", "Likes green tea"]
+    memory, _ = make_memory(
+        [
+            json.dumps({"facts": facts}),
+            json.dumps({"memory": []}),
+        ],
+        embeddings=model,
+    )
+
+    asyncio.run(
+        memory.add(
+            [{"role": "user", "content": "녹차 좋아하고 부산 살아요"}], user_id="u"
+        )
+    )
+    fact_requests = [request for request in model.requests if set(request) & set(facts)]
+    assert fact_requests == [["Likes green tea", "Lives in Busan"]]
@@ -0,0 +1,126 @@
+import asyncio
+import sqlite3
+import unicodedata
+
+import numpy as np
+import pytest
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from langchain_core.embeddings import Embeddings
+
+from mem0_naver.configs.embeddings.base import BaseEmbedderConfig
+from mem0_naver.embeddings.cache import (
+    CachedEmbeddings,
+    EmbeddingCache,
+    cache_key,
+    get_embedding_cache,
+)
+from mem0_naver.embeddings.langchain import LangchainEmbedding
+
+
+class RecordingEmbeddings(Embeddings):
+    """Deterministic embeddings recording every text sent to the model."""
+
+    model = "fake-embedding"
+
+    def __init__(self):
+        self.fake = DeterministicFakeEmbedding(size=16)
+        self.texts: list[str] = []
+
+    def embed_documents(self, texts):
+        self.texts.extend(texts)
+        return self.fake.embed_documents(texts)
+
+    def embed_query(self, text):
+        self.texts.append(text)
+        return self.fake.embed_query(text)
+
+    async def aembed_documents(self, texts):
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text):
+        return self.embed_query(text)
+
+
+def test_keys_depend_on_the_model_and_the_normalized_text():
+    composed = "할머니는  녹차를\n좋아해요 "
+    decomposed = unicodedata.normalize("NFD", "할머니는 녹차를 좋아해요")
+
+    assert cache_key("bge-m3", composed) == cache_key("bge-m3", decomposed)
+    assert cache_key("bge-m3", composed) != cache_key("clir-emb-dolphin", composed)
+    assert cache_key("bge-m3", "녹차") != cache_key("bge-m3", "홍차")
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_each_text_is_embedded_once(tmp_path, use_async):
+    model = RecordingEmbeddings()
+    cache = EmbeddingCache(str(tmp_path / "cache.db"))
+    embeddings = CachedEmbeddings(model, cache)
+
+    def embed(texts):
+        if use_async:
+            return asyncio.run(embeddings.aembed_documents(texts))
+        return embeddings.embed_documents(texts)
+
+    first = embed(["tea", "cat", " tea"])
+    assert model.texts == ["tea", "cat"]
+    assert cache.stats()["misses"] == 2
+
+    second = embed(["cat", "busan", "tea"])
+    assert model.texts == ["tea", "cat", "busan"]
+    np.testing.assert_allclose(second[0], first[1], rtol=1e-6)
+    np.testing.assert_allclose(second[2], first[0], rtol=1e-6)
+    np.testing.assert_allclose(embeddings.embed_query("tea "), first[0], rtol=1e-6)
+    assert model.texts == ["tea", "cat", "busan"]
+
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"]) == (3, 3)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_cache_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    model = RecordingEmbeddings()
+    vector = CachedEmbeddings(model, EmbeddingCache(path)).embed_query("tea")
+
+    restarted = EmbeddingCache(path)
+    model.texts.clear()
+    np.testing.assert_allclose(
+        CachedEmbeddings(model, restarted).embed_query("tea"), vector, rtol=1e-6
+    )
+    assert model.texts == []
+    assert restarted.stats()["disk_hits"] == 1
+
+    # Another model has its own embeddings
+    CachedEmbeddings(model, restarted, model_name="other").embed_query("tea")
+    assert model.texts == ["tea"]
+
+
+def test_memory_tier_evicts_the_least_recently_used():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put_many("m", {"a": [1.0], "b": [2.0]})
+    cache.get_many(["a"])
+    cache.put_many("m", {"c": [3.0]})
+
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+    assert cache.stats()["memory_entries"] == 2
+
+
+def test_disk_lookup_stays_under_the_sqlite_variable_limit(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.db"), max_entries=10)
+    keys = [f"k{i}" for i in range(2000)]
+    cache.put_many("m", {key: [float(i)] for i, key in enumerate(keys)})
+    cache.connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+
+    found = cache.get_many(keys)
+    assert len(found) == 2000 and found["k1500"][0] == 1500.0
+
+
+def test_embedders_sharing_a_cache_file_share_the_cache(tmp_path):
+    path = str(tmp_path / "shared.db")
+    model = RecordingEmbeddings()
+    first = LangchainEmbedding(BaseEmbedderConfig(model=model, cache_path=path))
+    second = LangchainEmbedding(BaseEmbedderConfig(model=model, cache_path=path))
+
+    np.testing.assert_allclose(first.embed("tea"), second.embed("tea"), rtol=1e-6)
+    assert model.texts == ["tea"]
+    assert get_embedding_cache(path).stats()["memory_hits"] == 1
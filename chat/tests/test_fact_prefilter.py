@@ -0,0 +1,147 @@
+import asyncio
+import json
+
+import pytest
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from mem0_naver import AsyncMemory
+from mem0_naver.memory.prefilter import FactPrefilter
+from mem0_naver.memory.telemetry import metrics
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "ㅋㅋㅋ",
+        "!!",
+        "안녕하세요~",
+        "감사합니다 ^^",
+        "음 알겠어요",
+        "Thank you!",
+        "ㅎㅎ 고마워요",
+    ],
+)
+def test_filler_is_content_free(text):
+    assert FactPrefilter(enabled=True).is_content_free(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "네",
+        "응",
+        "예",
+        "넵!",
+        "맞아요",
+        "그래",
+        "좋아요",
+        "yes",
+        "OK",
+        "아니요",
+        "no",
+        "네 감사합니다",
+    ],
+)
+def test_bare_answers_are_kept(text):
+    # "약은 드시고 계세요?" "네" carries the fact of the question
+    assert not FactPrefilter(enabled=True).is_content_free(text)
+
+
+def test_turns_with_content_are_kept():
+    gate = FactPrefilter(enabled=True, filler_phrases=["그럼요"])
+    assert not gate.is_content_free("저는 아침마다 혈압약을 먹어요")
+    assert not gate.is_content_free("I moved to Busan last year")
+    assert gate.is_content_free("그럼요!")
+
+
+def test_check_needs_every_user_turn_to_be_content_free():
+    gate = FactPrefilter(enabled=True)
+    assert gate.check(
+        [{"role": "user", "content": "안녕"}, {"role": "user", "content": "ㅋㅋ"}]
+    )
+    assert not gate.check(
+        [
+            {"role": "user", "content": "안녕"},
+            {"role": "user", "content": "딸이 내일 와요"},
+        ]
+    )
+    # Assistant turns never count, and a batch without user turns is extracted
+    assert gate.check(
+        [
+            {"role": "assistant", "content": "오늘 기분은 어떠세요?"},
+            {"role": "user", "content": "고마워요"},
+        ]
+    )
+    assert not gate.check([{"role": "assistant", "content": "안녕하세요"}])
+    assert not FactPrefilter(enabled=False).check([{"role": "user", "content": "안녕"}])
+
+    stats = gate.stats()
+    assert (stats["checked"], stats["skipped"]) == (4, 2)
+    assert stats["skip_rate"] == 0.5
+
+
+def test_shadow_mode_measures_precision_without_telemetry(monkeypatch):
+    monkeypatch.setattr(metrics, "enabled", False)
+    gate = FactPrefilter(enabled=True, mode="shadow")
+    assert not gate.enforced
+
+    for content_free, facts in [
+        (True, []),
+        (True, []),
+        (True, ["Takes blood pressure medicine"]),
+        (False, ["Daughter visits tomorrow"]),
+        (False, []),
+    ]:
+        gate.record_extraction(content_free, facts)
+
+    stats = gate.stats()
+    assert stats["precision"] == pytest.approx(2 / 3)
+    assert stats["recall"] == pytest.approx(2 / 3)
+    assert "fact_prefilter.shadow.skip_correct" not in metrics.snapshot()["counters"]
+
+
+def test_enforce_mode_records_no_shadow_outcomes():
+    gate = FactPrefilter(enabled=True, mode="enforce")
+    assert gate.enforced
+    gate.record_extraction(True, [])
+    assert gate.stats()["precision"] is None
+
+
+def _memory(tmp_path, mode: str, responses):
+    llm = FakeListChatModel(responses=responses)
+    config = {
+        "llm": {"provider": "langchain", "config": {"model": llm}},
+        "embedder": {
+            "provider": "langchain",
+            "config": {"model": DeterministicFakeEmbedding(size=16)},
+        },
+        "vector_store": {
+            "provider": "faiss",
+            "config": {
+                "collection_name": "prefilter",
+                "path": str(tmp_path / "faiss"),
+                "embedding_model_dims": 16,
+            },
+        },
+        "history_db_path": str(tmp_path / "history.db"),
+        "version": "v1.1",
+        "fact_prefilter": {"enabled": True, "mode": mode},
+    }
+    return asyncio.run(AsyncMemory.from_config(config)), llm
+
+
+@pytest.mark.parametrize("mode", ["enforce", "shadow"])
+def test_content_free_batches_skip_extraction_only_when_enforced(tmp_path, mode):
+    memory, llm = _memory(tmp_path, mode, [json.dumps({"facts": []})] * 2)
+    result = asyncio.run(
+        memory.add([{"role": "user", "content": "안녕하세요 ㅎㅎ"}], user_id="u")
+    )
+
+    assert result["results"] == []
+    # FakeListChatModel cycles through its responses, so a second response shows the first was used
+    assert llm.i == (0 if mode == "enforce" else 1)
+    stats = memory.fact_prefilter.stats()
+    assert stats["skipped"] == 1
+    assert stats["precision"] == (None if mode == "enforce" else 1.0)
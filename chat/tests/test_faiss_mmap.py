@@ -0,0 +1,89 @@
+import faiss
+import numpy as np
+import pytest
+
+from mem0_naver.vector_stores.faiss import FAISS, get_index_type, is_memory_mapped
+
+DIMS = 8
+
+
+def _open(path, index_type: str, mmap: bool) -> FAISS:
+    return FAISS(
+        collection_name="mmap",
+        path=str(path),
+        embedding_model_dims=DIMS,
+        index_type=index_type,
+        pq_m=4,
+        hnsw_m=8,
+        ann_migration_threshold=10**9,
+        mmap=mmap,
+        durability="on_shutdown",
+    )
+
+
+def _fill(path, index_type: str, vectors: np.ndarray):
+    store = _open(path, index_type, mmap=False)
+    store.insert(vectors, [{"n": i} for i in range(len(vectors))])
+    # Writes a snapshot, so the reopened store has no log records to replay
+    store.rebuild_index()
+    ids = [store.payloads.get_by_rows([row])[row][0] for row in range(len(vectors))]
+    store.close()
+    return ids
+
+
+def test_flat_codes_are_memory_mapped(tmp_path):
+    vectors = np.random.default_rng(0).random((50, DIMS), dtype=np.float32)
+    ids = _fill(tmp_path, "flat", vectors)
+
+    store = _open(tmp_path, "flat", mmap=True)
+    assert not faiss.downcast_index(store.index.index).codes.is_owned
+    assert store.search(None, vectors[7], limit=1)[0].id == ids[7]
+
+    # The first write copies the codes into memory instead of writing to the mapped file
+    store.update(ids[7], vectors[9].tolist())
+    assert faiss.downcast_index(store.index.index).codes.is_owned
+    assert {r.id for r in store.search(None, vectors[9], limit=2)} == {ids[7], ids[9]}
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "ivf_pq", "hnsw"])
+def test_memory_mapped_store_accepts_writes(tmp_path, index_type):
+    vectors = np.random.default_rng(1).random((600, DIMS), dtype=np.float32)
+    ids = _fill(tmp_path, index_type, vectors[:500])
+
+    store = _open(tmp_path, index_type, mmap=True)
+    assert get_index_type(store.index) == index_type
+    assert is_memory_mapped(store.index)
+
+    new_ids = [f"new-{i}" for i in range(500, 600)]
+    store.insert(vectors[500:], [{"n": i} for i in range(500, 600)], new_ids)
+    store.update(ids[3], vectors[550].tolist(), {"n": -3})
+    store.delete(ids[4])
+    assert not is_memory_mapped(store.index)
+    store.close()
+
+    reopened = _open(tmp_path, index_type, mmap=True)
+    assert reopened.get("new-500").payload["n"] == 500
+    assert reopened.get(ids[3]).payload["n"] == -3
+    assert reopened.get(ids[4]) is None
+    np.testing.assert_allclose(reopened.get_vector(ids[3]), vectors[550], atol=0.1)
+    reopened.delete(ids[5])
+    reopened.purge_tombstones()
+    assert reopened.get(ids[5]) is None
+    assert reopened.index.ntotal == 598
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat"])
+def test_snapshot_of_memory_mapped_index_is_self_contained(tmp_path, index_type):
+    vectors = np.random.default_rng(2).random((500, DIMS), dtype=np.float32)
+    ids = _fill(tmp_path, index_type, vectors)
+
+    store = _open(tmp_path, index_type, mmap=True)
+    store.snapshot_generations = 1
+    store._save()
+    store.close()
+    # Only the new generation is left, so it must not refer to the mapped file
+    assert len(store._snapshot_generations()) == 1
+
+    reopened = _open(tmp_path, index_type, mmap=False)
+    assert reopened.index.ntotal == 500
+    assert reopened.search(None, vectors[8], limit=1)[0].id == ids[8]
@@ -0,0 +1,84 @@
+import threading
+
+import numpy as np
+import pytest
+
+import mem0_naver.vector_stores.faiss as faiss_store
+from mem0_naver.vector_stores.faiss import FAISS
+
+DIMS = 16
+
+
+def _open(path, index_type: str) -> FAISS:
+    return FAISS(
+        collection_name="rebuild",
+        path=str(path),
+        distance_strategy="euclidean",
+        embedding_model_dims=DIMS,
+        index_type=index_type,
+        nlist=4,
+        hnsw_m=8,
+        nprobe=4,
+        ann_migration_threshold=10**9,
+    )
+
+
+@pytest.mark.parametrize("index_type", ["ivf_flat", "hnsw"])
+def test_update_during_rebuild_survives_swap(tmp_path, monkeypatch, index_type):
+    store = _open(tmp_path, index_type)
+    vectors = np.random.default_rng(0).random((100, DIMS), dtype=np.float32)
+    ids = [f"id{i}" for i in range(100)]
+    store.insert(vectors, [{"user_id": "u", "n": i} for i in range(100)], ids)
+
+    new_vector = vectors[85] + 0.001
+    recall_at_k = faiss_store.recall_at_k
+
+    def update_while_building(*args, **kwargs):
+        # Runs after the new index is built, before it is swapped in
+        store.update("id5", new_vector.tolist(), {"user_id": "u", "n": -5})
+        store.delete("id7")
+        return recall_at_k(*args, **kwargs)
+
+    monkeypatch.setattr(faiss_store, "recall_at_k", update_while_building)
+    store.rebuild_index()
+    monkeypatch.setattr(faiss_store, "recall_at_k", recall_at_k)
+
+    for current in (store, None):
+        if current is None:
+            store.close()
+            current = _open(tmp_path, index_type)
+        assert faiss_store.get_index_type(current.index) == index_type
+        results = current.search(None, new_vector, limit=2)
+        assert results[0].id == "id5"
+        assert results[0].payload["n"] == -5
+        assert current.get("id7") is None
+        assert "id7" not in {
+            result.id for result in current.search(None, vectors[7], limit=5)
+        }
+        assert current.index.ntotal - len(current.tombstones) == 99
+
+
+def test_concurrent_rebuilds_run_one_at_a_time(tmp_path):
+    store = _open(tmp_path, "ivf_flat")
+    vectors = np.random.default_rng(1).random((200, DIMS), dtype=np.float32)
+    store.insert(
+        vectors, [{"user_id": "u"} for _ in range(200)], [str(i) for i in range(200)]
+    )
+
+    errors = []
+
+    def rebuild():
+        try:
+            store.rebuild_index()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=rebuild) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert faiss_store.get_index_type(store.index) == "ivf_flat"
+    assert store.search(None, vectors[9], limit=1)[0].id == "9"
@@ -0,0 +1,116 @@
+import os
+import pickle
+
+import faiss
+import numpy as np
+import pytest
+
+from mem0_naver.vector_stores.faiss import FAISS
+
+DIMS = 8
+
+
+def _open(path, index_type: str) -> FAISS:
+    return FAISS(
+        collection_name="recovery",
+        path=str(path),
+        embedding_model_dims=DIMS,
+        index_type=index_type,
+        hnsw_m=8,
+        ann_migration_threshold=10**9,
+        durability="on_shutdown",
+    )
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_payload_writes_missing_from_wal_are_rolled_forward(tmp_path, index_type):
+    store = _open(tmp_path, index_type)
+    vectors = np.random.default_rng(0).random((40, DIMS), dtype=np.float32)
+    store.insert(
+        vectors[:30], [{"n": i} for i in range(30)], [str(i) for i in range(30)]
+    )
+    if index_type != "flat":
+        store.rebuild_index()
+    store.flush()
+    wal_path = store._get_wal_path()
+    wal_size = os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+
+    # Committed to the payload store, but the log records never reach the disk
+    store.insert(
+        vectors[30:], [{"n": i} for i in range(30, 40)], [str(i) for i in range(30, 40)]
+    )
+    store.update("3", vectors[35].tolist(), {"n": -3})
+    store.delete("4")
+    store.delete("31")
+    store.flush()
+    with open(wal_path, "ab") as f:
+        f.truncate(wal_size)
+    store.payloads.close()
+
+    reloaded = _open(tmp_path, index_type)
+    assert reloaded.payloads.count() == 38
+    assert reloaded.index.ntotal - len(reloaded.tombstones) == 38
+    assert reloaded.get("4") is None and reloaded.get("31") is None
+    assert reloaded.get("3").payload["n"] == -3
+    assert {r.id for r in reloaded.search(None, vectors[35], limit=2)} == {"3", "35"}
+    assert reloaded.search(None, vectors[37], limit=1)[0].id == "37"
+    found = {r.id for r in reloaded.search(None, vectors[4], limit=40)}
+    assert "4" not in found and "31" not in found and len(found) == 38
+
+    # The recovered state is saved, so a second restart sees the same collection
+    reloaded.close()
+    again = _open(tmp_path, index_type)
+    assert again.index.ntotal - len(again.tombstones) == 38
+    assert again.get("3").payload["n"] == -3
+
+
+def test_legacy_docstore_is_imported_once(tmp_path, monkeypatch):
+    vectors = np.random.default_rng(1).random((5, DIMS), dtype=np.float32)
+    index = faiss.IndexFlatL2(DIMS)
+    index.add(vectors)
+    faiss.write_index(index, str(tmp_path / "recovery.faiss"))
+    with open(tmp_path / "recovery.pkl", "wb") as f:
+        pickle.dump(
+            (
+                {f"id{i}": {"n": i} for i in range(5)},
+                {i: f"id{i}" for i in range(5)},
+            ),
+            f,
+        )
+
+    store = _open(tmp_path, "flat")
+    assert store.payloads.count() == 5
+    store.delete("id1")
+    store.close()
+
+    def fail(*args):
+        raise AssertionError("docstore imported again")
+
+    monkeypatch.setattr(FAISS, "_import_docstore", fail)
+    reloaded = _open(tmp_path, "flat")
+    assert reloaded._generation > 0
+    assert reloaded.get("id1") is None
+    assert reloaded.index.ntotal - len(reloaded.tombstones) == 4
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_replaying_a_clean_log_recovers_nothing(tmp_path, index_type, caplog):
+    store = _open(tmp_path, index_type)
+    vectors = np.random.default_rng(2).random((12, DIMS), dtype=np.float32)
+    store.insert(
+        vectors[:10], [{"n": i} for i in range(10)], [str(i) for i in range(10)]
+    )
+    if index_type != "flat":
+        store.rebuild_index()
+    store.delete("2")
+    store.update("5", vectors[10].tolist(), {"n": -5})
+    store.close()
+    generation = store._generation
+
+    reloaded = _open(tmp_path, index_type)
+    assert "Recovered" not in caplog.text
+    # Nothing was recovered, so the loaded generation goes on with its log
+    assert reloaded._generation == generation
+    assert reloaded.index.ntotal - len(reloaded.tombstones) == 9
+    assert reloaded.get("2") is None
+    assert reloaded.search(None, vectors[10], limit=1)[0].id == "5"
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from mem0_naver.vector_stores.faiss import FAISS
+
+DIMS = 8
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw"])
+def test_search_skips_deleted_vectors(tmp_path, index_type):
+    store = FAISS(
+        collection_name="search",
+        path=str(tmp_path),
+        embedding_model_dims=DIMS,
+        index_type=index_type,
+        nlist=4,
+        hnsw_m=8,
+        nprobe=4,
+        ann_migration_threshold=10**9,
+        tombstone_compaction_ratio=0.5,
+    )
+    vectors = np.random.default_rng(0).random((200, DIMS), dtype=np.float32)
+    store.insert(
+        vectors, [{"user_id": "u"} for _ in range(200)], [str(i) for i in range(200)]
+    )
+    if index_type != "flat":
+        store.rebuild_index()
+
+    query = vectors[0]
+    nearest = [result.id for result in store.search(None, query, limit=60)]
+    for vector_id in nearest[:50]:
+        store.delete(vector_id)
+
+    assert len(store.tombstones) == 50
+    results = store.search(None, query, limit=5)
+    assert [result.id for result in results] == nearest[50:55]
+    filtered = store.search(None, query, limit=5, filters={"user_id": "u"})
+    assert [result.id for result in filtered] == nearest[50:55]
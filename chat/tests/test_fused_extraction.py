@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+MESSAGES = [{"role": "user", "content": "저는 녹차를 좋아하고 부산에 살아요"}]
+
+
+def _actions(*actions) -> str:
+    return json.dumps(
+        {"memory": [dict(zip(("id", "text", "event"), action)) for action in actions]}
+    )
+
+
+def _events(result) -> list[tuple[str, str]]:
+    return sorted((item["event"], item["memory"]) for item in result["results"])
+
+
+def _memories(memory) -> list[str]:
+    stored = asyncio.run(memory.get_all(user_id="u"))["results"]
+    return sorted(item["memory"] for item in stored)
+
+
+def test_one_call_extracts_facts_and_applies_actions(make_memory):
+    response = _actions(
+        ("0", "Likes green tea", "ADD"),
+        ("1", "Lives in Busan", "ADD"),
+        ("2", "", "ADD"),
+        ("3", "Says hello", "NONE"),
+    )
+    # Models often wrap the JSON in a code block
+    memory, llm = make_memory(
+        [f"```json\n{response}\n```", "unused"], fused_extraction=True
+    )
+
+    result = asyncio.run(memory.add(MESSAGES, user_id="u"))
+    assert _events(result) == [("ADD", "Likes green tea"), ("ADD", "Lives in Busan")]
+    assert llm.i == 1
+    assert _memories(memory) == ["Likes green tea", "Lives in Busan"]
+
+
+def test_actions_refer_to_retrieved_memories_by_temporary_id(make_memory):
+    memory, llm = make_memory(
+        [
+            _actions(("0", "Likes green tea", "ADD")),
+            # The stored memory is shown to the LLM as "0"
+            _actions(("0", "Likes black tea", "UPDATE"), ("1", "Has a cat", "ADD")),
+            _actions(("0", "Has a cat", "DELETE"), ("1", "Likes black tea", "NONE")),
+            "unused",
+        ],
+        fused_extraction=True,
+        fused_memory_limit=1,
+    )
+
+    asyncio.run(memory.add(MESSAGES, user_id="u"))
+    result = asyncio.run(memory.add(MESSAGES, user_id="u"))
+    assert _events(result) == [("ADD", "Has a cat"), ("UPDATE", "Likes black tea")]
+    assert _memories(memory) == ["Has a cat", "Likes black tea"]
+
+    # Only the best match is retrieved, so "0" is whichever memory is nearest the turn
+    nearest = asyncio.run(memory.search(MESSAGES[0]["content"], user_id="u", limit=1))
+    result = asyncio.run(memory.add(MESSAGES, user_id="u"))
+    assert [item["event"] for item in result["results"]] == ["DELETE"]
+    assert _memories(memory) == sorted(
+        {"Has a cat", "Likes black tea"} - {nearest["results"][0]["memory"]}
+    )
+    assert llm.i == 3
+
+
+def test_stored_additions_and_unparsable_responses_add_nothing(make_memory):
+    memory, llm = make_memory(
+        [
+            _actions(("0", "Likes green tea", "ADD")),
+            _actions(("0", "Likes green tea", "ADD")),
+            "Sorry, I cannot help with that.",
+            "unused",
+        ],
+        fused_extraction=True,
+        fused_memory_limit=0,
+    )
+
+    asyncio.run(memory.add(MESSAGES, user_id="u"))
+    assert asyncio.run(memory.add(MESSAGES, user_id="u"))["results"] == []
+    assert asyncio.run(memory.add(MESSAGES, user_id="u"))["results"] == []
+    assert _memories(memory) == ["Likes green tea"]
+    assert llm.i == 3
+
+
+def test_custom_prompts_fall_back_to_two_passes(make_memory):
+    memory, llm = make_memory(
+        [
+            json.dumps({"facts": ["Likes green tea"]}),
+            _actions(("0", "Likes green tea", "ADD")),
+            "unused",
+        ],
+        fused_extraction=True,
+        custom_fact_extraction_prompt="Extract the facts as JSON.",
+    )
+
+    result = asyncio.run(memory.add(MESSAGES, user_id="u"))
+    assert _events(result) == [("ADD", "Likes green tea")]
+    # One call extracted the facts and another decided the actions
+    assert llm.i == 2
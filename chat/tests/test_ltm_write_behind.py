@@ -0,0 +1,118 @@
+import asyncio
+
+from modules.memory import LongTermMemory
+from modules.scheduler import _priority_override
+
+
+class RecordingMemory:
+    """Stands in for AsyncMemory, recording each batch and the priority it was added with."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batches: list[tuple[str, list[str], str]] = []
+        self.closed = False
+
+        class VectorStore:
+            def close(store):
+                self.closed = True
+
+        self.vector_store = VectorStore()
+
+    async def add(self, messages, user_id):
+        priority = _priority_override.get()
+        await asyncio.sleep(self.delay)
+        self.batches.append(
+            (user_id, [message["content"] for message in messages], priority)
+        )
+
+
+def _ltm(delay: float = 0.0, **kwargs) -> LongTermMemory:
+    ltm = LongTermMemory("unused", **kwargs)
+    ltm.memory = RecordingMemory(delay)
+    return ltm
+
+
+def test_batch_is_flushed_after_flush_turns():
+    async def main():
+        ltm = _ltm(flush_interval=60, flush_turns=3)
+        for turn in ["one", "two", "three"]:
+            ltm.enqueue(turn, "u")
+        # The timer started by the first turn is cancelled by the count trigger
+        await asyncio.sleep(0.01)
+        assert ltm._timers == {} and ltm._pending == {}
+        return ltm.memory.batches
+
+    assert asyncio.run(main()) == [("u", ["one", "two", "three"], "background")]
+
+
+def test_batch_is_flushed_after_flush_interval():
+    async def main():
+        ltm = _ltm(flush_interval=0.05, flush_turns=10)
+        ltm.enqueue("one", "u")
+        ltm.enqueue("two", "u")
+        ltm.enqueue("hello", "v")
+        await asyncio.sleep(0.01)
+        assert ltm.memory.batches == []
+
+        await asyncio.sleep(0.1)
+        assert ltm._timers == {}
+        return ltm.memory.batches
+
+    assert sorted(asyncio.run(main())) == [
+        ("u", ["one", "two"], "background"),
+        ("v", ["hello"], "background"),
+    ]
+
+
+def test_batches_of_a_user_are_added_in_turn_order():
+    async def main():
+        ltm = _ltm(delay=0.05, flush_turns=2)
+        for turn in range(6):
+            ltm.enqueue(str(turn), "u")
+            # Turns keep arriving while the first batch is being added
+            await asyncio.sleep(0.01)
+        await ltm.flush_all()
+        return ltm.memory.batches
+
+    batches = [turns for _, turns, _ in asyncio.run(main())]
+    assert batches[0] == ["0", "1"]
+    # Turns queued behind a running batch are coalesced into the next one
+    assert sum(batches, []) == [str(turn) for turn in range(6)]
+
+
+def test_close_flushes_every_pending_turn():
+    async def main():
+        ltm = _ltm(flush_interval=60, flush_turns=10)
+        ltm.enqueue("one", "u")
+        ltm.enqueue("hello", "v")
+        await ltm.close()
+        assert ltm._timers == {} and ltm._pending == {}
+        assert ltm.memory.closed
+        return ltm.memory.batches
+
+    assert sorted(asyncio.run(main())) == [
+        ("u", ["one"], "background"),
+        ("v", ["hello"], "background"),
+    ]
+
+
+def test_failed_batches_do_not_stop_later_flushes():
+    async def main():
+        ltm = _ltm(flush_turns=1)
+        add = ltm.memory.add
+        calls = []
+
+        async def flaky_add(messages, user_id):
+            calls.append(messages)
+            if len(calls) == 1:
+                raise RuntimeError("vector store unavailable")
+            await add(messages, user_id)
+
+        ltm.memory.add = flaky_add
+        ltm.enqueue("one", "u")
+        await asyncio.sleep(0.01)
+        ltm.enqueue("two", "u")
+        await ltm.flush_all()
+        return ltm.memory.batches
+
+    assert asyncio.run(main()) == [("u", ["two"], "background")]
@@ -0,0 +1,27 @@
+import sqlite3
+
+from mem0_naver.vector_stores.payload_store import PayloadStore
+from mem0_naver.vector_stores.sharded_faiss import _ShardDirectory
+
+NUM_IDS = 2000
+
+
+def test_lookups_stay_under_the_sqlite_variable_limit(tmp_path):
+    store = PayloadStore(str(tmp_path / "payloads.db"))
+    ids = [f"m{i}" for i in range(NUM_IDS)]
+    store.put_many(list(range(NUM_IDS)), ids, [{"n": i} for i in range(NUM_IDS)])
+    store._reader().setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+
+    assert len(store.get_rows(ids)) == NUM_IDS
+    records = store.get_by_rows(range(NUM_IDS))
+    assert len(records) == NUM_IDS and records[1500] == ("m1500", {"n": 1500})
+
+
+def test_shard_directory_lookups_stay_under_the_sqlite_variable_limit(tmp_path):
+    directory = _ShardDirectory(str(tmp_path / "shards.db"))
+    ids = [f"m{i}" for i in range(NUM_IDS)]
+    directory.put_many(ids, [f"s{i % 7}" for i in range(NUM_IDS)])
+    directory.connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+
+    shards = directory.get_many(ids)
+    assert len(shards) == NUM_IDS and shards["m1500"] == "s2"
@@ -0,0 +1,202 @@
+import asyncio
+import time
+from uuid import UUID
+
+import pytest
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models.chat_models import (
+    BaseChatModel,
+    generate_from_stream,
+)
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+
+from modules.scheduler import LLMScheduler, RateLimit, llm_priority, schedule
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+def _scheduler(**kwargs) -> LLMScheduler:
+    return LLMScheduler(
+        {"model": RateLimit(requests_per_second=1000.0, burst=100, max_concurrency=1)},
+        **kwargs,
+    )
+
+
+def test_waiting_calls_are_served_by_priority():
+    scheduler = _scheduler()
+    order = []
+
+    async def call(name: str):
+        order.append(name)
+
+    async def main():
+        release = asyncio.Event()
+        holder = asyncio.create_task(
+            scheduler.run("model", "interactive", release.wait)
+        )
+        await asyncio.sleep(0.02)
+
+        waiting = []
+        for name, priority in [
+            ("background-1", "background"),
+            ("safety", "safety"),
+            ("background-2", "background"),
+            ("interactive", "interactive"),
+        ]:
+            waiting.append(
+                asyncio.create_task(scheduler.run("model", priority, call, name))
+            )
+            await asyncio.sleep(0.01)
+        assert scheduler.stats()["model"]["waiting"] == {
+            "interactive": 1,
+            "safety": 1,
+            "background": 2,
+        }
+
+        release.set()
+        await asyncio.gather(holder, *waiting)
+
+    asyncio.run(main())
+    assert order == ["interactive", "safety", "background-1", "background-2"]
+
+
+def test_llm_priority_overrides_the_model_priority():
+    scheduler = _scheduler()
+    seen = []
+
+    def call():
+        seen.append(
+            {p for p, n in scheduler.stats()["model"]["in_flight"].items() if n}
+        )
+
+    with llm_priority("background"):
+        scheduler.run_sync("model", "interactive", call)
+    scheduler.run_sync("model", "interactive", call)
+    assert seen == [{"background"}, {"interactive"}]
+
+    with pytest.raises(ValueError):
+        with llm_priority("urgent"):
+            pass
+
+
+def test_rate_limited_calls_back_off_and_retry():
+    scheduler = _scheduler(max_retries=2, base_delay=0.2)
+    attempts = []
+
+    def call():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise RateLimited()
+        return "ok"
+
+    assert scheduler.run_sync("model", "interactive", call) == "ok"
+    # The jittered delay is between half and all of `base_delay`
+    assert attempts[1] - attempts[0] >= 0.1
+    assert scheduler.stats()["model"]["in_flight"]["interactive"] == 0
+
+    def always_limited():
+        raise RateLimited()
+
+    with pytest.raises(RateLimited):
+        scheduler.run_sync("model", "interactive", always_limited)
+
+
+def test_other_errors_are_not_retried():
+    scheduler = _scheduler(base_delay=0.01)
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(scheduler.run("model", "interactive", call))
+    assert len(attempts) == 1
+    assert scheduler.stats()["model"]["in_flight"]["interactive"] == 0
+
+
+def test_backoff_pauses_every_call_of_the_model():
+    scheduler = _scheduler(base_delay=0.2)
+    scheduler._backoff("model", 0)
+    start = time.monotonic()
+    scheduler.run_sync("model", "interactive", lambda: None)
+    assert time.monotonic() - start >= 0.1
+
+    start = time.monotonic()
+    scheduler.run_sync("other", "interactive", lambda: None)
+    assert time.monotonic() - start < 0.1
+
+
+class _StreamingFakeChatModel(BaseChatModel):
+    """Generates by streaming, reporting each token to the run manager it is given."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "streaming-fake"
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for token in ["hello", " ", "there"]:
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return generate_from_stream(
+            self._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+        )
+
+
+class _Tokens(BaseCallbackHandler):
+    def __init__(self):
+        self.runs: dict[UUID, list[str]] = {}
+        self.ended: list[UUID] = []
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self.runs[run_id] = []
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        self.runs[run_id].append(token)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self.ended.append(run_id)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_wrapped_model_reports_to_the_scheduled_run(use_async):
+    llm = schedule(_StreamingFakeChatModel())
+    tokens = _Tokens()
+    config = {"callbacks": [tokens]}
+
+    if use_async:
+        message = asyncio.run(llm.ainvoke("hi", config))
+    else:
+        message = llm.invoke("hi", config)
+
+    assert message.content == "hello there"
+    ((run_id, run_tokens),) = tokens.runs.items()
+    assert "".join(run_tokens) == "hello there"
+    assert tokens.ended == [run_id]
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_streamed_tokens_are_reported_once(use_async):
+    llm = schedule(GenericFakeChatModel(messages=iter([AIMessage("hello there")])))
+    tokens = _Tokens()
+    config = {"callbacks": [tokens]}
+
+    async def astream():
+        return [chunk.content async for chunk in llm.astream("hi", config)]
+
+    if use_async:
+        chunks = asyncio.run(astream())
+    else:
+        chunks = [chunk.content for chunk in llm.stream("hi", config)]
+
+    assert "".join(chunks) == "hello there"
+    (run_tokens,) = tokens.runs.values()
+    assert run_tokens == chunks
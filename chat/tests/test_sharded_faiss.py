@@ -0,0 +1,90 @@
+import threading
+
+import numpy as np
+
+import mem0_naver.vector_stores.sharded_faiss as sharded_faiss
+from mem0_naver.vector_stores.sharded_faiss import ShardedFAISS
+
+DIMS = 8
+
+
+def _open(path, **kwargs) -> ShardedFAISS:
+    return ShardedFAISS(
+        collection_name="sharded", path=str(path), embedding_model_dims=DIMS, **kwargs
+    )
+
+
+def test_cold_shard_load_does_not_block_other_shards(tmp_path, monkeypatch):
+    store = _open(tmp_path)
+    vectors = np.random.default_rng(0).random((2, DIMS), dtype=np.float32)
+    store.insert(vectors, [{"user_id": "slow"}, {"user_id": "fast"}], ["a", "b"])
+    store.close()
+    store = _open(tmp_path)
+
+    slow_shard = store._shard_name("slow")
+    loading, release = threading.Event(), threading.Event()
+    original = sharded_faiss.FAISS
+
+    def slow_faiss(*args, **kwargs):
+        if kwargs["path"].endswith(slow_shard):
+            loading.set()
+            release.wait(5)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(sharded_faiss, "FAISS", slow_faiss)
+    results = {}
+    readers = [
+        threading.Thread(target=lambda: results.setdefault("a", store.get("a")))
+        for _ in range(2)
+    ]
+    for reader in readers:
+        reader.start()
+    assert loading.wait(5)
+
+    # The other shard opens while the slow one is still loading
+    assert store.get("b").payload["user_id"] == "fast"
+    assert "a" not in results
+
+    release.set()
+    for reader in readers:
+        reader.join(5)
+    assert results["a"].payload["user_id"] == "slow"
+
+
+def test_update_moves_memory_to_new_shard(tmp_path):
+    store = _open(tmp_path)
+    vectors = np.random.default_rng(1).random((3, DIMS), dtype=np.float32)
+    store.insert(
+        vectors,
+        [{"user_id": "u1", "data": str(i)} for i in range(3)],
+        ["m0", "m1", "m2"],
+    )
+
+    store.update("m0", payload={"user_id": "u2", "data": "moved"})
+    store.update("m1", vectors[2].tolist(), {"user_id": "u2", "data": "moved too"})
+
+    assert store.directory.get("m0") == store._shard_name("u2")
+    assert store.get("m0").payload["data"] == "moved"
+    u1 = store.search(None, vectors[0], limit=5, filters={"user_id": "u1"})
+    u2 = store.search(None, vectors[0], limit=5, filters={"user_id": "u2"})
+    assert [result.id for result in u1] == ["m2"]
+    assert u2[0].id == "m0" and u2[0].score < 1e-6
+    assert {result.id for result in u2} == {"m0", "m1"}
+    assert store.col_info()["count"] == 3
+
+
+def test_eviction_skips_compacting_shards(tmp_path):
+    store = _open(tmp_path, memory_budget_mb=0.0)
+    vectors = np.random.default_rng(2).random((2, DIMS), dtype=np.float32)
+    store.insert(vectors[:1], [{"user_id": "u1"}], ["a"])
+    compacting = store._shards[store._shard_name("u1")]
+    compacting._compacting = True
+
+    # Opening another shard goes over the budget, but the compacting one stays open
+    store.insert(vectors[1:], [{"user_id": "u2"}], ["b"])
+    assert store._shards.get(store._shard_name("u1")) is compacting
+    assert compacting.payloads is not None
+
+    compacting._compacting = False
+    store.get("b")
+    assert store._shard_name("u1") not in store._shards
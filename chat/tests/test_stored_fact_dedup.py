@@ -0,0 +1,79 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+
+import numpy as np
+
+from mem0_naver.memory.main import _drop_stored_facts
+from mem0_naver.vector_stores.faiss import FAISS
+
+DIMS = 8
+
+
+def _store(path) -> FAISS:
+    return FAISS(collection_name="facts", path=str(path), embedding_model_dims=DIMS)
+
+
+def _memory(text: str, user_id: str) -> dict:
+    return {
+        "data": text,
+        "hash": hashlib.md5(text.encode()).hexdigest(),
+        "user_id": user_id,
+    }
+
+
+def test_stored_and_repeated_facts_are_dropped(tmp_path):
+    store = _store(tmp_path)
+    store.insert(
+        np.random.default_rng(0).random((2, DIMS), dtype=np.float32),
+        [_memory("Likes green tea", "u"), _memory("Lives in Busan", "other")],
+        ["tea", "busan"],
+    )
+
+    facts = ["Lives in Busan", "Likes green tea", "Has a cat", "Has a cat"]
+    # The other user's memory does not count as a duplicate
+    assert _drop_stored_facts(store, facts, {"user_id": "u"}) == [
+        "Lives in Busan",
+        "Has a cat",
+    ]
+    assert store.find_by_hash(
+        [hashlib.md5(b"Likes green tea").hexdigest()], {"user_id": "u"}
+    ) == {hashlib.md5(b"Likes green tea").hexdigest(): "tea"}
+
+
+def test_hash_lookup_stays_under_the_sqlite_variable_limit(tmp_path):
+    store = _store(tmp_path)
+    texts = [f"fact {i}" for i in range(2000)]
+    store.insert(
+        np.random.default_rng(1).random((len(texts), DIMS), dtype=np.float32),
+        [_memory(text, "u") for text in texts],
+    )
+    store.payloads._reader().setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+
+    facts = texts + ["a new fact"]
+    assert _drop_stored_facts(store, facts, {"user_id": "u"}) == ["a new fact"]
+
+
+def test_adding_stored_facts_skips_the_update_call(make_memory):
+    extraction = json.dumps({"facts": ["Likes green tea"]})
+    memory, llm = make_memory(
+        [
+            extraction,
+            json.dumps(
+                {"memory": [{"id": "0", "text": "Likes green tea", "event": "ADD"}]}
+            ),
+            extraction,
+            "unused",
+        ]
+    )
+    messages = [{"role": "user", "content": "저는 녹차를 좋아해요"}]
+
+    first = asyncio.run(memory.add(messages, user_id="u"))
+    assert [result["memory"] for result in first["results"]] == ["Likes green tea"]
+
+    second = asyncio.run(memory.add(messages, user_id="u"))
+    assert second["results"] == []
+    # Only the extraction call was made for the second turn
+    assert llm.i == 3
+    assert len(asyncio.run(memory.get_all(user_id="u"))["results"]) == 1
@@ -0,0 +1,29 @@
+from mem0_naver.vector_stores.base import VectorStoreBase
+from mem0_naver.vector_stores.faiss import OutputData
+
+
+class _ScoredStore(VectorStoreBase):
+    """Store whose search returns fixed scores, best first."""
+
+    def __init__(self, distance_strategy, scores):
+        self.distance_strategy = distance_strategy
+        self.scores = scores
+
+    def search(self, query, vectors, limit=5, filters=None):
+        return [
+            OutputData(id=str(i), score=score, payload={})
+            for i, score in enumerate(self.scores[:limit])
+        ]
+
+    create_col = insert = delete = update = get = None
+    list_cols = delete_col = col_info = list = reset = None
+
+
+def test_range_search_keeps_similarities_above_threshold():
+    store = _ScoredStore("cosine", [0.9, 0.7, 0.4])
+    assert [r.id for r in store.range_search(None, [0.0], 0.5)] == ["0", "1"]
+
+
+def test_range_search_keeps_distances_below_threshold():
+    store = _ScoredStore("euclidean", [0.1, 0.3, 0.8])
+    assert [r.id for r in store.range_search(None, [0.0], 0.5)] == ["0", "1"]